@@ -0,0 +1,84 @@
+"""
+日志调用开销基准测试
+
+比较热循环中被级别过滤掉的调试日志在不同写法下的单次开销，
+以及启用时一次日志调用（格式化、写入缓存、入队）的开销。
+
+用法:
+    python benchmarks/bench_logging.py [--number 200000]
+"""
+import os
+import sys
+import timeit
+import argparse
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure_logging(number: int) -> dict:
+    """
+    测量各场景下每次日志调用的耗时
+
+    Returns:
+        {场景名称: 每次调用的秒数}
+    """
+    from utils.logger import LogLevel, get_logger, log_debug
+
+    logger = get_logger()
+    account = {'name': 'user123', 'email': 'user123@example.com', 'password': 'secret'}
+    index = 42
+
+    cases = [
+        ("禁用 debug: f-string", lambda: logger.debug(f"处理账号 {account['name']} 第 {index} 条")),
+        ("禁用 debug: % 延迟参数", lambda: logger.debug("处理账号 %s 第 %d 条", account['name'], index)),
+        ("禁用 debug: 附加字段", lambda: logger.debug("处理账号 %s", account['name'], account=account)),
+        ("禁用 debug: 便捷函数", lambda: log_debug("处理账号 %s", account['name'])),
+        ("禁用 debug: is_enabled_for 守卫",
+         lambda: logger.is_enabled_for(LogLevel.DEBUG) and logger.debug("处理账号 %s", account)),
+    ]
+
+    results = {}
+    previous_level = logger.get_level()
+
+    logger.set_level('INFO')
+    for name, func in cases:
+        results[name] = min(timeit.repeat(func, number=number, repeat=3)) / number
+
+    # 启用时的完整路径：格式化、构建条目、写入缓存并入队（写入在后台线程完成）
+    logger.set_level('DEBUG')
+    enabled_number = max(1, number // 20)
+    seconds = min(timeit.repeat(
+        lambda: logger.debug("处理账号 %s 第 %d 条", account['name'], index),
+        number=enabled_number, repeat=3
+    ))
+    logger.flush(timeout=30)
+    results["启用 debug: % 延迟参数"] = seconds / enabled_number
+
+    logger.set_level(previous_level)
+    return results
+
+
+def run_benchmarks(number: int):
+    """运行基准测试并输出每次调用的耗时"""
+    from utils.logger import get_logger
+
+    print(f"{'场景':<32}{'每次调用':>12}")
+    for name, seconds in measure_logging(number).items():
+        print(f"{name:<32}{seconds * 1e9:>10.0f}ns")
+    print(f"丢弃的日志: {get_logger().get_dropped_count()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志调用开销基准测试")
+    parser.add_argument('--number', type=int, default=200000, help="每个场景的调用次数")
+    args = parser.parse_args()
+
+    # 在临时目录中运行，避免写入项目的日志和配置
+    os.chdir(tempfile.mkdtemp(prefix="bench_logging_"))
+    run_benchmarks(args.number)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,384 @@
+"""
+可重复的性能基准测试套件
+
+在合成账号库（见 vault_generator.py）上测量 DatabaseManager 的常用操作、
+账号对象构建（解密和类型转换）、EncryptionManager 吞吐量、日志调用开销
+以及无界面运行的主窗口操作（见 bench_ui.py），
+结果写入 JSON 文件，并与保存的基线比较，耗时增长超过阈值的项视为性能回退。
+
+用法:
+    python benchmarks/bench_suite.py                          # 1k 和 10k 行，与基线比较
+    python benchmarks/bench_suite.py --sizes 1k,10k,100k,1m   # 更大的库（首次运行需要生成，较慢）
+    python benchmarks/bench_suite.py --save-baseline          # 把本次结果保存为基线
+
+基线与机器相关，应在同一台机器上生成和比较。存在回退、基线中的测试项未运行
+或某个测试组运行失败时退出码为 1，因此比较时应使用与基线相同的测试组和行数。
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import sqlite3
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# 添加项目根目录到Python路径
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from vault_generator import get_fixture
+
+
+SIZE_ALIASES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+
+# 行数达到该值时，整表操作只运行一次
+LARGE_VAULT_ROWS = 100000
+
+
+def parse_sizes(text: str) -> List[int]:
+    """解析 "1k,10k,5000" 形式的行数列表"""
+    sizes = []
+    for part in text.split(','):
+        part = part.strip().lower()
+        if part:
+            sizes.append(SIZE_ALIASES.get(part) or int(part))
+    return sizes
+
+
+def measure(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None,
+            operations: int = 1) -> Dict[str, float]:
+    """
+    多次运行并计时
+
+    Args:
+        func: 被测函数
+        repeat: 运行次数
+        setup: 每次运行前执行的准备函数（不计时）
+        operations: 每次运行包含的操作数，用于计算单次操作耗时
+
+    Returns:
+        {'seconds': 最短耗时, 'median': 中位耗时, 'per_op': 最短耗时下的单次操作耗时, 'runs': 运行次数}
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {
+        'seconds': best,
+        'median': statistics.median(timings),
+        'per_op': best / operations,
+        'runs': repeat
+    }
+
+
+def bench_database(rows: int, repeat: int, work_dir: str, backend: str = 'sqlite') -> Dict[str, Dict[str, float]]:
+    """
+    测量账号存储操作（在测试库副本上运行，不修改缓存的测试库）
+
+    Args:
+        backend: 存储类型，sqlite 的结果名为 db.<操作>@<行数>，其他类型为 db.<类型>.<操作>@<行数>
+    """
+    from models.account import Account, AccountType
+    from models.database import ACCOUNT_SELECT, create_database_manager
+
+    print(f"准备 {rows} 行测试库...")
+    fixture = get_fixture(rows, progress=lambda done: print(
+        f"\r  已生成 {done}/{rows}", end='\n' if done == rows else '', flush=True
+    ))
+    db_path = os.path.join(work_dir, f"vault_{rows}.db")
+    shutil.copyfile(fixture, db_path)
+
+    db = create_database_manager(backend, db_path)
+    manager = db.encryption_manager
+    rng = random.Random(rows)
+    whole_table_repeat = 1 if rows >= LARGE_VAULT_ROWS else repeat
+    prefix = "db." if backend == 'sqlite' else f"db.{backend}."
+    results = {}
+
+    def record(name: str, result: Dict[str, float]):
+        results[f"{prefix}{name}@{rows}"] = result
+        per_op = f"{result['per_op'] * 1e6:>14.1f}µs/op" if result['per_op'] != result['seconds'] else ""
+        print(f"  {name:<36}{result['seconds'] * 1000:>12.2f}ms{per_op}")
+
+    # 首次加载：数据密钥缓存为空，每行都要解包数据密钥
+    record("get_all_accounts.cold", measure(
+        db.get_all_accounts, whole_table_repeat,
+        setup=manager._unwrapped_keys.clear, operations=rows
+    ))
+    record("get_all_accounts.warm", measure(db.get_all_accounts, whole_table_repeat, operations=rows))
+
+    # 账号对象构建：只计 Python 端的解密和类型转换，不含查询
+    with db.connect() as conn:
+        raw_rows = conn.execute(ACCOUNT_SELECT).fetchall()
+    record("hydrate_rows", measure(
+        lambda: [db._row_to_account(row) for row in raw_rows], whole_table_repeat, operations=rows
+    ))
+    del raw_rows
+
+    record("get_accounts_by_type", measure(
+        lambda: db.get_accounts_by_type(AccountType.CURSOR), whole_table_repeat
+    ))
+    record("search_accounts.common", measure(lambda: db.search_accounts("主力"), whole_table_repeat))
+    record("search_accounts.rare", measure(lambda: db.search_accounts("dev0001_1"), repeat))
+    record("get_password_audit", measure(db.get_password_audit, repeat))
+
+    # 单条更新：每次运行更新同一批随机账号
+    update_ids = rng.sample(range(1, rows + 1), min(100, rows))
+    accounts = [db.get_account(account_id) for account_id in update_ids]
+
+    def update_accounts():
+        for account in accounts:
+            account.notes = f"基准测试更新 {rng.random()}"
+            db.update_account(account)
+
+    record("update_account", measure(update_accounts, repeat, operations=len(accounts)))
+
+    # 批量添加：应用逐条调用 add_account，每条一个事务
+    insert_count = 200
+
+    def insert_accounts():
+        for index in range(insert_count):
+            db.add_account(Account(
+                name=f"bench {index}", account_type=AccountType.CURSOR,
+                email=f"bench{index}@example.com", username=f"bench{index}",
+                password=f"Bench-{index}-pass!", notes="基准测试", tags="测试"
+            ))
+
+    record("add_account", measure(insert_accounts, repeat, operations=insert_count))
+
+    if backend == 'sqlite':
+        print(f"  文件大小: {os.path.getsize(db_path) / 1024 / 1024:.1f}MB")
+    os.remove(db_path)
+    return results
+
+
+def bench_encryption(number: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """测量 EncryptionManager 各操作的吞吐量"""
+    from utils.encryption import EncryptionManager
+
+    manager = EncryptionManager()
+    data_key = manager.generate_data_key()
+    plaintext = "Cursor-Passw0rd!-2026"
+    ciphertext = manager.encrypt_with_key(plaintext, data_key)
+    wrapped_keys = [manager.wrap_key(manager.generate_data_key()) for _ in range(number)]
+
+    def unwrap_all():
+        for wrapped in wrapped_keys:
+            manager.unwrap_key(wrapped)
+
+    cases = {
+        'encrypt_with_key': (lambda: [manager.encrypt_with_key(plaintext, data_key) for _ in range(number)], None),
+        'decrypt_with_key': (lambda: [manager.decrypt_with_key(ciphertext, data_key) for _ in range(number)], None),
+        'wrap_key': (lambda: [manager.wrap_key(data_key) for _ in range(number)], None),
+        'unwrap_key.uncached': (unwrap_all, manager._unwrapped_keys.clear),
+        'unwrap_key.cached': (unwrap_all, None),
+        'blind_index': (lambda: [manager.blind_index('email', 'user@example.com') for _ in range(number)], None),
+    }
+
+    results = {}
+    for name, (func, setup) in cases.items():
+        result = measure(func, repeat, setup=setup, operations=number)
+        result['ops_per_sec'] = 1 / result['per_op']
+        results[f"crypto.{name}"] = result
+        print(f"  {name:<36}{result['ops_per_sec']:>12.0f}/s{result['per_op'] * 1e6:>14.1f}µs/op")
+    return results
+
+
+def bench_logging(number: int) -> Dict[str, Dict[str, float]]:
+    """测量日志调用开销"""
+    from bench_logging import measure_logging
+
+    results = {}
+    for name, seconds in measure_logging(number).items():
+        results[f"logging.{name}"] = {'seconds': seconds, 'median': seconds, 'per_op': seconds, 'runs': 3}
+        print(f"  {name:<36}{seconds * 1e9:>12.0f}ns")
+    return results
+
+
+def bench_ui(rows: int, repeat: int, backend: str = 'sqlite') -> Optional[Dict[str, Dict[str, float]]]:
+    """
+    在子进程中运行界面基准测试（使用 offscreen 平台，无需显示器）
+
+    Returns:
+        测试结果，子进程失败时返回 None
+    """
+    fd, json_path = tempfile.mkstemp(suffix='.json', prefix='bench_ui_')
+    os.close(fd)
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    try:
+        completed = subprocess.run([
+            sys.executable, os.path.join(BENCHMARKS_DIR, 'bench_ui.py'),
+            '--rows', str(rows), '--repeat', str(repeat), '--backend', backend, '--json', json_path
+        ], env=env)
+        if completed.returncode != 0:
+            print(f"  界面基准测试失败，退出码 {completed.returncode}")
+            return None
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(json_path)
+
+
+def collect_environment() -> Dict[str, Any]:
+    """记录运行环境，便于判断结果是否可比"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except Exception:
+        commit = ""
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'sqlite': sqlite3.sqlite_version
+    }
+
+
+def compare_with_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                          threshold: float) -> List[str]:
+    """
+    与基线比较并输出对比表
+
+    Args:
+        results: 本次结果
+        baseline: 基线结果
+        threshold: 允许的耗时增长比例，如 0.2 表示慢 20% 以内不算回退
+
+    Returns:
+        回退的测试项名称（包括基线中有但本次没有结果的测试项）
+    """
+    regressions = []
+    print(f"\n{'测试项':<48}{'基线':>12}{'本次':>12}{'变化':>10}")
+    for name, base in baseline.items():
+        if name not in results:
+            print(f"{name:<48}{base['seconds'] * 1000:>10.2f}ms{'-':>12}{'缺失':>10}  ⚠️ 未运行")
+            regressions.append(name)
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or base['seconds'] <= 0:
+            print(f"{name:<48}{'-':>12}{result['seconds'] * 1000:>10.2f}ms{'新增':>10}")
+            continue
+
+        change = result['seconds'] / base['seconds'] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  ⚠️ 回退"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  ✅ 提升"
+        print(f"{name:<48}{base['seconds'] * 1000:>10.2f}ms{result['seconds'] * 1000:>10.2f}ms"
+              f"{change * 100:>+9.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="性能基准测试套件")
+    parser.add_argument('--sizes', default='1k,10k', help="测试库行数，逗号分隔，如 1k,10k,100k,1m")
+    parser.add_argument('--repeat', type=int, default=5, help="每项运行次数（取最短耗时）")
+    parser.add_argument('--backends', default='sqlite', help="数据库测试的存储类型，逗号分隔：sqlite,memory")
+    parser.add_argument('--ui-backend', default='sqlite', help="界面测试的存储类型：sqlite 或 memory")
+    parser.add_argument('--crypto-number', type=int, default=2000, help="加密测试每次运行的操作数")
+    parser.add_argument('--log-number', type=int, default=100000, help="日志测试每个场景的调用次数")
+    parser.add_argument('--ui-repeat', type=int, default=3, help="界面测试每个场景的轮数")
+    parser.add_argument('--skip', default='', help="跳过的测试组，逗号分隔：db,crypto,logging,ui")
+    parser.add_argument('--output', help="结果 JSON 路径，默认写入 benchmarks/results")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="基线 JSON 路径")
+    parser.add_argument('--save-baseline', action='store_true', help="把本次结果保存为基线")
+    parser.add_argument('--threshold', type=float, default=0.2, help="判定回退的耗时增长比例")
+    args = parser.parse_args()
+
+    skip = {name.strip() for name in args.skip.split(',') if name.strip()}
+    output = os.path.abspath(args.output or os.path.join(
+        RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    ))
+    baseline_path = os.path.abspath(args.baseline)
+
+    # 在临时目录中运行，避免读写项目的配置、日志和数据库
+    work_dir = tempfile.mkdtemp(prefix="bench_suite_")
+    os.chdir(work_dir)
+
+    results: Dict[str, Dict[str, float]] = {}
+    failures: List[str] = []
+    try:
+        if 'db' not in skip:
+            for backend in [name.strip() for name in args.backends.split(',') if name.strip()]:
+                for rows in parse_sizes(args.sizes):
+                    print(f"\n== 数据库 {rows} 行（{backend}）==")
+                    results.update(bench_database(rows, args.repeat, work_dir, backend))
+        if 'crypto' not in skip:
+            print("\n== 加密 ==")
+            results.update(bench_encryption(args.crypto_number, args.repeat))
+        if 'logging' not in skip:
+            print("\n== 日志 ==")
+            results.update(bench_logging(args.log_number))
+        if 'ui' not in skip:
+            for rows in parse_sizes(args.sizes):
+                ui_results = bench_ui(rows, args.ui_repeat, args.ui_backend)
+                if ui_results is None:
+                    failures.append(f"界面 {rows} 行")
+                else:
+                    results.update(ui_results)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {'environment': collect_environment(), 'results': results}
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已写入 {output}")
+
+    if failures:
+        # 不完整的结果不能作为基线，也不能据此判断没有回退
+        print(f"\n测试组运行失败: {', '.join(failures)}")
+        return 1
+
+    if args.save_baseline:
+        shutil.copyfile(output, baseline_path)
+        print(f"已保存为基线 {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print("没有基线，使用 --save-baseline 保存本次结果作为基线")
+        return 0
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('environment', {}).get('platform') != report['environment']['platform']:
+        print("⚠️ 基线来自不同的平台，比较结果仅供参考")
+
+    regressions = compare_with_baseline(results, baseline.get('results', {}), args.threshold)
+    if regressions:
+        print(f"\n发现 {len(regressions)} 项性能回退（耗时增长超过 {args.threshold:.0%} 或未运行）")
+        return 1
+    print("\n没有发现性能回退")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+无界面 Qt 界面基准测试
+
+在 QT_QPA_PLATFORM=offscreen 下对合成账号库运行 MainWindow，
+通过事件循环依次执行脚本化的操作：侧边导航切换页面、AccountTableWidget.load_accounts、
+重新加载账号表格并滚动到底部（逐页加载）、在搜索框中逐字输入、执行搜索查询、刷新日志页面和切换主题。记录每个操作从开始到事件循环处理完
+随后事件的耗时，并用 5ms 心跳定时器测量事件循环延迟的分位数。
+无需显示器，可在 Linux 服务器上发现界面性能回退。
+
+用法:
+    python benchmarks/bench_ui.py --rows 10000 [--repeat 3] [--backend memory] [--json results.json]
+
+--backend memory 时测试库载入内存存储并注入主窗口，页面不再读写数据库文件。
+
+通常由 bench_suite.py 在子进程中调用，结果并入基准测试报告。
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from typing import Callable, Dict, List
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# 添加项目根目录到Python路径
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from PySide6.QtCore import QEventLoop, QObject, QTimer, Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+
+from vault_generator import get_fixture
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩法计算分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class UiBenchmark(QObject):
+    """在事件循环中依次执行操作并计时"""
+
+    HEARTBEAT_MS = 5
+
+    def __init__(self, app: QApplication, gap_ms: int = 20):
+        """
+        Args:
+            app: 应用实例
+            gap_ms: 两个操作之间让事件循环空闲的毫秒数
+        """
+        super().__init__()
+        self.app = app
+        self.gap_ms = gap_ms
+        self._lateness: List[float] = []
+        self._last_beat = 0.0
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setTimerType(Qt.PreciseTimer)
+        self.heartbeat.setInterval(self.HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self._on_heartbeat)
+
+    def _on_heartbeat(self):
+        now = time.perf_counter()
+        if self._last_beat:
+            self._lateness.append(max(0.0, now - self._last_beat - self.HEARTBEAT_MS / 1000))
+        self._last_beat = now
+
+    def settle(self):
+        """处理完当前积压的事件（包括重绘）"""
+        for _ in range(3):
+            self.app.processEvents(QEventLoop.AllEvents)
+
+    def run(self, rounds: List[List[Callable[[], None]]]) -> Dict[str, float]:
+        """
+        在事件循环中执行多轮操作
+
+        每个操作在定时器回调中执行，操作返回后再投递一个 0ms 定时器，
+        其触发时事件循环已处理完操作引起的事件，两者之间即为该操作的耗时。
+
+        Args:
+            rounds: 每轮的操作列表
+
+        Returns:
+            {'seconds': 最快一轮的耗时, 'median': 各轮耗时中位数, 'per_op': 最快一轮中单个操作的平均耗时,
+             'runs': 轮数, 'op_p50_ms'/'op_p95_ms': 单个操作耗时分位数,
+             'latency_p50_ms'/'latency_p95_ms'/'latency_p99_ms'/'latency_max_ms': 心跳延迟分位数}
+        """
+        durations: List[List[float]] = [[] for _ in rounds]
+        steps = [(index, action) for index, actions in enumerate(rounds) for action in actions]
+        iterator = iter(steps)
+        loop = QEventLoop()
+
+        def next_step():
+            step = next(iterator, None)
+            if step is None:
+                loop.quit()
+                return
+
+            round_index, action = step
+            start = time.perf_counter()
+            action()
+
+            def finished():
+                durations[round_index].append(time.perf_counter() - start)
+                QTimer.singleShot(self.gap_ms, next_step)
+
+            QTimer.singleShot(0, finished)
+
+        self.settle()
+        self._lateness = []
+        self._last_beat = 0.0
+        self.heartbeat.start()
+        QTimer.singleShot(0, next_step)
+        loop.exec()
+        self.heartbeat.stop()
+
+        round_times = [sum(round_durations) for round_durations in durations]
+        operations = [duration for round_durations in durations for duration in round_durations]
+        best = min(round_times)
+        return {
+            'seconds': best,
+            'median': statistics.median(round_times),
+            'per_op': best / max(1, len(rounds[round_times.index(best)])),
+            'runs': len(rounds),
+            'op_p50_ms': percentile(operations, 0.5) * 1000,
+            'op_p95_ms': percentile(operations, 0.95) * 1000,
+            'latency_p50_ms': percentile(self._lateness, 0.5) * 1000,
+            'latency_p95_ms': percentile(self._lateness, 0.95) * 1000,
+            'latency_p99_ms': percentile(self._lateness, 0.99) * 1000,
+            'latency_max_ms': max(self._lateness, default=0.0) * 1000
+        }
+
+
+def run_ui_benchmarks(rows: int, repeat: int, work_dir: str, backend: str = 'sqlite',
+                      log_lines: int = 20000) -> Dict[str, Dict[str, float]]:
+    """
+    对指定行数的测试库运行界面基准测试
+
+    在工作目录中以测试库作为 accounts.db 启动主窗口，不读写项目的配置、日志和数据库。
+
+    Args:
+        backend: 账号存储类型，sqlite 的结果名为 ui.<场景>@<行数>，其他类型为 ui.<类型>.<场景>@<行数>
+
+    Returns:
+        {"ui.<场景>@<行数>": 结果}
+    """
+    fixture = get_fixture(rows)
+    shutil.copyfile(fixture, os.path.join(work_dir, 'accounts.db'))
+    os.chdir(work_dir)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from models.database import create_database_manager
+    from utils.config import get_config_manager
+    from utils.logger import get_logger
+    from ui.main_window import MainWindow
+
+    db_manager = create_database_manager(backend, 'accounts.db')
+    prefix = "ui." if backend == 'sqlite' else f"ui.{backend}."
+
+    # 日志页面需要有内容可加载；测试期间不输出到控制台
+    logger = get_logger()
+    logger.set_console_enabled(False)
+    for index in range(log_lines):
+        logger.info("基准测试日志 %d: 账号 dev%04d 已同步", index, index % 1000)
+    logger.flush(timeout=30)
+
+    bench = UiBenchmark(app)
+    results = {}
+
+    def record(name: str, result: Dict[str, float]):
+        results[f"{prefix}{name}@{rows}"] = result
+        print(f"  {name:<28}{result['seconds'] * 1000:>10.1f}ms  操作 P95 {result['op_p95_ms']:>8.1f}ms"
+              f"  延迟 P95 {result['latency_p95_ms']:>7.1f}ms  最大 {result['latency_max_ms']:>7.1f}ms")
+
+    # 启动：构建主窗口、加载首页数据并显示
+    start = time.perf_counter()
+    window = MainWindow(db_manager)
+    window.resize(1280, 800)
+    window.show()
+    bench.settle()
+    startup = time.perf_counter() - start
+    results[f"{prefix}startup@{rows}"] = {'seconds': startup, 'median': startup, 'per_op': startup, 'runs': 1}
+    print(f"  {'startup':<28}{startup * 1000:>10.1f}ms")
+
+    # 通过侧边导航切换页面（与用户点击相同的路径）
+    page_order = ["cursor", "windsurf", "augment", "logs", "diagnostics", "settings", "home"]
+    nav_buttons = window.sidebar.nav_buttons
+    record("page_switch", bench.run([
+        [lambda page_id=page_id: nav_buttons[page_id].click() for page_id in page_order]
+        for _ in range(repeat)
+    ]))
+
+    # 表格渲染：直接把 Cursor 账号加载到表格
+    nav_buttons["cursor"].click()
+    bench.settle()
+    account_page = window.pages["cursor"].account_page
+    cursor_accounts = account_page.db_manager.get_all_accounts()
+    cursor_accounts = [account for account in cursor_accounts if account.account_type == account_page.account_type]
+    record("load_accounts", bench.run([
+        [lambda: account_page.account_table.load_accounts(cursor_accounts)]
+        for _ in range(repeat)
+    ]))
+
+    # 表格滚动：从存储重新加载第一页，再多次滚动到底部触发逐页加载
+    account_table = account_page.account_table
+    record("table_scroll", bench.run([
+        [account_page.refresh_accounts] + [account_table.scrollToBottom for _ in range(5)]
+        for _ in range(repeat)
+    ]))
+
+    # 搜索框逐字输入，每次按键都会触发筛选；每轮最后清空搜索框
+    search_edit = account_page.search_edit
+    search_text = "dev00"
+    record("search_typing", bench.run([
+        [lambda char=char: QTest.keyClick(search_edit, char) for char in search_text] + [search_edit.clear]
+        for _ in range(repeat)
+    ]))
+
+    # 搜索查询：从提交到后台查询结果应用到表格
+    def run_search(text: str):
+        search_edit.blockSignals(True)
+        search_edit.setText(text)
+        search_edit.blockSignals(False)
+        account_page.apply_filters()
+        while account_page.search_runner.is_busy():
+            app.processEvents(QEventLoop.AllEvents, 5)
+
+    record("search_query", bench.run([
+        [lambda text=text: run_search(text) for text in ("dev00", "主力", "")]
+        for _ in range(repeat)
+    ]))
+
+    # 日志页面刷新
+    nav_buttons["logs"].click()
+    bench.settle()
+    logs_page = window.pages["logs"]
+    record("logs_refresh", bench.run([[logs_page.refresh_logs] for _ in range(repeat)]))
+
+    # 主题切换：整个窗口重新应用样式表
+    config = get_config_manager()
+
+    def set_theme(theme: str):
+        config.set('ui.theme', theme)
+        window.apply_theme()
+
+    record("theme_change", bench.run([
+        [lambda: set_theme('dark'), lambda: set_theme('light')]
+        for _ in range(repeat)
+    ]))
+
+    window.close()
+    logger.flush(timeout=30)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无界面 Qt 界面基准测试")
+    parser.add_argument('--rows', type=int, default=1000, help="测试库行数")
+    parser.add_argument('--repeat', type=int, default=3, help="每个场景的轮数")
+    parser.add_argument('--backend', default='sqlite', help="账号存储类型：sqlite 或 memory")
+    parser.add_argument('--json', help="把结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    print(f"\n== 界面 {args.rows} 行 ==")
+    work_dir = tempfile.mkdtemp(prefix="bench_ui_")
+    try:
+        results = run_ui_benchmarks(args.rows, args.repeat, work_dir, args.backend)
+    finally:
+        os.chdir(BENCHMARKS_DIR)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    # 后台线程（日志写入、卡顿监视等）不需要正常退出
+    sys.stdout.flush()
+    os._exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+合成账号库生成器
+
+按固定随机种子生成与真实使用情况相近的 accounts.db 测试库：
+账号类型、状态、标签和备注按加权分布抽取，部分密码重复使用、部分为弱密码，
+敏感字段与应用相同地使用记录级数据密钥加密，并写入盲索引、密码指纹和强度分数。
+相同的行数和种子生成相同的明文数据，生成的库缓存在 benchmarks/fixtures 下重复使用。
+
+用法:
+    python benchmarks/vault_generator.py 10000 [--output path] [--seed 42]
+"""
+import os
+import sys
+import random
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+from typing import Optional
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.account import AccountType, AccountStatus
+from utils.encryption import EncryptionManager
+from utils.password_audit import score_password_strength
+
+
+# 生成逻辑变化时递增，使旧的缓存库失效
+GENERATOR_VERSION = 1
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# 账号类型分布：常用的三个工具占大多数
+TYPE_WEIGHTS = [
+    (AccountType.CURSOR, 35), (AccountType.WINDSURF, 18), (AccountType.AUGMENT, 14),
+    (AccountType.GITHUB_COPILOT, 6), (AccountType.CLAUDE, 5), (AccountType.CHATGPT, 5),
+    (AccountType.OPENAI_API, 4), (AccountType.ANTHROPIC_API, 3), (AccountType.GOOGLE_GEMINI, 2),
+    (AccountType.MICROSOFT_COPILOT, 2), (AccountType.JETBRAINS_AI, 2), (AccountType.TABNINE, 1),
+    (AccountType.CODEIUM, 1), (AccountType.REPLIT_AI, 1), (AccountType.OTHER, 1),
+]
+
+STATUS_WEIGHTS = [
+    (AccountStatus.ACTIVE, 70), (AccountStatus.INACTIVE, 10),
+    (AccountStatus.EXPIRED, 15), (AccountStatus.SUSPENDED, 5),
+]
+
+SUBSCRIPTION_WEIGHTS = [("免费版", 55), ("专业版", 30), ("试用版", 10), ("团队版", 5)]
+
+# 标签按出现频率排列，越靠前越常用（近似 Zipf 分布）
+TAG_POOL = [
+    "主力", "备用", "测试", "工作", "个人", "已绑卡", "教育邮箱", "临时邮箱", "待续费",
+    "共享", "团队", "海外", "高额度", "低额度", "新注册", "老账号", "已验证", "需要验证码",
+    "自动注册", "手动注册", "项目A", "项目B", "项目C", "客户演示", "CI", "实验",
+]
+TAG_WEIGHTS = [1 / (rank + 1) for rank in range(len(TAG_POOL))]
+
+NOTE_PHRASES = [
+    "自动注册生成", "试用期到月底", "绑定了工作邮箱", "密码已在 2FA 应用中备份",
+    "额度用完后切换到备用账号", "只用于 CI 流水线", "续费前先确认发票抬头",
+    "registered via automation", "shared with the frontend team", "remember to rotate the API key",
+    "used for the nightly evaluation job", "trial started after the conference",
+]
+
+EMAIL_DOMAINS = ["gmail.com", "outlook.com", "qq.com", "163.com", "proton.me", "hj0185.email", "company.cn"]
+
+# 带 API 密钥的账号类型
+API_KEY_TYPES = {AccountType.OPENAI_API, AccountType.ANTHROPIC_API, AccountType.GOOGLE_GEMINI}
+
+WEAK_PASSWORDS = ["123456", "password", "qwerty", "111111", "abc123", "iloveyou", "admin"]
+
+PASSWORD_ALPHABET = "abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789!@#$%&*"
+
+
+def fixture_path(rows: int, seed: int = 42) -> str:
+    """缓存的测试库路径"""
+    return os.path.join(FIXTURES_DIR, f"vault_{rows}_s{seed}_v{GENERATOR_VERSION}.db")
+
+
+def _weighted(rng: random.Random, weighted_items):
+    items, weights = zip(*weighted_items)
+    return rng.choices(items, weights=weights, k=1)[0]
+
+
+def _random_password(rng: random.Random, shared_passwords: list) -> str:
+    """生成密码：约 10% 重复使用已有密码，约 8% 为常见弱密码"""
+    roll = rng.random()
+    if roll < 0.10 and shared_passwords:
+        return rng.choice(shared_passwords)
+    if roll < 0.18:
+        return rng.choice(WEAK_PASSWORDS)
+    password = ''.join(rng.choices(PASSWORD_ALPHABET, k=rng.randint(10, 20)))
+    if len(shared_passwords) < 500:
+        shared_passwords.append(password)
+    return password
+
+
+def _random_notes(rng: random.Random) -> str:
+    """备注：约 40% 为空，其余为一到五个短语"""
+    if rng.random() < 0.4:
+        return ""
+    return "；".join(rng.choices(NOTE_PHRASES, k=rng.randint(1, 5)))
+
+
+def _random_tags(rng: random.Random) -> str:
+    """标签：零到四个，逗号分隔"""
+    count = rng.choices([0, 1, 2, 3, 4], weights=[20, 35, 25, 15, 5], k=1)[0]
+    tags = []
+    while len(tags) < count:
+        tag = rng.choices(TAG_POOL, weights=TAG_WEIGHTS, k=1)[0]
+        if tag not in tags:
+            tags.append(tag)
+    return ",".join(tags)
+
+
+def generate_vault(path: str, rows: int, seed: int = 42,
+                   encryption_manager: Optional[EncryptionManager] = None,
+                   batch_size: int = 5000, progress=None) -> str:
+    """
+    生成合成账号库
+
+    Args:
+        path: 数据库文件路径（已存在时覆盖）
+        rows: 账号数量
+        seed: 随机种子
+        encryption_manager: 加密管理器，默认使用应用的默认主密码
+        batch_size: 每次批量写入的行数
+        progress: 进度回调，参数为已生成的行数
+
+    Returns:
+        数据库文件路径
+    """
+    from models.database import DatabaseManager
+
+    manager = encryption_manager or EncryptionManager()
+    rng = random.Random(seed)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    # 通过 DatabaseManager 建表，保证结构与应用一致
+    DatabaseManager(temp_path, encryption_manager=manager)
+
+    now = datetime(2026, 1, 1)
+    shared_passwords = []
+    user_names = [f"dev{index:04d}" for index in range(max(10, rows // 20))]
+
+    with sqlite3.connect(temp_path) as conn:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+
+        for start in range(0, rows, batch_size):
+            account_rows = []
+            key_rows = []
+            for account_id in range(start + 1, min(rows, start + batch_size) + 1):
+                account_type = _weighted(rng, TYPE_WEIGHTS)
+                status = _weighted(rng, STATUS_WEIGHTS)
+                user = rng.choice(user_names)
+                username = f"{user}_{account_id}"
+                email = f"{username}@{rng.choice(EMAIL_DOMAINS)}"
+                password = _random_password(rng, shared_passwords)
+                api_key = ""
+                if account_type in API_KEY_TYPES:
+                    api_key = "sk-" + ''.join(rng.choices(PASSWORD_ALPHABET[:58], k=40))
+
+                created_at = now - timedelta(days=rng.uniform(0, 730))
+                updated_at = min(now, created_at + timedelta(days=rng.expovariate(1 / 30)))
+                last_used = updated_at if rng.random() < 0.6 else None
+                expiry_date = None
+                if status == AccountStatus.EXPIRED:
+                    expiry_date = now - timedelta(days=rng.uniform(1, 180))
+                elif rng.random() < 0.5:
+                    expiry_date = now + timedelta(days=rng.uniform(1, 365))
+
+                data_key = manager.generate_data_key()
+                account_rows.append((
+                    account_id, 1, f"{account_type.value} {username}", account_type.value,
+                    email, username,
+                    manager.encrypt_with_key(password, data_key),
+                    manager.encrypt_with_key(api_key, data_key),
+                    status.value, _weighted(rng, SUBSCRIPTION_WEIGHTS),
+                    expiry_date.isoformat() if expiry_date else None,
+                    _random_notes(rng), _random_tags(rng),
+                    created_at.isoformat(), updated_at.isoformat(),
+                    last_used.isoformat() if last_used else None,
+                    rng.choices([0, 1, 5, 20, 100], weights=[30, 30, 20, 15, 5], k=1)[0],
+                    manager.blind_index('email', email),
+                    manager.blind_index('username', username),
+                    manager.blind_index('api_key', api_key),
+                    manager.blind_index('password', password),
+                    score_password_strength(password),
+                ))
+                key_rows.append((account_id, manager.wrap_key(data_key), created_at.isoformat()))
+
+            conn.executemany('''
+                INSERT INTO accounts (
+                    id, user_id, name, account_type, email, username, password, api_key,
+                    status, subscription_type, expiry_date, notes, tags,
+                    created_at, updated_at, last_used, usage_count,
+                    email_bidx, username_bidx, api_key_bidx, password_fingerprint, password_strength
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', account_rows)
+            conn.executemany('''
+                INSERT INTO account_keys (account_id, wrapped_key, key_version, needs_rekey, updated_at)
+                VALUES (?, ?, 1, 0, ?)
+            ''', key_rows)
+            conn.commit()
+
+            if progress is not None:
+                progress(start + len(account_rows))
+
+        conn.execute('ANALYZE')
+        conn.commit()
+
+    os.replace(temp_path, path)
+    return path
+
+
+def get_fixture(rows: int, seed: int = 42, progress=None) -> str:
+    """获取缓存的测试库，不存在时生成"""
+    path = fixture_path(rows, seed)
+    if not os.path.exists(path):
+        generate_vault(path, rows, seed, progress=progress)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成合成账号库")
+    parser.add_argument('rows', type=int, help="账号数量")
+    parser.add_argument('--output', help="输出路径，默认写入 benchmarks/fixtures 缓存")
+    parser.add_argument('--seed', type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    path = args.output or fixture_path(args.rows, args.seed)
+    started = datetime.now()
+    generate_vault(path, args.rows, args.seed,
+                   progress=lambda done: print(f"\r已生成 {done}/{args.rows}", end='', flush=True))
+    print(f"\n已写入 {path}，耗时 {(datetime.now() - started).total_seconds():.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,9 @@ from PySide6.QtGui import QIcon
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from models.database import get_database_manager
 from ui.main_window import MainWindow
+from ui.master_password_dialog import unlock_vault
 
 
 def main():
@@ -26,6 +28,10 @@ def main():
     # 设置高DPI支持
     app.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     app.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+
+    # 设置了主密码时先解锁
+    if not unlock_vault(get_database_manager()):
+        return
     
     # 创建主窗口
     window = MainWindow()
@@ -53,6 +53,7 @@ class Account:
     updated_at: datetime = None
     last_used: Optional[datetime] = None
     usage_count: int = 0
+    password_breached: Optional[int] = None  # 密码泄露次数，None表示尚未检查
     
     def __post_init__(self):
         if self.created_at is None:
@@ -137,6 +138,10 @@ class Account:
             return False
         return datetime.now() > self.expiry_date
     
+    def is_password_breached(self) -> bool:
+        """检查密码是否出现在泄露密码库中"""
+        return bool(self.password_breached)
+
     def update_last_used(self):
         """更新最后使用时间"""
         self.last_used = datetime.now()
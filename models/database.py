@@ -1,23 +1,101 @@
 """
 数据库操作模块
 """
+import os
+import base64
 import sqlite3
-from typing import List, Optional
+import threading
+from typing import List, Optional, Tuple
 from datetime import datetime
 from models.account import Account, AccountType, AccountStatus
 from models.user import User, UserRole
+from models.repository import AccountRepository
+from utils.encryption import EncryptionManager, get_encryption_manager
+from utils.password_audit import score_password_strength, WEAK_PASSWORD_SCORE
+from utils.config import get_config_manager
+from utils.metrics import SlowCallLog, timed
+from utils.tracing import traced
 
 
-class DatabaseManager:
-    """数据库管理器"""
+# 最近的慢数据库调用（随诊断包导出）
+slow_db_calls = SlowCallLog(get_config_manager().get('diagnostics.slow_query_ms', 50) / 1000)
+
+# 数据库调用耗时（按方法记录，直方图次数即调用次数）
+db_timed = timed("db_call_seconds", "数据库调用耗时（秒）", slow_log=slow_db_calls)
+
+# 使用记录级数据密钥加密存储的字段
+ENCRYPTED_FIELDS = ['password', 'api_key']
+
+# 维护盲索引列（<field>_bidx）以支持不解密的精确匹配的字段
+BLIND_INDEX_FIELDS = ['email', 'username', 'api_key']
+
+# vault_meta 中保存盲索引密钥（由主密钥包装）的键
+INDEX_KEY_META = 'blind_index_key'
+
+# 账号查询列（显式列出，避免迁移新增列改变列序），最后一列为包装后的数据密钥
+ACCOUNT_COLUMNS = '''
+    accounts.id, accounts.user_id, accounts.name, accounts.account_type,
+    accounts.email, accounts.username, accounts.password, accounts.api_key,
+    accounts.status, accounts.subscription_type, accounts.expiry_date,
+    accounts.notes, accounts.tags, accounts.created_at, accounts.updated_at,
+    accounts.last_used, accounts.usage_count, accounts.password_breached,
+    account_keys.wrapped_key
+'''
+
+ACCOUNT_FROM = '''
+    FROM accounts
+    LEFT JOIN account_keys ON account_keys.account_id = accounts.id
+'''
+
+ACCOUNT_SELECT = 'SELECT' + ACCOUNT_COLUMNS + ACCOUNT_FROM
+
+# 分页查询可用的排序键及其排序表达式
+# 可为空的列映射为同类型的值，使键集分页的行值比较对每一行都成立：
+# 无到期日期排在最后，未使用和未检查排在最前
+ACCOUNT_SORT_KEYS = {
+    'id': 'accounts.id',
+    'name': 'accounts.name',
+    'email': "COALESCE(accounts.email, '')",
+    'username': "COALESCE(accounts.username, '')",
+    'status': 'accounts.status',
+    'subscription_type': "COALESCE(accounts.subscription_type, '')",
+    'expiry_date': "COALESCE(accounts.expiry_date, '9999')",
+    'tags': "COALESCE(accounts.tags, '')",
+    'last_used': "COALESCE(accounts.last_used, '')",
+    'usage_count': 'COALESCE(accounts.usage_count, 0)',
+    'created_at': 'accounts.created_at',
+    'password_breached': 'COALESCE(accounts.password_breached, -1)',
+}
+
+
+class DatabaseManager(AccountRepository):
+    """数据库管理器（SQLite 文件存储）"""
     
-    def __init__(self, db_path: str = "accounts.db"):
+    def __init__(self, db_path: str = "accounts.db", encryption_manager: EncryptionManager = None):
         self.db_path = db_path
+        self._encryption_manager = encryption_manager
+        # 解包后的盲索引密钥（密钥本身不随主密钥轮换改变，可一直缓存）
+        self._blind_index_key = None
         self.init_database()
+
+    @property
+    def encryption_manager(self) -> EncryptionManager:
+        """当前主密钥对应的加密管理器"""
+        if self._encryption_manager is not None:
+            return self._encryption_manager
+        return get_encryption_manager()
+
+    def connect(self):
+        """
+        打开数据库连接
+
+        用作 with 语句的上下文管理器：正常结束时提交，出现异常时回滚。
+        """
+        return sqlite3.connect(self.db_path)
     
     def init_database(self):
         """初始化数据库"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
 
             # 创建用户表
@@ -33,10 +111,17 @@ class DatabaseManager:
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
                     last_login TEXT,
-                    login_count INTEGER DEFAULT 0
+                    login_count INTEGER DEFAULT 0,
+                    hash_params TEXT
                 )
             ''')
 
+            cursor.execute("PRAGMA table_info(users)")
+            user_columns = [column[1] for column in cursor.fetchall()]
+            if 'hash_params' not in user_columns:
+                # 密码哈希参数（为空表示旧版默认参数）
+                cursor.execute('ALTER TABLE users ADD COLUMN hash_params TEXT')
+
             # 创建账号表（添加用户ID关联）
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS accounts (
@@ -61,6 +146,30 @@ class DatabaseManager:
                 )
             ''')
 
+            # 创建数据密钥表（信封加密：每个账号一个数据密钥，由主密钥包装）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS account_keys (
+                    account_id INTEGER PRIMARY KEY,
+                    wrapped_key TEXT NOT NULL,
+                    key_version INTEGER NOT NULL DEFAULT 1,
+                    needs_rekey INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL,
+                    FOREIGN KEY (account_id) REFERENCES accounts (id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_account_keys_needs_rekey
+                ON account_keys (account_id) WHERE needs_rekey = 1
+            ''')
+
+            # 保险库元数据（盲索引密钥，以及设置主密码后密钥派生的盐和主密钥校验值）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS vault_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            ''')
+
             # 检查是否需要迁移现有数据
             cursor.execute("PRAGMA table_info(accounts)")
             columns = [column[1] for column in cursor.fetchall()]
@@ -68,11 +177,46 @@ class DatabaseManager:
                 # 添加user_id列到现有账号表
                 cursor.execute('ALTER TABLE accounts ADD COLUMN user_id INTEGER DEFAULT 1')
 
+            if 'password_breached' not in columns:
+                # 密码泄露检查结果（NULL表示尚未检查）
+                cursor.execute('ALTER TABLE accounts ADD COLUMN password_breached INTEGER')
+
+            # 盲索引列、密码指纹和强度列及其索引
+            index_columns = [f'{field}_bidx' for field in BLIND_INDEX_FIELDS]
+            index_columns += ['password_fingerprint']
+            missing_index_columns = [column for column in index_columns if column not in columns]
+            for column in missing_index_columns:
+                cursor.execute(f'ALTER TABLE accounts ADD COLUMN {column} TEXT')
+            if 'password_strength' not in columns:
+                cursor.execute('ALTER TABLE accounts ADD COLUMN password_strength INTEGER')
+            for column in index_columns:
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS idx_accounts_{column} ON accounts ({column})'
+                )
+
+            # 账号页面按类型分页、默认按创建时间倒序
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_accounts_type_created
+                ON accounts (account_type, created_at, id)
+            ''')
+
+            # 新增盲索引列时只有已有账号才需要补建索引（新建的空库跳过密钥派生和全表扫描）
+            needs_backfill = bool(missing_index_columns) and cursor.execute(
+                'SELECT 1 FROM accounts LIMIT 1'
+            ).fetchone() is not None
+
             conn.commit()
+
+        # 旧数据库新增盲索引列后补建索引
+        if needs_backfill:
+            self.rebuild_blind_indexes()
     
+    @db_timed
     def add_account(self, account: Account, user_id: int = 1) -> int:
         """添加账号"""
-        with sqlite3.connect(self.db_path) as conn:
+        data_key = self.encryption_manager.generate_data_key()
+        index_key = self._index_key()
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO accounts (
@@ -86,8 +230,8 @@ class DatabaseManager:
                 account.account_type.value,
                 account.email,
                 account.username,
-                account.password,
-                account.api_key,
+                self.encryption_manager.encrypt_with_key(account.password, data_key),
+                self.encryption_manager.encrypt_with_key(account.api_key, data_key),
                 account.status.value,
                 account.subscription_type,
                 account.expiry_date.isoformat() if account.expiry_date else None,
@@ -99,60 +243,86 @@ class DatabaseManager:
                 account.usage_count
             ))
             account_id = cursor.lastrowid
+            self._save_data_key(cursor, account_id, data_key)
+            self._save_blind_indexes(cursor, index_key, account_id,
+                                     account.email, account.username, account.api_key)
+            self._save_password_fingerprint(cursor, index_key, account_id, account.password)
             conn.commit()
             return account_id
     
+    @db_timed
     def get_account(self, account_id: int) -> Optional[Account]:
         """获取单个账号"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM accounts WHERE id = ?', (account_id,))
+            cursor.execute(ACCOUNT_SELECT + 'WHERE accounts.id = ?', (account_id,))
             row = cursor.fetchone()
             if row:
                 return self._row_to_account(row)
             return None
     
+    @db_timed
     def get_all_accounts(self) -> List[Account]:
         """获取所有账号"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM accounts ORDER BY created_at DESC')
+            cursor.execute(ACCOUNT_SELECT + 'ORDER BY accounts.created_at DESC')
             rows = cursor.fetchall()
             accounts = [self._row_to_account(row) for row in rows]
             # 过滤掉None值（转换失败的记录）
             return [acc for acc in accounts if acc is not None]
 
+    @db_timed
     def get_accounts_by_user(self, user_id: int) -> List[Account]:
         """根据用户ID获取账号"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM accounts WHERE user_id = ? ORDER BY created_at DESC', (user_id,))
+            cursor.execute(ACCOUNT_SELECT + 'WHERE accounts.user_id = ? ORDER BY accounts.created_at DESC',
+                           (user_id,))
             rows = cursor.fetchall()
             return [self._row_to_account(row) for row in rows]
     
+    @db_timed
     def update_account(self, account: Account) -> bool:
         """更新账号"""
         if account.id is None:
             return False
         
         account.updated_at = datetime.now()
-        
-        with sqlite3.connect(self.db_path) as conn:
+        index_key = self._index_key()
+
+        with self.connect() as conn:
             cursor = conn.cursor()
+            self._begin_write(cursor)
+            data_key = self._load_data_key(cursor, account.id)
+            cursor.execute('SELECT password FROM accounts WHERE id = ?', (account.id,))
+            row = cursor.fetchone()
+            old_password = row[0] if row else ""
+            if data_key is not None:
+                old_password = self.encryption_manager.decrypt_with_key(old_password, data_key)
+            password_changed = (old_password or "") != account.password
+            if password_changed:
+                # 密码变更后泄露检查结果失效
+                account.password_breached = None
+
+            if data_key is None:
+                # 旧版明文账号在首次更新时分配数据密钥
+                data_key = self.encryption_manager.generate_data_key()
+                self._save_data_key(cursor, account.id, data_key)
             cursor.execute('''
                 UPDATE accounts SET
                     name = ?, account_type = ?, email = ?, username = ?,
                     password = ?, api_key = ?, status = ?, subscription_type = ?,
                     expiry_date = ?, notes = ?, tags = ?, updated_at = ?,
-                    last_used = ?, usage_count = ?
+                    last_used = ?, usage_count = ?, password_breached = ?
                 WHERE id = ?
             ''', (
                 account.name,
                 account.account_type.value,
                 account.email,
                 account.username,
-                account.password,
-                account.api_key,
+                self.encryption_manager.encrypt_with_key(account.password, data_key),
+                self.encryption_manager.encrypt_with_key(account.api_key, data_key),
                 account.status.value,
                 account.subscription_type,
                 account.expiry_date.isoformat() if account.expiry_date else None,
@@ -161,43 +331,181 @@ class DatabaseManager:
                 account.updated_at.isoformat(),
                 account.last_used.isoformat() if account.last_used else None,
                 account.usage_count,
+                account.password_breached,
                 account.id
             ))
+            updated = cursor.rowcount > 0
+            self._save_blind_indexes(cursor, index_key, account.id,
+                                     account.email, account.username, account.api_key)
+            if password_changed:
+                # 只在密码变更时重新计算指纹和强度
+                self._save_password_fingerprint(cursor, index_key, account.id, account.password)
             conn.commit()
-            return cursor.rowcount > 0
+            return updated
     
+    @db_timed
     def delete_account(self, account_id: int) -> bool:
         """删除账号"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
+            cursor.execute('DELETE FROM account_keys WHERE account_id = ?', (account_id,))
             cursor.execute('DELETE FROM accounts WHERE id = ?', (account_id,))
             conn.commit()
             return cursor.rowcount > 0
     
+    @db_timed
     def search_accounts(self, query: str) -> List[Account]:
         """搜索账号"""
-        with sqlite3.connect(self.db_path) as conn:
+        # 加密字段（如API密钥）只能通过盲索引精确匹配
+        api_key_index = self._blind_index('api_key', query)
+        with self.connect() as conn:
             cursor = conn.cursor()
             search_pattern = f'%{query}%'
-            cursor.execute('''
-                SELECT * FROM accounts 
-                WHERE name LIKE ? OR email LIKE ? OR username LIKE ? 
-                   OR notes LIKE ? OR tags LIKE ?
-                ORDER BY created_at DESC
-            ''', (search_pattern, search_pattern, search_pattern, 
-                  search_pattern, search_pattern))
+            cursor.execute(ACCOUNT_SELECT + '''
+                WHERE accounts.name LIKE ? OR accounts.email LIKE ? OR accounts.username LIKE ?
+                   OR accounts.notes LIKE ? OR accounts.tags LIKE ?
+                   OR accounts.api_key_bidx = ?
+                ORDER BY accounts.created_at DESC
+            ''', (search_pattern, search_pattern, search_pattern,
+                  search_pattern, search_pattern, api_key_index))
             rows = cursor.fetchall()
             return [self._row_to_account(row) for row in rows]
     
+    @db_timed
+    def find_accounts_by_field(self, field: str, value: str) -> List[Account]:
+        """
+        通过盲索引精确查找账号，无需解密
+
+        Args:
+            field: BLIND_INDEX_FIELDS 中的字段名
+            value: 要匹配的明文值
+        """
+        if field not in BLIND_INDEX_FIELDS:
+            raise ValueError(f"字段 '{field}' 没有盲索引")
+
+        index_value = self._blind_index(field, value)
+        if index_value is None:
+            return []
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(ACCOUNT_SELECT + f'WHERE accounts.{field}_bidx = ? ORDER BY accounts.created_at DESC',
+                           (index_value,))
+            rows = cursor.fetchall()
+            return [self._row_to_account(row) for row in rows]
+
+    @db_timed
+    def find_duplicate_account(self, account: Account) -> Optional[Account]:
+        """查找同类型下邮箱、用户名或API密钥相同的其他账号"""
+        index_key = self._index_key()
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            for field in BLIND_INDEX_FIELDS:
+                index_value = self.encryption_manager.blind_index(field, getattr(account, field), index_key)
+                if index_value is None:
+                    continue
+                cursor.execute(ACCOUNT_SELECT + f'''
+                    WHERE accounts.{field}_bidx = ? AND accounts.account_type = ?
+                      AND accounts.id IS NOT ?
+                    LIMIT 1
+                ''', (index_value, account.account_type.value, account.id))
+                row = cursor.fetchone()
+                if row:
+                    return self._row_to_account(row)
+        return None
+
+    @db_timed
     def get_accounts_by_type(self, account_type: AccountType) -> List[Account]:
         """根据类型获取账号"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM accounts WHERE account_type = ? ORDER BY created_at DESC', 
-                         (account_type.value,))
+            cursor.execute(ACCOUNT_SELECT + 'WHERE accounts.account_type = ? ORDER BY accounts.created_at DESC',
+                           (account_type.value,))
             rows = cursor.fetchall()
             return [self._row_to_account(row) for row in rows]
     
+    def _account_filter(self, account_type: Optional[AccountType], search: str,
+                        status: Optional[AccountStatus]) -> Tuple[List[str], list]:
+        """分页查询和计数共用的筛选条件（名称、邮箱或标签包含搜索文本）"""
+        conditions, params = [], []
+        if account_type is not None:
+            conditions.append('accounts.account_type = ?')
+            params.append(account_type.value)
+        if status is not None:
+            conditions.append('accounts.status = ?')
+            params.append(status.value)
+        if search:
+            # 转义通配符，按字面子串匹配
+            escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append(
+                "(accounts.name LIKE ? ESCAPE '\\' OR accounts.email LIKE ? ESCAPE '\\'"
+                " OR accounts.tags LIKE ? ESCAPE '\\')"
+            )
+            params.extend([f'%{escaped}%'] * 3)
+        return conditions, params
+
+    @db_timed
+    def get_accounts_page(self, account_type: Optional[AccountType] = None, search: str = "",
+                          status: Optional[AccountStatus] = None, sort_key: str = 'created_at',
+                          descending: bool = True, after: Optional[tuple] = None,
+                          limit: int = 200) -> Tuple[List[Account], Optional[tuple]]:
+        """
+        键集分页获取账号
+
+        按 (排序键, ID) 排序，下一页从上一页最后一行之后开始，
+        每页只扫描本页的行，不随翻页深度变慢。
+
+        Args:
+            account_type: 账号类型，为空时不限
+            search: 名称、邮箱或标签包含的文本
+            status: 账号状态，为空时不限
+            sort_key: ACCOUNT_SORT_KEYS 中的排序键
+            descending: 是否倒序
+            after: 上一页返回的游标，为空时获取第一页
+            limit: 每页行数
+
+        Returns:
+            (本页账号, 下一页游标)，没有更多数据时游标为 None
+        """
+        if sort_key not in ACCOUNT_SORT_KEYS:
+            raise ValueError(f"不支持按 '{sort_key}' 排序")
+
+        sort_expr = ACCOUNT_SORT_KEYS[sort_key]
+        direction = 'DESC' if descending else 'ASC'
+        conditions, params = self._account_filter(account_type, search, status)
+        if after is not None:
+            conditions.append(f"({sort_expr}, accounts.id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+        where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            # 多取一行判断是否还有下一页，最后一列为排序值（用作游标）
+            cursor.execute(
+                f'SELECT {ACCOUNT_COLUMNS}, {sort_expr} {ACCOUNT_FROM} {where} '
+                f'ORDER BY {sort_expr} {direction}, accounts.id {direction} LIMIT ?',
+                params + [limit + 1]
+            )
+            rows = cursor.fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = (rows[-1][-1], rows[-1][0]) if has_more else None
+        accounts = [self._row_to_account(row) for row in rows]
+        return [acc for acc in accounts if acc is not None], next_cursor
+
+    @db_timed
+    def count_accounts(self, account_type: Optional[AccountType] = None, search: str = "",
+                       status: Optional[AccountStatus] = None) -> int:
+        """统计符合条件的账号数量（筛选条件同 get_accounts_page）"""
+        conditions, params = self._account_filter(account_type, search, status)
+        where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT COUNT(*) FROM accounts {where}', params)
+            return cursor.fetchone()[0]
+
+    @traced(category="db")
     def _row_to_account(self, row) -> Account:
         """将数据库行转换为Account对象"""
         try:
@@ -215,8 +523,7 @@ class DatabaseManager:
 
             account.email = row[4] or ""
             account.username = row[5] or ""
-            account.password = row[6] or ""
-            account.api_key = row[7] or ""
+            account.password, account.api_key = self._decrypt_fields(row[18], row[6], row[7])
 
             # 安全地转换状态
             try:
@@ -254,22 +561,375 @@ class DatabaseManager:
                     account.last_used = None
 
             account.usage_count = row[16] or 0
+            account.password_breached = row[17]
 
             return account
         except Exception as e:
             print(f"转换账号数据失败: {e}, 跳过此记录")
             return None
 
+    @db_timed
+    def get_password_check_candidates(self, only_unchecked: bool = True) -> List[tuple]:
+        """
+        获取需要做泄露检查的账号密码
+
+        Returns:
+            (账号ID, 明文密码) 列表
+        """
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            query = '''
+                SELECT accounts.id, accounts.password, account_keys.wrapped_key
+                FROM accounts
+                LEFT JOIN account_keys ON account_keys.account_id = accounts.id
+                WHERE accounts.password IS NOT NULL AND accounts.password != ''
+            '''
+            if only_unchecked:
+                query += ' AND accounts.password_breached IS NULL'
+            cursor.execute(query)
+            return [
+                (account_id, self._decrypt_fields(wrapped_key, password)[0])
+                for account_id, password, wrapped_key in cursor.fetchall()
+            ]
+
+    @db_timed
+    def save_password_check_results(self, results: dict):
+        """
+        批量保存泄露检查结果
+
+        Args:
+            results: {账号ID: 泄露次数}
+        """
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                'UPDATE accounts SET password_breached = ? WHERE id = ?',
+                [(count, account_id) for account_id, count in results.items()]
+            )
+            conn.commit()
+
+    @db_timed
+    def get_password_audit(self) -> dict:
+        """
+        密码健康报告：按账号类型统计重复使用和弱密码
+
+        基于预先计算的密码指纹和强度分数，无需解密任何密码。
+
+        Returns:
+            {账号类型值: {'total': 有密码的账号数, 'reused': 重复使用数, 'weak': 弱密码数}}
+        """
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT accounts.account_type,
+                       COUNT(*),
+                       SUM(CASE WHEN reused.password_fingerprint IS NOT NULL THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN accounts.password_strength <= ? THEN 1 ELSE 0 END)
+                FROM accounts
+                LEFT JOIN (
+                    SELECT password_fingerprint FROM accounts
+                    WHERE password_fingerprint IS NOT NULL
+                    GROUP BY password_fingerprint
+                    HAVING COUNT(*) > 1
+                ) AS reused ON reused.password_fingerprint = accounts.password_fingerprint
+                WHERE accounts.password_fingerprint IS NOT NULL
+                GROUP BY accounts.account_type
+            ''', (WEAK_PASSWORD_SCORE,))
+            return {
+                account_type: {'total': total, 'reused': reused or 0, 'weak': weak or 0}
+                for account_type, total, reused, weak in cursor.fetchall()
+            }
+
+    @db_timed
+    def get_reused_password_accounts(self, account: Account) -> List[Account]:
+        """获取与指定账号使用相同密码的其他账号"""
+        fingerprint = self._blind_index('password', account.password)
+        if fingerprint is None:
+            return []
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(ACCOUNT_SELECT + '''
+                WHERE accounts.password_fingerprint = ? AND accounts.id IS NOT ?
+                ORDER BY accounts.created_at DESC
+            ''', (fingerprint, account.id))
+            rows = cursor.fetchall()
+            return [self._row_to_account(row) for row in rows]
+
+    # 数据密钥管理方法
+    def _begin_write(self, cursor):
+        """
+        开始写事务并立即获取写锁
+
+        先读取再写回的操作（更新账号、重新加密、轮换主密钥）在读取前调用，
+        使其他连接的写入不会插在读取和写回之间而被旧数据覆盖。
+        """
+        cursor.execute('BEGIN IMMEDIATE')
+
+    def _save_data_key(self, cursor, account_id: int, data_key: bytes, key_version: int = 1):
+        """包装并保存账号的数据密钥"""
+        cursor.execute('''
+            INSERT OR REPLACE INTO account_keys (
+                account_id, wrapped_key, key_version, needs_rekey, updated_at
+            ) VALUES (?, ?, ?, 0, ?)
+        ''', (
+            account_id,
+            self.encryption_manager.wrap_key(data_key),
+            key_version,
+            datetime.now().isoformat()
+        ))
+
+    def _load_data_key(self, cursor, account_id: int) -> Optional[bytes]:
+        """读取并解包账号的数据密钥"""
+        cursor.execute('SELECT wrapped_key FROM account_keys WHERE account_id = ?', (account_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return self.encryption_manager.unwrap_key(row[0])
+
+    def _decrypt_fields(self, wrapped_key: Optional[str], *values: str) -> tuple:
+        """用账号的数据密钥解密字段，没有数据密钥的旧版明文原样返回"""
+        if not wrapped_key:
+            return tuple(value or "" for value in values)
+
+        try:
+            data_key = self.encryption_manager.unwrap_key(wrapped_key)
+        except Exception as e:
+            print(f"解包数据密钥失败: {e}")
+            return tuple("" for _ in values)
+
+        return tuple(self.encryption_manager.decrypt_with_key(value, data_key) for value in values)
+
+    def _index_key(self) -> bytes:
+        """获取保险库的盲索引密钥（首次使用时读取并解包，尚未保存时生成）"""
+        if self._blind_index_key is None:
+            with self.connect() as conn:
+                self._blind_index_key = self._load_index_key(conn.cursor(), self.encryption_manager)
+                conn.commit()
+        return self._blind_index_key
+
+    def _load_index_key(self, cursor, manager: EncryptionManager) -> bytes:
+        """
+        读取并用 manager 解包盲索引密钥
+
+        保险库还没有盲索引密钥时生成并包装保存：空库使用随机密钥，
+        已有账号的旧库沿用由主密钥派生的索引密钥，已保存的盲索引和密码指纹无需重建。
+        """
+        cursor.execute('SELECT value FROM vault_meta WHERE key = ?', (INDEX_KEY_META,))
+        row = cursor.fetchone()
+        if row:
+            return manager.unwrap_key(row[0])
+
+        has_accounts = cursor.execute('SELECT 1 FROM accounts LIMIT 1').fetchone() is not None
+        index_key = manager.index_key if has_accounts else os.urandom(32)
+        cursor.execute('INSERT OR IGNORE INTO vault_meta (key, value) VALUES (?, ?)',
+                       (INDEX_KEY_META, manager.wrap_key(index_key)))
+        if cursor.rowcount == 0:
+            # 其他连接已先保存了索引密钥
+            return self._load_index_key(cursor, manager)
+        return index_key
+
+    def _blind_index(self, field: str, value: str) -> Optional[str]:
+        """用保险库的盲索引密钥计算字段的盲索引"""
+        return self.encryption_manager.blind_index(field, value, self._index_key())
+
+    def _save_blind_indexes(self, cursor, index_key: bytes, account_id: int,
+                            email: str, username: str, api_key: str):
+        """计算并保存账号的盲索引"""
+        manager = self.encryption_manager
+        cursor.execute('''
+            UPDATE accounts SET email_bidx = ?, username_bidx = ?, api_key_bidx = ?
+            WHERE id = ?
+        ''', (
+            manager.blind_index('email', email, index_key),
+            manager.blind_index('username', username, index_key),
+            manager.blind_index('api_key', api_key, index_key),
+            account_id
+        ))
+
+    def _save_password_fingerprint(self, cursor, index_key: bytes, account_id: int, password: str):
+        """计算并保存密码指纹（带密钥）和强度分数"""
+        cursor.execute('''
+            UPDATE accounts SET password_fingerprint = ?, password_strength = ?
+            WHERE id = ?
+        ''', (
+            self.encryption_manager.blind_index('password', password, index_key),
+            score_password_strength(password) if password else None,
+            account_id
+        ))
+
+    def _rebuild_blind_indexes(self, cursor, manager: EncryptionManager, index_key: bytes):
+        """用 manager 解密字段，按盲索引密钥重建全部盲索引和密码指纹"""
+        cursor.execute('''
+            SELECT accounts.id, accounts.email, accounts.username, accounts.api_key,
+                   accounts.password, account_keys.wrapped_key
+            FROM accounts
+            LEFT JOIN account_keys ON account_keys.account_id = accounts.id
+        ''')
+        indexes = []
+        for account_id, email, username, api_key, password, wrapped_key in cursor.fetchall():
+            if wrapped_key:
+                data_key = manager.unwrap_key(wrapped_key)
+                api_key = manager.decrypt_with_key(api_key, data_key)
+                password = manager.decrypt_with_key(password, data_key)
+            indexes.append((
+                manager.blind_index('email', email, index_key),
+                manager.blind_index('username', username, index_key),
+                manager.blind_index('api_key', api_key, index_key),
+                manager.blind_index('password', password, index_key),
+                score_password_strength(password) if password else None,
+                account_id
+            ))
+        cursor.executemany('''
+            UPDATE accounts SET email_bidx = ?, username_bidx = ?, api_key_bidx = ?,
+                                password_fingerprint = ?, password_strength = ?
+            WHERE id = ?
+        ''', indexes)
+
+    @db_timed
+    def rebuild_blind_indexes(self):
+        """用当前主密钥重建全部盲索引"""
+        index_key = self._index_key()
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            self._rebuild_blind_indexes(cursor, self.encryption_manager, index_key)
+            conn.commit()
+
+    @db_timed
+    def rotate_master_key(self, old_manager: EncryptionManager, new_manager: EncryptionManager) -> int:
+        """
+        轮换主密钥
+
+        在一个事务中重新包装数据密钥表和盲索引密钥并保存新主密钥的盐和校验值，
+        不重新加密账号数据，盲索引和密码指纹保持有效；
+        所有数据密钥被标记为待重新生成，由 rekey_pending_accounts 在后台惰性处理。
+
+        Returns:
+            重新包装的数据密钥数量
+        """
+        now = datetime.now().isoformat()
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            self._begin_write(cursor)
+            index_key = self._load_index_key(cursor, old_manager)
+            cursor.execute('SELECT account_id, wrapped_key FROM account_keys')
+            rewrapped = [
+                (new_manager.wrap_key(old_manager.unwrap_key(wrapped_key)), now, account_id)
+                for account_id, wrapped_key in cursor.fetchall()
+            ]
+            cursor.executemany('''
+                UPDATE account_keys SET
+                    wrapped_key = ?, key_version = key_version + 1,
+                    needs_rekey = 1, updated_at = ?
+                WHERE account_id = ?
+            ''', rewrapped)
+            cursor.executemany('INSERT OR REPLACE INTO vault_meta (key, value) VALUES (?, ?)', [
+                ('master_key_salt', base64.b64encode(new_manager.salt).decode()),
+                ('master_key_check', new_manager.create_key_check()),
+                (INDEX_KEY_META, new_manager.wrap_key(index_key)),
+            ])
+            conn.commit()
+
+        self._blind_index_key = index_key
+        if self._encryption_manager is not None:
+            self._encryption_manager = new_manager
+        return len(rewrapped)
+
+    @db_timed
+    def get_master_key_params(self) -> Optional[Tuple[bytes, str]]:
+        """
+        获取主密钥参数
+
+        Returns:
+            (密钥派生的盐, 主密钥校验值)，未设置主密码（使用默认密钥）时返回 None
+        """
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT key, value FROM vault_meta WHERE key IN ('master_key_salt', 'master_key_check')"
+            )
+            params = dict(cursor.fetchall())
+        if 'master_key_salt' not in params or 'master_key_check' not in params:
+            return None
+        return base64.b64decode(params['master_key_salt']), params['master_key_check']
+
+    @db_timed
+    def get_pending_rekey_ids(self, limit: int = 100) -> List[int]:
+        """获取需要重新生成数据密钥的账号ID（含尚未加密的旧版账号）"""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT account_id FROM account_keys WHERE needs_rekey = 1
+                UNION ALL
+                SELECT accounts.id FROM accounts
+                LEFT JOIN account_keys ON account_keys.account_id = accounts.id
+                WHERE account_keys.account_id IS NULL
+                LIMIT ?
+            ''', (limit,))
+            return [row[0] for row in cursor.fetchall()]
+
+    @db_timed
+    def rekey_account(self, account_id: int) -> bool:
+        """为单个账号生成新的数据密钥并重新加密敏感字段"""
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            self._begin_write(cursor)
+            cursor.execute('''
+                SELECT accounts.password, accounts.api_key,
+                       account_keys.wrapped_key, account_keys.key_version
+                FROM accounts
+                LEFT JOIN account_keys ON account_keys.account_id = accounts.id
+                WHERE accounts.id = ?
+            ''', (account_id,))
+            row = cursor.fetchone()
+            if not row:
+                return False
+
+            password, api_key = row[0] or "", row[1] or ""
+            if row[2]:
+                # 解包失败直接抛出，避免用空值覆盖原有数据
+                old_key = self.encryption_manager.unwrap_key(row[2])
+                password = self.encryption_manager.decrypt_with_key(password, old_key)
+                api_key = self.encryption_manager.decrypt_with_key(api_key, old_key)
+
+            data_key = self.encryption_manager.generate_data_key()
+            cursor.execute('UPDATE accounts SET password = ?, api_key = ? WHERE id = ?', (
+                self.encryption_manager.encrypt_with_key(password, data_key),
+                self.encryption_manager.encrypt_with_key(api_key, data_key),
+                account_id
+            ))
+            self._save_data_key(cursor, account_id, data_key, row[3] or 1)
+            conn.commit()
+            return True
+
+    @db_timed
+    def rekey_pending_accounts(self, batch_size: int = 100) -> int:
+        """
+        处理一批待重新加密的账号
+
+        Returns:
+            本批处理的账号数量，为0表示已全部完成
+        """
+        count = 0
+        for account_id in self.get_pending_rekey_ids(batch_size):
+            try:
+                if self.rekey_account(account_id):
+                    count += 1
+            except Exception as e:
+                print(f"重新加密账号 {account_id} 失败: {e}")
+        return count
+
     # 用户管理方法
+    @db_timed
     def add_user(self, user: User) -> int:
         """添加用户"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO users (
                     username, email, password_hash, salt, role, is_active,
-                    created_at, updated_at, last_login, login_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    created_at, updated_at, last_login, login_count, hash_params
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 user.username,
                 user.email,
@@ -280,44 +940,49 @@ class DatabaseManager:
                 user.created_at.isoformat(),
                 user.updated_at.isoformat(),
                 user.last_login.isoformat() if user.last_login else None,
-                user.login_count
+                user.login_count,
+                user.hash_params or None
             ))
             conn.commit()
             return cursor.lastrowid
 
+    @db_timed
     def get_user_by_username(self, username: str) -> Optional[User]:
         """根据用户名获取用户"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
             row = cursor.fetchone()
             return self._row_to_user(row) if row else None
 
+    @db_timed
     def get_user_by_email(self, email: str) -> Optional[User]:
         """根据邮箱获取用户"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
             row = cursor.fetchone()
             return self._row_to_user(row) if row else None
 
+    @db_timed
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """根据ID获取用户"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM users WHERE id = ?', (user_id,))
             row = cursor.fetchone()
             return self._row_to_user(row) if row else None
 
+    @db_timed
     def update_user(self, user: User) -> bool:
         """更新用户"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE users SET
                     username = ?, email = ?, password_hash = ?, salt = ?,
                     role = ?, is_active = ?, updated_at = ?,
-                    last_login = ?, login_count = ?
+                    last_login = ?, login_count = ?, hash_params = ?
                 WHERE id = ?
             ''', (
                 user.username,
@@ -329,14 +994,16 @@ class DatabaseManager:
                 user.updated_at.isoformat(),
                 user.last_login.isoformat() if user.last_login else None,
                 user.login_count,
+                user.hash_params or None,
                 user.id
             ))
             conn.commit()
             return cursor.rowcount > 0
 
+    @db_timed
     def get_all_users(self) -> List[User]:
         """获取所有用户"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM users ORDER BY created_at DESC')
             rows = cursor.fetchall()
@@ -359,5 +1026,92 @@ class DatabaseManager:
             user.last_login = datetime.fromisoformat(row[9])
 
         user.login_count = row[10] or 0
+        user.hash_params = row[11] or ""
 
         return user
+
+
+class _SharedConnection:
+    """内存数据库的共享连接：with 语句期间持有锁，结束时提交或回滚"""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.lock.acquire()
+        return self.conn.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            return self.conn.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self.lock.release()
+
+
+class MemoryDatabaseManager(DatabaseManager):
+    """
+    内存数据库管理器
+
+    与 DatabaseManager 使用相同的 SQL，数据保存在进程内的 SQLite 内存数据库中，
+    不读写磁盘。所有线程共用一个连接，由锁串行化访问。
+    """
+
+    def __init__(self, seed_path: str = None, encryption_manager: EncryptionManager = None):
+        """
+        初始化内存数据库
+
+        Args:
+            seed_path: 启动时载入的数据库文件（如测试库），为空时从空库开始
+            encryption_manager: 加密管理器，默认使用全局实例
+        """
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        if seed_path and os.path.exists(seed_path):
+            with sqlite3.connect(seed_path) as source:
+                source.backup(self._conn)
+        super().__init__(':memory:', encryption_manager)
+
+    def connect(self):
+        """获取共享连接"""
+        return _SharedConnection(self._conn, self._lock)
+
+
+def create_database_manager(backend: str = 'sqlite', path: str = 'accounts.db',
+                            encryption_manager: EncryptionManager = None) -> AccountRepository:
+    """
+    按存储类型创建账号存储
+
+    Args:
+        backend: sqlite（文件）或 memory（内存）
+        path: sqlite 为数据库文件路径；memory 为启动时载入的数据库文件
+            （修改不写回该文件），为空时从空库开始
+        encryption_manager: 加密管理器，默认使用全局实例
+    """
+    if backend == 'memory':
+        return MemoryDatabaseManager(path or None, encryption_manager)
+    if backend != 'sqlite':
+        raise ValueError(f"未知的存储类型: {backend}")
+    return DatabaseManager(path, encryption_manager)
+
+
+# 全局账号存储实例
+_database_manager: Optional[AccountRepository] = None
+
+
+def get_database_manager() -> AccountRepository:
+    """获取账号存储（类型和路径取自配置 database.backend 和 database.path）"""
+    global _database_manager
+    if _database_manager is None:
+        config = get_config_manager()
+        _database_manager = create_database_manager(
+            config.get('database.backend', 'sqlite'),
+            config.get('database.path', 'accounts.db')
+        )
+    return _database_manager
+
+
+def set_database_manager(manager: Optional[AccountRepository]):
+    """替换全局账号存储（测试和基准测试中注入内存存储）"""
+    global _database_manager
+    _database_manager = manager
@@ -0,0 +1,133 @@
+"""
+账号存储接口
+
+页面和后台任务只依赖此接口，具体存储由配置 database.backend 选择：
+sqlite 为磁盘上的 SQLite 数据库（DatabaseManager），
+memory 为进程内的内存数据库（MemoryDatabaseManager，用于测试和基准测试，不读写磁盘）。
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from models.account import Account, AccountType, AccountStatus
+from models.user import User
+from utils.encryption import EncryptionManager
+
+
+class AccountRepository(ABC):
+    """账号存储接口"""
+
+    # ---- 账号 ----
+
+    @abstractmethod
+    def add_account(self, account: Account, user_id: int = 1) -> int:
+        """添加账号，返回新账号ID"""
+
+    @abstractmethod
+    def get_account(self, account_id: int) -> Optional[Account]:
+        """获取单个账号"""
+
+    @abstractmethod
+    def get_all_accounts(self) -> List[Account]:
+        """获取所有账号（按创建时间从新到旧）"""
+
+    @abstractmethod
+    def get_accounts_by_user(self, user_id: int) -> List[Account]:
+        """获取用户的所有账号"""
+
+    @abstractmethod
+    def get_accounts_by_type(self, account_type: AccountType) -> List[Account]:
+        """获取指定类型的账号"""
+
+    @abstractmethod
+    def update_account(self, account: Account) -> bool:
+        """更新账号"""
+
+    @abstractmethod
+    def delete_account(self, account_id: int) -> bool:
+        """删除账号"""
+
+    @abstractmethod
+    def get_accounts_page(self, account_type: Optional[AccountType] = None, search: str = "",
+                          status: Optional[AccountStatus] = None, sort_key: str = 'created_at',
+                          descending: bool = True, after: Optional[tuple] = None,
+                          limit: int = 200) -> Tuple[List[Account], Optional[tuple]]:
+        """键集分页获取账号，返回 (本页账号, 下一页游标)，没有更多数据时游标为 None"""
+
+    @abstractmethod
+    def count_accounts(self, account_type: Optional[AccountType] = None, search: str = "",
+                       status: Optional[AccountStatus] = None) -> int:
+        """统计符合条件的账号数量"""
+
+    @abstractmethod
+    def search_accounts(self, query: str) -> List[Account]:
+        """按名称、邮箱、用户名、备注和标签模糊搜索，API 密钥精确匹配"""
+
+    @abstractmethod
+    def find_accounts_by_field(self, field: str, value: str) -> List[Account]:
+        """按字段精确查找账号（email、username、api_key）"""
+
+    @abstractmethod
+    def find_duplicate_account(self, account: Account) -> Optional[Account]:
+        """查找与给定账号重复的已有账号"""
+
+    # ---- 密码健康 ----
+
+    @abstractmethod
+    def get_password_check_candidates(self, only_unchecked: bool = True) -> List[tuple]:
+        """获取需要做泄露检查的 (账号ID, 明文密码)"""
+
+    @abstractmethod
+    def save_password_check_results(self, results: dict):
+        """保存泄露检查结果 {账号ID: 泄露次数}"""
+
+    @abstractmethod
+    def get_password_audit(self) -> dict:
+        """按账号类型统计重复使用和弱密码"""
+
+    @abstractmethod
+    def get_reused_password_accounts(self, account: Account) -> List[Account]:
+        """获取与给定账号使用相同密码的其他账号"""
+
+    # ---- 密钥维护 ----
+
+    @abstractmethod
+    def rebuild_blind_indexes(self):
+        """用当前主密钥重建全部盲索引"""
+
+    @abstractmethod
+    def rotate_master_key(self, old_manager: EncryptionManager, new_manager: EncryptionManager) -> int:
+        """轮换主密钥，返回重新包装的数据密钥数量"""
+
+    @abstractmethod
+    def get_master_key_params(self) -> Optional[Tuple[bytes, str]]:
+        """获取 (密钥派生的盐, 主密钥校验值)，未设置主密码时返回 None"""
+
+    @abstractmethod
+    def rekey_pending_accounts(self, batch_size: int = 100) -> int:
+        """处理一批待重新加密的账号，返回本批处理的数量"""
+
+    # ---- 用户 ----
+
+    @abstractmethod
+    def add_user(self, user: User) -> int:
+        """添加用户，返回新用户ID"""
+
+    @abstractmethod
+    def get_user_by_username(self, username: str) -> Optional[User]:
+        """按用户名获取用户"""
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """按邮箱获取用户"""
+
+    @abstractmethod
+    def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """按ID获取用户"""
+
+    @abstractmethod
+    def update_user(self, user: User) -> bool:
+        """更新用户"""
+
+    @abstractmethod
+    def get_all_users(self) -> List[User]:
+        """获取所有用户"""
@@ -6,9 +6,28 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 from enum import Enum
 import hashlib
+import hmac
 import secrets
 
 
+# 密码哈希算法及默认迭代次数
+HASH_ALGORITHM = "pbkdf2_sha256"
+DEFAULT_HASH_ITERATIONS = 100000
+
+
+def make_hash_params(iterations: int = DEFAULT_HASH_ITERATIONS) -> str:
+    """生成哈希参数字符串，如 pbkdf2_sha256$100000"""
+    return f"{HASH_ALGORITHM}${iterations}"
+
+
+def parse_hash_params(hash_params: str) -> tuple:
+    """解析哈希参数字符串，返回 (算法, 迭代次数)；为空时视为旧版默认参数"""
+    if not hash_params:
+        return HASH_ALGORITHM, DEFAULT_HASH_ITERATIONS
+    algorithm, _, iterations = hash_params.partition('$')
+    return algorithm, int(iterations)
+
+
 class UserRole(Enum):
     """用户角色枚举"""
     ADMIN = "管理员"
@@ -23,6 +42,7 @@ class User:
     email: str = ""
     password_hash: str = ""  # 密码哈希
     salt: str = ""  # 密码盐值
+    hash_params: str = ""  # 哈希参数，为空表示旧版默认参数
     role: UserRole = UserRole.USER
     is_active: bool = True
     created_at: datetime = None
@@ -36,20 +56,28 @@ class User:
         if self.updated_at is None:
             self.updated_at = datetime.now()
     
-    def set_password(self, password: str):
-        """设置密码"""
+    def set_password(self, password: str, iterations: int = DEFAULT_HASH_ITERATIONS):
+        """设置密码（耗时操作，界面中应在后台线程调用）"""
         self.salt = secrets.token_hex(32)
-        self.password_hash = self._hash_password(password, self.salt)
+        self.hash_params = make_hash_params(iterations)
+        self.password_hash = self._hash_password(password, self.salt, iterations)
         self.updated_at = datetime.now()
     
     def verify_password(self, password: str) -> bool:
-        """验证密码"""
-        return self.password_hash == self._hash_password(password, self.salt)
+        """验证密码（耗时操作，界面中应在后台线程调用）"""
+        _, iterations = parse_hash_params(self.hash_params)
+        return hmac.compare_digest(
+            self.password_hash, self._hash_password(password, self.salt, iterations)
+        )
+    
+    def needs_rehash(self, iterations: int = DEFAULT_HASH_ITERATIONS) -> bool:
+        """检查存储的哈希参数是否与当前配置不一致"""
+        return parse_hash_params(self.hash_params) != (HASH_ALGORITHM, iterations)
     
     @staticmethod
-    def _hash_password(password: str, salt: str) -> str:
+    def _hash_password(password: str, salt: str, iterations: int = DEFAULT_HASH_ITERATIONS) -> str:
         """生成密码哈希"""
-        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), 100000).hex()
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), iterations).hex()
     
     def update_login(self):
         """更新登录信息"""
@@ -65,6 +93,7 @@ class User:
             'email': self.email,
             'password_hash': self.password_hash,
             'salt': self.salt,
+            'hash_params': self.hash_params,
             'role': self.role.value,
             'is_active': self.is_active,
             'created_at': self.created_at.isoformat() if self.created_at else None,
@@ -82,6 +111,7 @@ class User:
         user.email = data.get('email', '')
         user.password_hash = data.get('password_hash', '')
         user.salt = data.get('salt', '')
+        user.hash_params = data.get('hash_params', '')
         user.role = UserRole(data.get('role', UserRole.USER.value))
         user.is_active = data.get('is_active', True)
         user.login_count = data.get('login_count', 0)
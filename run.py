@@ -14,7 +14,9 @@ if __name__ == "__main__":
     from PySide6.QtWidgets import QApplication
     from PySide6.QtCore import Qt
 
+    from models.database import get_database_manager
     from ui.main_window import MainWindow
+    from ui.master_password_dialog import unlock_vault
 
     # 创建应用程序
     app = QApplication(sys.argv)
@@ -35,6 +37,10 @@ if __name__ == "__main__":
         # Qt6中可能不存在这些属性
         pass
 
+    # 设置了主密码时先解锁
+    if not unlock_vault(get_database_manager()):
+        sys.exit(0)
+
     # 创建主窗口
     window = MainWindow()
     window.show()
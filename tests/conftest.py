@@ -0,0 +1,36 @@
+"""
+测试公共配置
+"""
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 界面测试不需要显示器
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import utils.encryption as encryption
+from models.database import MemoryDatabaseManager
+
+
+@pytest.fixture
+def master_key(monkeypatch):
+    """隔离全局加密管理器，测试结束后恢复"""
+    monkeypatch.setattr(encryption, '_encryption_manager', None)
+    return encryption.get_encryption_manager()
+
+
+@pytest.fixture
+def memory_db(master_key):
+    """使用全局加密管理器的空内存数据库"""
+    return MemoryDatabaseManager()
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """全部测试共用的 QApplication"""
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
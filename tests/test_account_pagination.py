@@ -0,0 +1,97 @@
+"""
+账号键集分页测试
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.account import Account, AccountStatus, AccountType
+from models.database import ACCOUNT_SORT_KEYS
+
+
+@pytest.fixture
+def accounts_db(memory_db):
+    """53 个账号：名称有重复，部分没有到期日期和使用记录"""
+    base = datetime(2024, 1, 1)
+    for i in range(53):
+        memory_db.add_account(Account(
+            name=f"account {i % 7}",
+            account_type=AccountType.CURSOR if i % 3 else AccountType.CLAUDE,
+            email=f"user{i}@example.com",
+            status=AccountStatus.EXPIRED if i % 5 == 0 else AccountStatus.ACTIVE,
+            expiry_date=base + timedelta(days=i % 4) if i % 2 else None,
+            last_used=base + timedelta(hours=i) if i % 3 == 0 else None,
+            usage_count=i % 6,
+            tags="work" if i % 4 == 0 else "",
+            created_at=base + timedelta(minutes=i),
+        ))
+    return memory_db
+
+
+def collect(db, page_size, **kwargs):
+    """逐页读取全部账号"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        page, cursor = db.get_accounts_page(after=cursor, limit=page_size, **kwargs)
+        ids.extend(account.id for account in page)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.mark.parametrize('sort_key', sorted(ACCOUNT_SORT_KEYS))
+@pytest.mark.parametrize('descending', [False, True])
+def test_pages_cover_every_row_once(accounts_db, sort_key, descending):
+    everything, _ = collect(accounts_db, 1000, sort_key=sort_key, descending=descending)
+    paged, pages = collect(accounts_db, 10, sort_key=sort_key, descending=descending)
+
+    assert len(everything) == 53
+    assert paged == everything
+    assert pages == 6
+
+
+def test_nullable_columns_sort_like_the_table(accounts_db):
+    ids, _ = collect(accounts_db, 8, sort_key='expiry_date', descending=False)
+    accounts = [accounts_db.get_account(account_id) for account_id in ids]
+
+    # 无到期日期排在最后
+    dated = [account.expiry_date for account in accounts if account.expiry_date]
+    assert [account.expiry_date for account in accounts[:len(dated)]] == sorted(dated)
+    assert all(account.expiry_date is None for account in accounts[len(dated):])
+
+
+def test_ties_broken_by_id(accounts_db):
+    ids, _ = collect(accounts_db, 4, sort_key='name', descending=False)
+    names = [accounts_db.get_account(account_id).name for account_id in ids]
+
+    assert names == sorted(names)
+    for name in set(names):
+        same = [account_id for account_id, n in zip(ids, names) if n == name]
+        assert same == sorted(same)
+
+
+def test_filters_match_count(accounts_db):
+    filters = [
+        {'account_type': AccountType.CLAUDE},
+        {'status': AccountStatus.EXPIRED},
+        {'search': 'work'},
+        {'search': 'user1'},
+        {'account_type': AccountType.CURSOR, 'status': AccountStatus.ACTIVE, 'search': 'example'},
+    ]
+    for kwargs in filters:
+        ids, _ = collect(accounts_db, 7, **kwargs)
+        assert len(ids) == len(set(ids)) == accounts_db.count_accounts(**kwargs)
+
+
+def test_search_wildcards_are_literal(accounts_db):
+    assert accounts_db.count_accounts(search='%') == 0
+    assert accounts_db.count_accounts(search='_') == 0
+
+
+def test_unknown_sort_key_rejected(accounts_db):
+    with pytest.raises(ValueError):
+        accounts_db.get_accounts_page(sort_key='password')
+
+
+def test_empty_result(memory_db):
+    assert memory_db.get_accounts_page() == ([], None)
@@ -0,0 +1,106 @@
+"""
+账号表格模型测试（在 QTableView 中显示并处理事件）
+"""
+import sys
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QTableView
+
+from models.account import Account, AccountStatus, AccountType
+from ui.account_table_model import COLUMNS, COLUMN_CREATED, COLUMN_STATUS, TONE_COLORS, AccountTableModel
+
+
+@pytest.fixture
+def accounts_db(memory_db):
+    for i in range(450):
+        memory_db.add_account(Account(
+            name=f"account {i:03d}",
+            account_type=AccountType.CURSOR if i % 2 else AccountType.WINDSURF,
+            email=f"user{i}@example.com",
+            status=AccountStatus.EXPIRED if i % 3 == 0 else AccountStatus.ACTIVE,
+            usage_count=i % 10,
+        ))
+    return memory_db
+
+
+def show_model(qapp, model):
+    view = QTableView()
+    view.setModel(model)
+    view.setSortingEnabled(True)
+    view.resize(1200, 800)
+    view.show()
+    for _ in range(20):
+        qapp.processEvents()
+    return view
+
+
+def test_view_renders_and_fetches_pages(qapp, accounts_db):
+    model = AccountTableModel(accounts_db, page_size=100)
+    model.reload()
+    view = show_model(qapp, model)
+
+    assert model.rowCount() == 100
+    assert model.total_count() == 450
+
+    view.scrollToBottom()
+    for _ in range(20):
+        qapp.processEvents()
+    assert model.rowCount() > 100
+
+    while model.canFetchMore():
+        model.fetchMore()
+    qapp.processEvents()
+    assert model.rowCount() == 450
+    assert len({model.account_at(row).id for row in range(450)}) == 450
+
+
+def test_header_data(qapp, accounts_db):
+    model = AccountTableModel(accounts_db)
+    show_model(qapp, model)
+
+    assert [model.headerData(i, Qt.Horizontal) for i in range(len(COLUMNS))] == [c[0] for c in COLUMNS]
+    assert model.headerData(len(COLUMNS), Qt.Horizontal) is None
+    assert model.headerData(4, Qt.Vertical) == 5
+    assert model.headerData(0, Qt.Horizontal, Qt.ToolTipRole) is None
+
+
+def test_sort_by_clicking_header(qapp, accounts_db):
+    model = AccountTableModel(accounts_db, account_type=AccountType.CURSOR, page_size=50)
+    model.reload()
+    view = show_model(qapp, model)
+
+    view.sortByColumn(1, Qt.AscendingOrder)
+    for _ in range(10):
+        qapp.processEvents()
+
+    names = [model.index(row, 1).data() for row in range(model.rowCount())]
+    assert names == sorted(names)
+    assert model.total_count() == 225
+    assert model.sort_column != COLUMN_CREATED
+
+
+def test_status_colored(qapp, accounts_db):
+    model = AccountTableModel(accounts_db)
+    model.reload()
+
+    for row in range(10):
+        account = model.account_at(row)
+        expected = TONE_COLORS['bad' if account.status == AccountStatus.EXPIRED else 'good']
+        assert model.index(row, COLUMN_STATUS).data(Qt.ForegroundRole) == expected
+    assert model.index(0, 1).data(Qt.ForegroundRole) is None
+
+
+def test_repaint_keeps_none_refcount(qapp, accounts_db):
+    # 部分 PySide6 版本在调用基类虚函数时会少计 None 的引用，重复绘制后进程崩溃
+    model = AccountTableModel(accounts_db)
+    model.reload()
+    view = show_model(qapp, model)
+
+    before = sys.getrefcount(None)
+    for _ in range(20):
+        view.viewport().repaint()
+        view.horizontalHeader().viewport().repaint()
+        view.verticalHeader().viewport().repaint()
+        qapp.processEvents()
+    assert sys.getrefcount(None) >= before - 100
@@ -0,0 +1,67 @@
+"""
+异步日志队列溢出策略测试
+"""
+import logging
+import queue
+import threading
+
+from utils.logger import AsyncQueueHandler, LogWriterThread, QueueOverflowPolicy
+
+
+def make_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+def make_handler(maxsize: int) -> AsyncQueueHandler:
+    log_queue = queue.Queue(maxsize=maxsize)
+    # 写入线程不启动，直接检查队列内容
+    writer = LogWriterThread(log_queue, [])
+    return AsyncQueueHandler(log_queue, writer, QueueOverflowPolicy.DROP_OLDEST)
+
+
+def drain(log_queue: queue.Queue) -> list:
+    items = []
+    while not log_queue.empty():
+        items.append(log_queue.get_nowait())
+    return items
+
+
+def test_drop_oldest_evicts_records():
+    handler = make_handler(2)
+    for message in ("a", "b", "c"):
+        handler.enqueue(make_record(message))
+
+    assert [item.msg for item in drain(handler.queue)] == ["b", "c"]
+    assert handler.dropped_count == 1
+
+
+def test_drop_oldest_keeps_control_items():
+    handler = make_handler(3)
+    event = threading.Event()
+    handler.queue.put(event)
+    handler.queue.put(LogWriterThread._STOP)
+    handler.enqueue(make_record("a"))
+
+    handler.enqueue(make_record("b"))
+
+    items = drain(handler.queue)
+    assert event in items
+    assert LogWriterThread._STOP in items
+    assert [item.msg for item in items if isinstance(item, logging.LogRecord)] == ["b"]
+    assert handler.dropped_count == 1
+
+
+def test_flush_completes_under_overflow():
+    log_queue = queue.Queue(maxsize=4)
+    writer = LogWriterThread(log_queue, [logging.NullHandler()], flush_interval=0)
+    handler = AsyncQueueHandler(log_queue, writer, QueueOverflowPolicy.DROP_OLDEST)
+    writer.start()
+    try:
+        event = threading.Event()
+        log_queue.put(event)
+        for index in range(1000):
+            handler.enqueue(make_record(str(index)))
+        assert event.wait(5)
+    finally:
+        writer.stop()
+    assert not writer.is_alive()
@@ -0,0 +1,122 @@
+"""
+盲索引查找测试
+"""
+import sqlite3
+
+import pytest
+
+import utils.encryption as encryption
+from models.account import Account, AccountType
+from models.database import DatabaseManager
+
+
+def add(db, name, **kwargs) -> int:
+    kwargs.setdefault('account_type', AccountType.CURSOR)
+    return db.add_account(Account(name=name, **kwargs))
+
+
+def test_find_by_email_ignores_case_and_whitespace(memory_db):
+    account_id = add(memory_db, "alice", email="Alice@Example.com")
+    add(memory_db, "bob", email="bob@example.com")
+
+    found = memory_db.find_accounts_by_field('email', "  alice@EXAMPLE.com ")
+    assert [account.id for account in found] == [account_id]
+
+
+def test_find_by_api_key_is_exact(memory_db):
+    account_id = add(memory_db, "alice", api_key="sk-secret")
+
+    assert [a.id for a in memory_db.find_accounts_by_field('api_key', "sk-secret")] == [account_id]
+    assert memory_db.find_accounts_by_field('api_key', "SK-SECRET") == []
+    assert memory_db.find_accounts_by_field('api_key', "") == []
+
+
+def test_field_without_index_rejected(memory_db):
+    with pytest.raises(ValueError):
+        memory_db.find_accounts_by_field('password', "anything")
+
+
+def test_index_follows_updates(memory_db):
+    account_id = add(memory_db, "alice", email="old@example.com")
+    account = memory_db.get_account(account_id)
+    account.email = "new@example.com"
+    memory_db.update_account(account)
+
+    assert memory_db.find_accounts_by_field('email', "old@example.com") == []
+    assert [a.id for a in memory_db.find_accounts_by_field('email', "new@example.com")] == [account_id]
+
+
+def test_duplicate_detection(memory_db):
+    add(memory_db, "alice", username="alice01")
+    add(memory_db, "other type", username="alice01", account_type=AccountType.CLAUDE)
+
+    duplicate = memory_db.find_duplicate_account(
+        Account(name="copy", account_type=AccountType.CURSOR, username="ALICE01")
+    )
+    assert duplicate is not None and duplicate.name == "alice"
+    assert memory_db.find_duplicate_account(
+        Account(name="copy", account_type=AccountType.WINDSURF, username="alice01")
+    ) is None
+
+
+def test_index_rebuilt_on_rotation(memory_db):
+    account_id = add(memory_db, "alice", email="alice@example.com")
+
+    encryption.set_master_password("new master password", memory_db)
+
+    assert [a.id for a in memory_db.find_accounts_by_field('email', "alice@example.com")] == [account_id]
+
+
+def test_rotation_keeps_indexes_and_rewraps_index_key(tmp_path, master_key, monkeypatch):
+    path = str(tmp_path / "vault.db")
+    db = DatabaseManager(path)
+    account_id = add(db, "bob", email="bob@example.com", password="bob-password")
+    before = sqlite3.connect(path).execute(
+        'SELECT email_bidx, password_fingerprint FROM accounts'
+    ).fetchall()
+
+    encryption.set_master_password("new master password", db)
+
+    # 轮换只重新包装索引密钥，已保存的盲索引不变
+    after = sqlite3.connect(path).execute(
+        'SELECT email_bidx, password_fingerprint FROM accounts'
+    ).fetchall()
+    assert after == before
+
+    # 重新启动并解锁后，新的管理器从保险库解包出同一个索引密钥
+    salt, key_check = db.get_master_key_params()
+    monkeypatch.setattr(encryption, '_encryption_manager', None)
+    assert encryption.unlock_master_password("new master password", salt, key_check)
+    reopened = DatabaseManager(path)
+    assert [a.id for a in reopened.find_accounts_by_field('email', "bob@example.com")] == [account_id]
+
+
+def test_backfill_for_legacy_database(tmp_path, master_key):
+    # 旧版数据库（没有盲索引列）中已有的账号在打开时补建索引
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute('''
+            CREATE TABLE accounts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+                name TEXT NOT NULL, account_type TEXT NOT NULL, email TEXT, username TEXT,
+                password TEXT, api_key TEXT, status TEXT NOT NULL DEFAULT 'ACTIVE',
+                subscription_type TEXT, expiry_date TEXT, notes TEXT, tags TEXT,
+                created_at TEXT NOT NULL, updated_at TEXT NOT NULL, last_used TEXT,
+                usage_count INTEGER DEFAULT 0
+            )
+        ''')
+        conn.execute('''
+            INSERT INTO accounts (user_id, name, account_type, email, created_at, updated_at)
+            VALUES (1, 'legacy', 'Cursor', 'legacy@example.com', '2024-01-01', '2024-01-01')
+        ''')
+
+    db = DatabaseManager(path)
+    assert [a.name for a in db.find_accounts_by_field('email', "legacy@example.com")] == ["legacy"]
+
+
+def test_new_database_skips_backfill(tmp_path, master_key, monkeypatch):
+    calls = []
+    monkeypatch.setattr(DatabaseManager, 'rebuild_blind_indexes', lambda self: calls.append(self))
+
+    DatabaseManager(str(tmp_path / "new.db"))
+    assert calls == []
@@ -0,0 +1,70 @@
+"""
+泄露密码库二分查找测试
+"""
+import hashlib
+
+import pytest
+
+from utils.breach_check import BreachedPasswordChecker
+
+
+def sha1(password: str) -> str:
+    return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+
+
+@pytest.fixture
+def hash_file(tmp_path):
+    """按哈希排序的密码库（CRLF 换行，最后一行没有换行符）"""
+    counts = {sha1(f"password{i}"): i + 1 for i in range(200)}
+    counts[sha1("123456")] = 37359195
+    lines = [f"{h}:{c}" for h, c in sorted(counts.items())]
+    path = tmp_path / "pwned.txt"
+    path.write_bytes("\r\n".join(lines).encode())
+    return str(path), counts
+
+
+def test_every_entry_found(hash_file):
+    path, counts = hash_file
+    with BreachedPasswordChecker(path) as checker:
+        for sha1_hex, count in counts.items():
+            assert checker.lookup_hash(sha1_hex) == count
+
+
+def test_first_and_last_lines(hash_file):
+    path, counts = hash_file
+    ordered = sorted(counts)
+    with BreachedPasswordChecker(path) as checker:
+        assert checker.lookup_hash(ordered[0]) == counts[ordered[0]]
+        assert checker.lookup_hash(ordered[-1]) == counts[ordered[-1]]
+
+
+def test_lookup_password_and_case(hash_file):
+    path, _ = hash_file
+    with BreachedPasswordChecker(path) as checker:
+        assert checker.lookup_password("123456") == 37359195
+        assert checker.lookup_hash(sha1("password7").lower()) == 8
+
+
+def test_missing_passwords(hash_file):
+    path, counts = hash_file
+    with BreachedPasswordChecker(path) as checker:
+        assert checker.lookup_password("correct horse battery staple") == 0
+        assert checker.lookup_password("") == 0
+        # 比所有哈希都小或都大
+        assert checker.lookup_hash("0" * 40) == 0
+        assert checker.lookup_hash("F" * 40) == 0
+
+
+def test_single_line_file(tmp_path):
+    path = tmp_path / "one.txt"
+    path.write_text(f"{sha1('hunter2')}:5\n")
+    with BreachedPasswordChecker(str(path)) as checker:
+        assert checker.lookup_password("hunter2") == 5
+        assert checker.lookup_password("hunter3") == 0
+
+
+def test_empty_file_rejected(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        BreachedPasswordChecker(str(path)).open()
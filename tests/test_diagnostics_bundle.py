@@ -0,0 +1,68 @@
+"""
+诊断包脱敏测试
+"""
+import json
+import zipfile
+
+from utils.diagnostics_bundle import REDACTED, build_diagnostics_bundle, redact_config, scrub_text
+
+
+def test_redact_sensitive_keys():
+    config = {
+        'window': {'width': 1200, 'height': 800},
+        'cursor': {'email': 'me@example.com', 'password': 'hunter2', 'token': ''},
+        'security': {'master_key': 'abc', 'password_hash_iterations': 600000},
+        'accounts': [{'username': 'alice'}],
+    }
+
+    redacted = redact_config(config)
+
+    assert redacted['window'] == {'width': 1200, 'height': 800}
+    assert redacted['cursor'] == {'email': REDACTED, 'password': REDACTED, 'token': ''}
+    assert redacted['security']['master_key'] == REDACTED
+    # 非字符串的值保留（如迭代次数），便于排查性能问题
+    assert redacted['security']['password_hash_iterations'] == 600000
+    assert redacted['accounts'] == [{'username': REDACTED}]
+    # 返回副本，不修改原配置
+    assert config['cursor']['password'] == 'hunter2'
+
+
+def test_redact_scrubs_values_under_plain_keys():
+    redacted = redact_config({'last_error': 'login failed for bob@example.com password=hunter2'})
+    assert redacted['last_error'] == f'login failed for <email> password={REDACTED}'
+
+
+def test_scrub_text():
+    text = (
+        'user alice@example.co.uk logged in\n'
+        '{"api_key": "sk-123", "name": "ok"}\n'
+        'PIN: 1234, token=abc.def'
+    )
+
+    scrubbed = scrub_text(text)
+
+    assert 'alice@example.co.uk' not in scrubbed and '<email>' in scrubbed
+    assert 'sk-123' not in scrubbed and '"name": "ok"' in scrubbed
+    assert '1234' not in scrubbed and 'abc.def' not in scrubbed
+
+
+def test_bundle_contents_are_redacted(tmp_path):
+    log_file = tmp_path / "app.log"
+    log_file.write_text("first line\nsaved password=hunter2 for bob@example.com\n", encoding='utf-8')
+
+    path = build_diagnostics_bundle(
+        str(tmp_path / "bundle.zip"), db_path=str(tmp_path / "missing.db"),
+        config={'cursor': {'password': 'hunter2'}}, metrics={}, slow_calls=[], stalls=[],
+        log_files=[str(log_file)], log_tail_bytes=50
+    )
+
+    with zipfile.ZipFile(path) as bundle:
+        names = set(bundle.namelist())
+        config = json.loads(bundle.read('config.json'))
+        tail = bundle.read('logs/app.log.tail').decode('utf-8')
+
+    assert {'manifest.json', 'database.json', 'config.json', 'logs/app.log.tail'} <= names
+    assert config == {'cursor': {'password': REDACTED}}
+    # 只附带末尾的完整行，并替换其中的敏感内容
+    assert tail == f'saved password={REDACTED} for <email>\n'
+    assert not (tmp_path / "bundle.zip.tmp").exists()
@@ -0,0 +1,98 @@
+"""
+信封加密与主密钥轮换测试
+"""
+import pytest
+
+import utils.encryption as encryption
+from models.account import Account, AccountType
+from utils.encryption import EncryptionManager, is_encrypted
+
+
+def make_account(name="test", **kwargs) -> Account:
+    kwargs.setdefault('account_type', AccountType.CURSOR)
+    kwargs.setdefault('email', f"{name}@example.com")
+    kwargs.setdefault('password', f"{name}-password")
+    kwargs.setdefault('api_key', f"sk-{name}")
+    return Account(name=name, **kwargs)
+
+
+def raw_row(db, account_id):
+    with db.connect() as conn:
+        return conn.execute(
+            'SELECT password, api_key FROM accounts WHERE id = ?', (account_id,)
+        ).fetchone()
+
+
+def test_data_key_round_trip():
+    manager = EncryptionManager("correct horse", b'0123456789abcdef')
+    data_key = manager.generate_data_key()
+    wrapped = manager.wrap_key(data_key)
+
+    assert manager.unwrap_key(wrapped) == data_key
+    encrypted = manager.encrypt_with_key("secret", data_key)
+    assert is_encrypted(encrypted)
+    assert manager.decrypt_with_key(encrypted, data_key) == "secret"
+
+
+def test_key_check_rejects_wrong_password():
+    salt = b'0123456789abcdef'
+    key_check = EncryptionManager("correct horse", salt).create_key_check()
+
+    assert EncryptionManager("correct horse", salt).verify_key_check(key_check)
+    assert not EncryptionManager("wrong", salt).verify_key_check(key_check)
+
+
+def test_fields_encrypted_at_rest(memory_db):
+    account_id = memory_db.add_account(make_account("alice"))
+
+    password, api_key = raw_row(memory_db, account_id)
+    assert is_encrypted(password) and "alice-password" not in password
+    assert is_encrypted(api_key)
+
+    account = memory_db.get_account(account_id)
+    assert account.password == "alice-password"
+    assert account.api_key == "sk-alice"
+
+
+def test_rotation_keeps_data_readable(memory_db):
+    account_id = memory_db.add_account(make_account("bob"))
+    before = raw_row(memory_db, account_id)
+
+    encryption.set_master_password("new master password", memory_db)
+
+    # 轮换只重新包装数据密钥，字段密文不变
+    assert raw_row(memory_db, account_id) == before
+    assert memory_db.get_pending_rekey_ids() == [account_id]
+    assert memory_db.get_account(account_id).password == "bob-password"
+
+    # 后台重新加密后字段换用新数据密钥
+    assert memory_db.rekey_pending_accounts() == 1
+    assert raw_row(memory_db, account_id) != before
+    assert memory_db.get_pending_rekey_ids() == []
+    assert memory_db.get_account(account_id).api_key == "sk-bob"
+
+
+def test_unlock_after_rotation(memory_db, monkeypatch):
+    account_id = memory_db.add_account(make_account("carol"))
+    assert memory_db.get_master_key_params() is None
+
+    encryption.set_master_password("new master password", memory_db)
+    salt, key_check = memory_db.get_master_key_params()
+
+    # 模拟重新启动：全局加密管理器回到默认密钥
+    monkeypatch.setattr(encryption, '_encryption_manager', None)
+    assert not encryption.unlock_master_password("wrong", salt, key_check)
+    assert encryption.unlock_master_password("new master password", salt, key_check)
+    assert memory_db.get_account(account_id).password == "carol-password"
+
+
+def test_rotation_rolls_back_on_failure(memory_db):
+    account_id = memory_db.add_account(make_account("dave"))
+    wrong_old = EncryptionManager("not the current key")
+
+    with pytest.raises(Exception):
+        memory_db.rotate_master_key(wrong_old, EncryptionManager("new", b'0123456789abcdef'))
+
+    assert memory_db.get_master_key_params() is None
+    assert memory_db.get_pending_rekey_ids() == []
+    assert memory_db.get_account(account_id).password == "dave-password"
@@ -0,0 +1,116 @@
+"""
+只发出最新查询结果的后台执行器测试
+"""
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QThreadPool
+
+from ui.workers import LatestTaskRunner
+
+
+@pytest.fixture
+def app(qapp):
+    return qapp
+
+
+@pytest.fixture
+def pool():
+    """单线程的线程池，使排队和执行顺序确定"""
+    pool = QThreadPool()
+    pool.setMaxThreadCount(1)
+    yield pool
+    pool.waitForDone()
+
+
+def wait_until_idle(app, runner, pool, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while (runner.is_busy() or pool.activeThreadCount()) and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    pool.waitForDone()
+    app.processEvents()
+
+
+def test_only_latest_result_emitted(app, pool):
+    runner = LatestTaskRunner(pool)
+    completed, failed, ran = [], [], []
+    runner.completed.connect(completed.append)
+    runner.failed.connect(failed.append)
+
+    release = threading.Event()
+
+    def slow(value):
+        release.wait(5)
+        ran.append(value)
+        return value
+
+    def fast(value):
+        ran.append(value)
+        return value
+
+    runner.submit(slow, "stale")      # 已开始执行，无法中断
+    time.sleep(0.05)
+    runner.submit(fast, "skipped")    # 仍在队列中，被新查询移除
+    runner.submit(fast, "latest")
+    release.set()
+    wait_until_idle(app, runner, pool)
+
+    assert completed == ["latest"]
+    assert failed == []
+    assert ran == ["stale", "latest"]
+    assert not runner.is_busy()
+
+
+def test_stale_failure_discarded(app, pool):
+    runner = LatestTaskRunner(pool)
+    completed, failed = [], []
+    runner.completed.connect(completed.append)
+    runner.failed.connect(failed.append)
+
+    release = threading.Event()
+
+    def broken():
+        release.wait(5)
+        raise RuntimeError("stale error")
+
+    runner.submit(broken)
+    time.sleep(0.05)
+    runner.submit(lambda: 42)
+    release.set()
+    wait_until_idle(app, runner, pool)
+
+    assert completed == [42]
+    assert failed == []
+
+
+def test_latest_failure_reported(app, pool):
+    runner = LatestTaskRunner(pool)
+    failed = []
+    runner.failed.connect(failed.append)
+
+    def broken():
+        raise RuntimeError("query failed")
+
+    runner.submit(broken)
+    wait_until_idle(app, runner, pool)
+
+    assert failed == ["query failed"]
+
+
+def test_cancel_discards_running_result(app, pool):
+    runner = LatestTaskRunner(pool)
+    completed = []
+    runner.completed.connect(completed.append)
+
+    release = threading.Event()
+    runner.submit(lambda: release.wait(5) and "late")
+    time.sleep(0.05)
+    runner.cancel()
+    assert not runner.is_busy()
+
+    release.set()
+    pool.waitForDone()
+    app.processEvents()
+    assert completed == []
@@ -0,0 +1,72 @@
+"""
+日志归档与保留策略测试
+"""
+import gzip
+import os
+import time
+
+from utils.log_archive import LogArchiver
+
+
+def make_archive(log_dir, name: str, size: int, age_days: float) -> str:
+    path = os.path.join(log_dir, name)
+    with open(path, 'wb') as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_compresses_rotated_segments(tmp_path):
+    log_dir = str(tmp_path)
+    archiver = LogArchiver(os.path.join(log_dir, "app.log"), retention_days=0, max_total_bytes=0)
+    segment = make_archive(log_dir, "app.log.20240101-000000", 1000, age_days=1)
+    mtime = os.path.getmtime(segment)
+    # 上次中断的压缩留下的临时文件
+    make_archive(log_dir, "app.log.20231231-000000.gz.tmp", 10, age_days=2)
+
+    archiver.process()
+
+    assert sorted(os.listdir(log_dir)) == ["app.log.20240101-000000.gz"]
+    archive = segment + '.gz'
+    with gzip.open(archive, 'rb') as f:
+        assert f.read() == b"x" * 1000
+    # 保留原修改时间，保留策略按轮转时间而不是压缩时间计算
+    assert os.path.getmtime(archive) == mtime
+
+
+def test_retention_by_age(tmp_path):
+    log_dir = str(tmp_path)
+    archiver = LogArchiver(os.path.join(log_dir, "app.log"), compress=False,
+                           retention_days=7, max_total_bytes=0)
+    make_archive(log_dir, "app.log.20240101-000000.gz", 100, age_days=10)
+    make_archive(log_dir, "app.log.20240105-000000.gz", 100, age_days=8)
+    make_archive(log_dir, "app.log.20240110-000000.gz", 100, age_days=3)
+    make_archive(log_dir, "other.log.20240101-000000.gz", 100, age_days=30)
+
+    archiver.process()
+
+    assert sorted(os.listdir(log_dir)) == [
+        "app.log.20240110-000000.gz",
+        "other.log.20240101-000000.gz",
+    ]
+
+
+def test_retention_by_total_size(tmp_path):
+    log_dir = str(tmp_path)
+    log_file = os.path.join(log_dir, "app.log")
+    archiver = LogArchiver(log_file, compress=False, retention_days=0, max_total_bytes=1100)
+    with open(log_file, 'wb') as f:
+        f.write(b"y" * 300)
+    make_archive(log_dir, "app.log.20240101-000000.gz", 400, age_days=3)
+    make_archive(log_dir, "app.log.20240102-000000.gz", 400, age_days=2)
+    make_archive(log_dir, "app.log.20240103-000000.gz", 400, age_days=1)
+
+    archiver.process()
+
+    # 活动日志文件计入总大小但不会被删除，从最旧的归档开始删除
+    assert sorted(os.listdir(log_dir)) == [
+        "app.log",
+        "app.log.20240102-000000.gz",
+        "app.log.20240103-000000.gz",
+    ]
@@ -0,0 +1,103 @@
+"""
+大日志文件读取器测试
+"""
+import gzip
+
+from utils.log_reader import LogFileReader
+
+
+def test_release_closes_file_and_keeps_index(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)), encoding='utf-8')
+
+    reader = LogFileReader(str(path))
+    reader.INDEX_BLOCK_SIZE = 256
+    assert reader.read_lines(900, 1) == ["line 900"]
+    checkpoints = list(reader._index_offsets)
+    assert len(checkpoints) > 10
+
+    reader.release()
+    assert reader._file is None and reader._mmap is None
+
+    # 释放期间文件可被轮转（重命名）和追加
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write("line 1000\n")
+    assert reader.refresh() == path.stat().st_size
+    assert reader._index_offsets == checkpoints
+    assert reader.read_lines(1000, 1) == ["line 1000"]
+    reader.close()
+
+
+def test_release_after_truncation_resets_index(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)), encoding='utf-8')
+    reader = LogFileReader(str(path))
+    reader.line_count()
+    reader.release()
+
+    path.write_text("new\n", encoding='utf-8')
+    assert reader.line_count() == 1
+    assert reader.read_lines(0, 1) == ["new"]
+    reader.close()
+
+
+def write_lines(path, count, trailing_newline=True):
+    text = "\n".join(f"line {i}" for i in range(count))
+    path.write_text(text + ("\n" if trailing_newline else ""), encoding='utf-8')
+
+
+def test_sparse_index_matches_full_scan(tmp_path):
+    path = tmp_path / "app.log"
+    write_lines(path, 5000)
+    data = path.read_bytes()
+    starts = [0] + [i + 1 for i, byte in enumerate(data) if byte == ord('\n')][:-1]
+
+    reader = LogFileReader(str(path))
+    reader.INDEX_BLOCK_SIZE = 1000
+    # 乱序跳转，检查点之间逐行前进的结果与完整扫描一致
+    for line in (4321, 17, 2500, 4999, 0, 1234):
+        assert reader.line_offset(line) == starts[line]
+    # 检查点只记录在行首，且间隔大约一个索引块
+    assert all(data[offset - 1:offset] == b'\n' for offset in reader._index_offsets[1:])
+    assert len(reader._index_offsets) < len(data) // 1000 + 3
+    assert reader.line_count() == 5000
+    reader.close()
+
+
+def test_lines_near_end_of_file(tmp_path):
+    path = tmp_path / "app.log"
+    write_lines(path, 100, trailing_newline=False)
+
+    with LogFileReader(str(path)) as reader:
+        assert reader.line_count() == 100
+        assert reader.read_lines(98, 5) == ["line 98", "line 99"]
+        assert reader.line_offset(99) == path.stat().st_size - len("line 99")
+        # 超出行数时返回文件大小
+        assert reader.line_offset(150) == path.stat().st_size
+        assert reader.read_lines(150, 1) == []
+        assert reader.tail(2) == ["line 98", "line 99"]
+
+
+def test_read_range_skips_partial_lines(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"first\nsecond\nunfinished")
+
+    with LogFileReader(str(path)) as reader:
+        # 起始处不完整的行被丢弃，末尾未写完的行不读取
+        assert reader.read_range(2, reader.size) == ("second\n", 6, 13)
+        assert reader.has_complete_line(0)
+        assert not reader.has_complete_line(13)
+
+
+def test_gzip_archive(tmp_path):
+    path = tmp_path / "app.log.20240101-000000.gz"
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write("".join(f"line {i}\n" for i in range(3000)))
+
+    with LogFileReader(str(path)) as reader:
+        assert reader.line_count() == 3000
+        assert reader.read_lines(2999, 1) == ["line 2999"]
+        # 压缩归档的解压结果保留到关闭，release 不释放
+        reader.release()
+        assert reader._file is not None
+        assert reader.read_lines(1500, 2) == ["line 1500", "line 1501"]
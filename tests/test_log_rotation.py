@@ -0,0 +1,59 @@
+"""
+日志文件轮转测试
+"""
+import logging
+import os
+
+from utils.log_archive import LogArchiver
+from utils.logger import RotatingBatchFileHandler
+
+
+def make_handler(tmp_path, max_bytes=100):
+    log_file = str(tmp_path / "app.log")
+    handler = RotatingBatchFileHandler(log_file, LogArchiver(log_file, compress=False),
+                                       max_bytes=max_bytes, rotate_daily=False, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    return handler
+
+
+def write(handler, message: str):
+    handler.handle(logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None))
+    handler.flush()
+
+
+def test_rotates_by_size(tmp_path):
+    handler = make_handler(tmp_path)
+    write(handler, "x" * 120)
+    write(handler, "after rotation")
+    handler.close()
+
+    archives = handler.archiver.archives()
+    assert len(archives) == 1
+    assert open(archives[0], encoding='utf-8').read() == "x" * 120 + "\n"
+    assert open(handler.baseFilename, encoding='utf-8').read() == "after rotation\n"
+
+
+def test_failed_rollover_is_retried(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path)
+    real_replace = os.replace
+
+    def locked_replace(src, dst):
+        # 模拟 Windows 下文件被查看器占用
+        raise PermissionError("file in use")
+
+    monkeypatch.setattr(os, 'replace', locked_replace)
+    write(handler, "x" * 120)
+    assert handler.archiver.archives() == []
+
+    # 重试间隔内继续写入原文件，不反复尝试
+    write(handler, "still here")
+    assert "still here" in open(handler.baseFilename, encoding='utf-8').read()
+
+    monkeypatch.setattr(os, 'replace', real_replace)
+    handler._retry_at = 0.0
+    write(handler, "retried")
+    handler.close()
+
+    archives = handler.archiver.archives()
+    assert len(archives) == 1
+    assert open(archives[0], encoding='utf-8').read().endswith("retried\n")
@@ -0,0 +1,43 @@
+"""
+日志搜索测试
+"""
+import gzip
+import os
+
+from utils.log_search import compile_search_pattern, list_log_files, search_log_file
+
+
+def test_list_log_files_skips_structured_and_temp_files(tmp_path):
+    names = [
+        "app.log",
+        "app.log.20240101-000000.gz",
+        "app.log.20240102-000000",
+        "app_structured.jsonl",
+        "app_structured.000001.jsonl",
+        "app.log.20240103-000000.gz.tmp",
+        "notes.txt",
+    ]
+    for name in names:
+        (tmp_path / name).write_bytes(b"")
+
+    found = sorted(os.path.basename(path) for path in list_log_files(str(tmp_path)))
+    assert found == ["app.log", "app.log.20240101-000000.gz", "app.log.20240102-000000"]
+
+
+def test_each_line_found_once_across_files(tmp_path):
+    (tmp_path / "app.log").write_text("first\nneedle in text log\n", encoding='utf-8')
+    with gzip.open(tmp_path / "app.log.20240101-000000.gz", 'wt', encoding='utf-8') as f:
+        f.write("Needle in archive\nother\n")
+    # 结构化日志重复了文本日志的内容，不应再次命中
+    (tmp_path / "app_structured.jsonl").write_text('{"message": "needle in text log"}\n', encoding='utf-8')
+
+    pattern = compile_search_pattern("needle")
+    hits = [
+        (os.path.basename(path), line_number, line)
+        for path in list_log_files(str(tmp_path))
+        for line_number, line in search_log_file(path, pattern)
+    ]
+    assert sorted(hits) == [
+        ("app.log", 2, "needle in text log"),
+        ("app.log.20240101-000000.gz", 1, "Needle in archive"),
+    ]
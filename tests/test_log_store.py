@@ -0,0 +1,92 @@
+"""
+SQLite 日志存储查询测试
+"""
+import pytest
+
+from utils.log_store import LogStore
+
+
+def make_entry(index: int, message: str, level: str = "INFO", **extra) -> dict:
+    return {
+        'timestamp': f"2024-01-01T00:{index // 60:02d}:{index % 60:02d}",
+        'level': level,
+        'logger': "test",
+        'message': message,
+        **extra
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(str(tmp_path / "logs.db"))
+    store.add_entries([
+        make_entry(0, "用户 alice 登录成功", category="auth", operation="login"),
+        make_entry(1, "用户 bob 登录失败: 密码错误", level="WARNING", category="auth", operation="login"),
+        make_entry(2, "Database connection lost", level="ERROR"),
+        make_entry(3, "database reconnected"),
+        make_entry(4, "进度 100% 完成_done"),
+        make_entry(5, "导出账号 50 个", category="account", operation="export", count=50),
+    ])
+    return store
+
+
+def messages(entries) -> list:
+    return [entry['message'] for entry in entries]
+
+
+def test_fts_matches_substrings(store):
+    assert store.fts_enabled
+    # trigram 分词支持中文子串
+    assert messages(store.query_logs(text="登录失败")) == ["用户 bob 登录失败: 密码错误"]
+    assert messages(store.query_logs(text="登录")) == ["用户 bob 登录失败: 密码错误", "用户 alice 登录成功"]
+    # 不区分大小写，最新的在前
+    assert messages(store.query_logs(text="database")) == [
+        "database reconnected", "Database connection lost"
+    ]
+
+
+def test_query_syntax_is_literal(store):
+    # FTS 运算符和引号按普通文本匹配，不会报语法错误
+    assert store.query_logs(text='lost OR "x') == []
+    assert store.count_logs(text='connection lost') == 1
+
+
+def test_short_text_falls_back_to_like(store):
+    # 少于 3 个字符时 trigram 无法匹配，退回 LIKE，通配符按字面匹配
+    assert messages(store.query_logs(text="失败")) == ["用户 bob 登录失败: 密码错误"]
+    assert messages(store.query_logs(text="%")) == ["进度 100% 完成_done"]
+    assert messages(store.query_logs(text="_d")) == ["进度 100% 完成_done"]
+
+
+def test_filters_combine(store):
+    assert messages(store.query_logs(level="WARNING", text="登录")) == ["用户 bob 登录失败: 密码错误"]
+    assert store.count_logs(category="auth") == 2
+    assert store.count_logs(operation="login", start="2024-01-01T00:00:01") == 1
+    assert store.count_logs(end="2024-01-01T00:00:02") == 2
+    assert store.count_logs(level="ALL") == 6
+
+
+def test_extra_fields_round_trip(store):
+    [entry] = store.query_logs(operation="export")
+    assert entry['count'] == 50
+    assert entry['category'] == "account"
+
+
+def test_iter_logs_pages_through_everything(store):
+    assert messages(store.iter_logs(page_size=2)) == messages(store.query_logs())
+    assert messages(store.iter_logs(text="database", page_size=1)) == [
+        "database reconnected", "Database connection lost"
+    ]
+
+
+def test_deleted_entries_leave_index(tmp_path):
+    store = LogStore(str(tmp_path / "logs.db"), max_entries=1000)
+    store.add_entries([make_entry(i % 3600, f"entry number {i}") for i in range(1500)])
+
+    # 超出保留条数的旧日志被清理，全文索引同步删除
+    assert store.count_logs() == 1000
+    assert store.count_logs(text="entry number 0") == 0
+    assert store.count_logs(text="entry number 1499") == 1
+
+    store.clear()
+    assert store.count_logs(text="entry") == 0
@@ -0,0 +1,66 @@
+"""
+日志列表模型测试
+"""
+import sys
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QListView
+
+from ui.log_view import LEVEL_COLORS, LogEntryRole, LogItemDelegate, LogListModel
+
+
+def entries(count, level='INFO'):
+    return [{'timestamp': '2024-01-01T12:00:00', 'level': level, 'message': f"line {i}\nmore"}
+            for i in range(count)]
+
+
+def test_source_loaded_in_pages():
+    model = LogListModel(page_size=100)
+    model.set_source(iter(entries(250)))
+
+    assert model.rowCount() == 100
+    model.fetchMore(model.index(0).parent())
+    model.fetchMore(model.index(0).parent())
+    assert model.rowCount() == 250
+    assert model.is_exhausted()
+
+
+def test_display_is_single_line():
+    model = LogListModel()
+    model.set_source(entries(1, 'ERROR'))
+
+    index = model.index(0)
+    assert index.data() == "[12:00:00] 🔴 ERROR: line 0 more"
+    assert index.data(Qt.ForegroundRole) == LEVEL_COLORS['ERROR']
+    assert index.data(LogEntryRole)['message'] == "line 0\nmore"
+
+
+def test_prepend_keeps_loaded_rows():
+    model = LogListModel(page_size=10)
+    model.set_source(entries(5))
+    model.prepend_entries([{'level': 'WARNING', 'message': 'new'}])
+
+    assert model.rowCount() == 6
+    assert model.index(0).data(LogEntryRole)['message'] == 'new'
+    assert model.index(1).data(LogEntryRole)['message'] == "line 0\nmore"
+
+
+def test_list_view_repaint(qapp):
+    model = LogListModel()
+    model.set_source(entries(500))
+    view = QListView()
+    view.setFont(QFont("Consolas", 10))
+    view.setItemDelegate(LogItemDelegate(view.font(), view))
+    view.setUniformItemSizes(True)
+    view.setModel(model)
+    view.resize(800, 600)
+    view.show()
+    qapp.processEvents()
+
+    # 部分 PySide6 版本在 Python 中逐行绘制时会少计 None 的引用
+    before = sys.getrefcount(None)
+    for _ in range(20):
+        view.viewport().repaint()
+        qapp.processEvents()
+    assert sys.getrefcount(None) >= before - 100
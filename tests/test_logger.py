@@ -0,0 +1,99 @@
+"""
+日志缓存和级别过滤测试
+"""
+import pytest
+
+from utils.logger import CustomLogger, LogRingBuffer
+
+
+def entry(index: int, level: str = "INFO") -> dict:
+    return {'timestamp': f"2024-01-01T00:00:{index:02d}", 'level': level, 'message': str(index)}
+
+
+def test_ring_buffer_evicts_oldest():
+    buffer = LogRingBuffer(3)
+    for index in range(5):
+        buffer.append(entry(index))
+
+    assert len(buffer) == 3
+    assert [e['message'] for e in buffer] == ["2", "3", "4"]
+    assert [e['message'] for e in buffer.recent(2)] == ["4", "3"]
+
+
+def test_ring_buffer_level_counts_follow_eviction():
+    buffer = LogRingBuffer(4)
+    levels = ["ERROR", "INFO", "INFO", "WARNING", "INFO", "ERROR"]
+    for index, level in enumerate(levels):
+        buffer.append(entry(index, level))
+
+    # 保留最后 4 条：INFO, WARNING, INFO, ERROR
+    assert buffer.count() == 4
+    assert buffer.count("INFO") == 2
+    assert buffer.count("WARNING") == 1
+    assert buffer.count("ERROR") == 1
+    assert buffer.count("DEBUG") == 0
+    assert [e['message'] for e in buffer.recent(10, level="ERROR")] == ["5"]
+    assert [e['message'] for e in buffer.snapshot(level="INFO")] == ["2", "4"]
+
+
+def test_ring_buffer_entries_since():
+    buffer = LogRingBuffer(3)
+    buffer.append(entry(0))
+    mark = buffer.sequence
+    buffer.append(entry(1))
+    buffer.append(entry(2))
+
+    assert [e['message'] for e in buffer.entries_since(mark)] == ["1", "2"]
+    buffer.append(entry(3))
+    buffer.append(entry(4))
+    # 标记之后的部分条目已被淘汰
+    assert buffer.entries_since(mark) is None
+
+
+def test_snapshot_since_uses_timestamp_order():
+    buffer = LogRingBuffer(10)
+    for index in range(6):
+        buffer.append(entry(index))
+
+    assert [e['message'] for e in buffer.snapshot(since="2024-01-01T00:00:04")] == ["4", "5"]
+
+
+class Expensive:
+    """记录被格式化的次数"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "expensive"
+
+
+@pytest.fixture
+def logger(tmp_path):
+    logger = CustomLogger("test_logger", log_dir=str(tmp_path))
+    logger.set_console_enabled(False)
+    yield logger
+    logger.shutdown()
+
+
+def test_disabled_level_skips_formatting(logger):
+    logger.set_level("WARNING")
+    value = Expensive()
+    before = logger.log_cache.sequence
+
+    logger.debug("value: %s", value)
+    logger.info("value: %s", value)
+
+    assert value.formatted == 0
+    assert logger.log_cache.sequence == before
+
+
+def test_enabled_level_formats_message(logger):
+    logger.set_level("DEBUG")
+    value = Expensive()
+
+    logger.debug("value: %s", value)
+
+    assert value.formatted == 1
+    assert logger.get_recent_logs(1)[0]['message'] == "value: expensive"
@@ -0,0 +1,102 @@
+"""
+指标注册表测试
+"""
+import pytest
+
+from utils.metrics import Histogram, MetricsRegistry, get_metrics, timed
+
+
+def make_histogram(*values) -> Histogram:
+    histogram = Histogram("test_seconds", (), buckets=(1.0, 2.0, 4.0))
+    for value in values:
+        histogram.observe(value)
+    return histogram
+
+
+def test_quantile_interpolates_within_buckets():
+    # 分桶计数: (0,1] 2 个, (1,2] 1 个, (2,4] 1 个；最大值 3
+    histogram = make_histogram(0.5, 0.5, 1.5, 3.0)
+
+    assert histogram.quantile(0.25) == pytest.approx(0.5)
+    assert histogram.quantile(0.5) == pytest.approx(1.0)
+    assert histogram.quantile(0.75) == pytest.approx(2.0)
+    # 上限被截断到实际观测到的最大值
+    assert histogram.quantile(1.0) == pytest.approx(3.0)
+
+
+def test_quantile_edge_cases():
+    assert make_histogram().quantile(0.5) == 0.0
+    # 超出最后一个分桶的观测值以最大值估算
+    assert make_histogram(0.5, 10.0).quantile(0.99) == 10.0
+    histogram = make_histogram(0.5, 10.0)
+    assert histogram.count == 2
+    assert histogram.sum == pytest.approx(10.5)
+
+
+def test_histogram_sample_is_cumulative():
+    sample = make_histogram(0.5, 1.5, 1.5, 8.0).sample()
+    assert sample['buckets'] == [[1.0, 1], [2.0, 3], [4.0, 3], ['+Inf', 4]]
+    assert sample['count'] == 4
+    assert sample['max'] == 8.0
+
+
+def test_prometheus_text_export():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "请求数\n第二行", path='/a"b').inc(3)
+    registry.gauge("queue_depth", "队列").set_function(lambda: 7)
+    histogram = registry.histogram("latency_seconds", "耗时", buckets=(0.1, 1.0), op="x")
+    for value in (0.05, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert registry.to_prometheus() == (
+        '# HELP latency_seconds 耗时\n'
+        '# TYPE latency_seconds histogram\n'
+        'latency_seconds_bucket{op="x",le="0.1"} 1\n'
+        'latency_seconds_bucket{op="x",le="1.0"} 2\n'
+        'latency_seconds_bucket{op="x",le="+Inf"} 3\n'
+        'latency_seconds_sum{op="x"} 2.55\n'
+        'latency_seconds_count{op="x"} 3\n'
+        '# HELP queue_depth 队列\n'
+        '# TYPE queue_depth gauge\n'
+        'queue_depth 7\n'
+        '# HELP requests_total 请求数\\n第二行\n'
+        '# TYPE requests_total counter\n'
+        'requests_total{path="/a\\"b"} 3\n'
+    )
+
+
+def test_metric_type_conflict_rejected():
+    registry = MetricsRegistry()
+    registry.counter("events_total")
+    with pytest.raises(ValueError):
+        registry.gauge("events_total")
+
+
+def test_timed_records_each_call():
+    @timed("test_timed_seconds", "测试耗时")
+    def work(value):
+        return value
+
+    histogram = get_metrics().histogram("test_timed_seconds", method=work.__qualname__)
+    before = histogram.count
+    assert work(1) == 1
+    assert work(2) == 2
+    assert histogram.count == before + 2
+
+
+def test_timed_rejects_surplus_arguments_by_default():
+    @timed("test_timed_seconds", "测试耗时")
+    def work(value):
+        return value
+
+    with pytest.raises(TypeError):
+        work(1, 2)
+
+
+def test_timed_slot_drops_surplus_signal_arguments():
+    class Page:
+        @timed("test_timed_seconds", "测试耗时", label="page", slot=True)
+        def refresh(self):
+            return "refreshed"
+
+    assert Page().refresh(False) == "refreshed"
@@ -0,0 +1,65 @@
+"""
+密码健康报告测试
+"""
+import utils.encryption as encryption
+from models.account import Account, AccountType
+from utils.password_audit import score_password_strength
+
+SHARED = "Shared-Pass1!"
+
+
+def add(db, name, password, account_type=AccountType.CURSOR) -> int:
+    return db.add_account(Account(name=name, account_type=account_type, password=password))
+
+
+def test_score_password_strength():
+    assert score_password_strength("") == 0
+    assert score_password_strength("abc") == 1
+    assert score_password_strength("abcdef") == 2
+    assert score_password_strength(SHARED) == 5
+
+
+def test_audit_counts_reuse_and_weak_per_type(memory_db):
+    add(memory_db, "a", SHARED)
+    add(memory_db, "b", "abc")
+    add(memory_db, "c", "")
+    add(memory_db, "d", SHARED, AccountType.WINDSURF)
+    add(memory_db, "e", "Unique-Pass2?", AccountType.WINDSURF)
+
+    # 没有密码的账号不计入；跨类型重复使用的密码在各自类型中计数
+    assert memory_db.get_password_audit() == {
+        "Cursor": {'total': 2, 'reused': 1, 'weak': 1},
+        "Windsurf": {'total': 2, 'reused': 1, 'weak': 0},
+    }
+
+
+def test_audit_follows_password_changes(memory_db):
+    first = add(memory_db, "a", SHARED)
+    add(memory_db, "b", SHARED)
+    assert memory_db.get_password_audit()["Cursor"]['reused'] == 2
+
+    account = memory_db.get_account(first)
+    account.password = "abc"
+    memory_db.update_account(account)
+
+    assert memory_db.get_password_audit()["Cursor"] == {'total': 2, 'reused': 0, 'weak': 1}
+
+
+def test_reused_password_accounts(memory_db):
+    first = add(memory_db, "a", SHARED)
+    second = add(memory_db, "b", SHARED, AccountType.CLAUDE)
+    add(memory_db, "c", "Other-Pass3#")
+
+    reused = memory_db.get_reused_password_accounts(memory_db.get_account(first))
+    assert [account.id for account in reused] == [second]
+
+
+def test_fingerprints_survive_master_key_rotation(memory_db):
+    first = add(memory_db, "a", SHARED)
+    second = add(memory_db, "b", SHARED)
+
+    encryption.set_master_password("new master password", memory_db)
+
+    assert memory_db.get_password_audit()["Cursor"]['reused'] == 2
+    reused = memory_db.get_reused_password_accounts(memory_db.get_account(first))
+    assert [account.id for account in reused] == [second]
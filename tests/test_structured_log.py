@@ -0,0 +1,75 @@
+"""
+结构化日志分段轮转测试
+"""
+import json
+import os
+
+import pytest
+
+from utils.logger import CustomLogger
+
+
+def make_logger(log_dir: str) -> CustomLogger:
+    logger = CustomLogger("segment_test", log_dir=log_dir)
+    logger.set_console_enabled(False)
+    # 缩小分段和保留条数，少量日志即可触发轮转和淘汰
+    logger.MAX_SEGMENT_BYTES = 1024
+    logger.MAX_FILE_ENTRIES = 30
+    return logger
+
+
+def read_messages(logger: CustomLogger) -> list:
+    messages = []
+    for path in logger._json_segments():
+        with open(path, encoding='utf-8') as f:
+            messages += [json.loads(line)['message'] for line in f]
+    return messages
+
+
+@pytest.fixture
+def logger(tmp_path):
+    logger = make_logger(str(tmp_path))
+    yield logger
+    logger.shutdown()
+
+
+def test_segments_rotate_and_retire(logger):
+    for index in range(300):
+        logger.info(f"message {index}")
+    logger.flush()
+
+    rotated = logger._rotated_segments()
+    assert len(rotated) >= 2
+    assert all(os.path.getsize(path) >= logger.MAX_SEGMENT_BYTES for path in rotated)
+
+    # 只删除整个分段：保留的条数不少于上限，多出的不超过一个分段
+    messages = read_messages(logger)
+    per_segment = max(logger._segment_lines[path] for path in rotated)
+    assert logger.MAX_FILE_ENTRIES <= len(messages) < logger.MAX_FILE_ENTRIES + per_segment
+    assert messages == [f"message {index}" for index in range(300 - len(messages), 300)]
+
+    recent = logger.get_logs_from_file(limit=10)
+    assert [entry['message'] for entry in recent] == [f"message {index}" for index in range(290, 300)]
+
+
+def test_numbering_and_retention_continue_after_restart(tmp_path):
+    logger = make_logger(str(tmp_path))
+    for index in range(150):
+        logger.info(f"first {index}")
+    logger.shutdown()
+    last_segment = logger._rotated_segments()[-1]
+
+    reopened = make_logger(str(tmp_path))
+    try:
+        for index in range(150):
+            reopened.info(f"second {index}")
+        reopened.flush()
+
+        rotated = reopened._rotated_segments()
+        # 新分段编号接在已有分段之后，旧分段的行数在重新启动后重新统计
+        assert rotated[-1] > last_segment
+        messages = read_messages(reopened)
+        assert messages[-1] == "second 149"
+        assert all(message.startswith("second") for message in messages)
+    finally:
+        reopened.shutdown()
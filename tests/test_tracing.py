@@ -0,0 +1,45 @@
+"""
+跟踪装饰器测试
+"""
+import pytest
+
+from utils.tracing import get_tracer, traced
+
+
+@pytest.fixture
+def tracer():
+    tracer = get_tracer()
+    tracer.clear()
+    tracer.start()
+    yield tracer
+    tracer.stop()
+    tracer.clear()
+
+
+def test_traced_records_span(tracer):
+    @traced(name="work", category="test")
+    def work(value):
+        return value * 2
+
+    assert work(21) == 42
+    events = [event for event in tracer.to_chrome_trace()['traceEvents'] if event['ph'] == 'X']
+    assert [(event['name'], event['cat']) for event in events] == [("work", "test")]
+
+
+def test_surplus_arguments_rejected_by_default():
+    @traced()
+    def work(value):
+        return value
+
+    with pytest.raises(TypeError):
+        work(1, 2)
+
+
+def test_slot_drops_surplus_signal_arguments():
+    class Page:
+        @traced(slot=True)
+        def refresh(self):
+            return "refreshed"
+
+    # 如 clicked(bool) 连接到无参数的槽
+    assert Page().refresh(False) == "refreshed"
@@ -3,44 +3,45 @@
 """
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit,
+    QTableView, QHeaderView, QLineEdit,
     QComboBox, QGroupBox, QMessageBox, QDialog
 )
-from PySide6.QtCore import Signal
-from PySide6.QtGui import QFont, QColor
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtGui import QFont
 from models.account import Account, AccountType, AccountStatus
-from models.database import DatabaseManager
+from models.database import get_database_manager
+from models.repository import AccountRepository
 from ui.account_dialog import AccountDialog
+from ui.account_table_model import AccountTableModel, COLUMN_CREATED
 from ui.automation_dialog import AutomationDialog
+from ui.workers import LatestTaskRunner
 from automation.automation_manager import is_automation_supported
+from utils.config import get_config_manager
 from utils.logger import get_logger
+from utils.metrics import timed
+from utils.tracing import traced
 
 
-class AccountTableWidget(QTableWidget):
-    """账号表格组件"""
+class AccountTableWidget(QTableView):
+    """账号表格组件（模型/视图，滚动到底部时加载下一页）"""
     
     account_double_clicked = Signal(object)  # Account对象
+    selection_changed = Signal()
     
-    def __init__(self, parent=None):
+    def __init__(self, db_manager: AccountRepository = None, account_type: AccountType = None, parent=None):
         super().__init__(parent)
-        self.accounts = []
+        self.account_model = AccountTableModel(db_manager, account_type, parent=self)
         self.setup_table()
     
     def setup_table(self):
         """设置表格"""
-        # 设置列
-        headers = [
-            "ID", "名称", "邮箱", "用户名", "状态", 
-            "订阅类型", "到期日期", "标签", "最后使用", "使用次数", "创建时间"
-        ]
-        self.setColumnCount(len(headers))
-        self.setHorizontalHeaderLabels(headers)
+        self.setModel(self.account_model)
         
         # 设置表格属性
         self.setAlternatingRowColors(True)
-        self.setSelectionBehavior(QTableWidget.SelectRows)
-        self.setSelectionMode(QTableWidget.SingleSelection)
-        self.setSortingEnabled(True)
+        self.setSelectionBehavior(QTableView.SelectRows)
+        self.setSelectionMode(QTableView.SingleSelection)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         
         # 设置列宽
         header = self.horizontalHeader()
@@ -49,82 +50,57 @@ class AccountTableWidget(QTableWidget):
         header.setSectionResizeMode(1, QHeaderView.Stretch)  # 名称
         header.setSectionResizeMode(2, QHeaderView.Stretch)  # 邮箱
         
-        # 连接双击信号
-        self.cellDoubleClicked.connect(self.on_cell_double_clicked)
+        # 默认按创建时间倒序（与模型一致，启用排序时不会重新加载）
+        header.setSortIndicator(COLUMN_CREATED, Qt.DescendingOrder)
+        self.setSortingEnabled(True)
+        
+        # 连接信号
+        self.doubleClicked.connect(self.on_double_clicked)
+        self.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.account_model.modelReset.connect(self.on_selection_changed)
     
+    @traced(category="ui")
     def load_accounts(self, accounts):
-        """加载账号数据"""
-        self.accounts = accounts
-        self.setRowCount(len(accounts))
-        
-        for row, account in enumerate(accounts):
-            self.setItem(row, 0, QTableWidgetItem(str(account.id or "")))
-            self.setItem(row, 1, QTableWidgetItem(account.name))
-            self.setItem(row, 2, QTableWidgetItem(account.email))
-            self.setItem(row, 3, QTableWidgetItem(account.username))
-            
-            # 状态列添加颜色
-            status_item = QTableWidgetItem(account.status.value)
-            if account.status == AccountStatus.ACTIVE:
-                status_item.setForeground(QColor("#4caf50"))
-            elif account.status == AccountStatus.EXPIRED:
-                status_item.setForeground(QColor("#f44336"))
-            elif account.status == AccountStatus.SUSPENDED:
-                status_item.setForeground(QColor("#ff9800"))
-            self.setItem(row, 4, status_item)
-            
-            self.setItem(row, 5, QTableWidgetItem(account.subscription_type))
-            
-            # 到期日期
-            expiry_text = ""
-            if account.expiry_date:
-                expiry_text = account.expiry_date.strftime("%Y-%m-%d")
-                if account.is_expired():
-                    expiry_item = QTableWidgetItem(expiry_text)
-                    expiry_item.setForeground(QColor("#f44336"))
-                    self.setItem(row, 6, expiry_item)
-                else:
-                    self.setItem(row, 6, QTableWidgetItem(expiry_text))
-            else:
-                self.setItem(row, 6, QTableWidgetItem("无限期"))
-            
-            self.setItem(row, 7, QTableWidgetItem(account.tags))
-            
-            # 最后使用时间
-            last_used_text = ""
-            if account.last_used:
-                last_used_text = account.last_used.strftime("%Y-%m-%d %H:%M")
-            self.setItem(row, 8, QTableWidgetItem(last_used_text))
-            
-            self.setItem(row, 9, QTableWidgetItem(str(account.usage_count)))
-            
-            # 创建时间
-            created_text = ""
-            if account.created_at:
-                created_text = account.created_at.strftime("%Y-%m-%d %H:%M")
-            self.setItem(row, 10, QTableWidgetItem(created_text))
+        """加载固定的账号列表"""
+        self.account_model.set_accounts(accounts)
+    
+    @property
+    def accounts(self):
+        """已加载的账号"""
+        return self.account_model.accounts
     
     def get_selected_account(self):
         """获取选中的账号"""
-        current_row = self.currentRow()
-        if 0 <= current_row < len(self.accounts):
-            return self.accounts[current_row]
+        rows = self.selectionModel().selectedRows()
+        if rows:
+            return self.account_model.account_at(rows[0].row())
         return None
     
-    def on_cell_double_clicked(self, row: int, column: int):
+    def on_selection_changed(self, *args):
+        """转发选择变化（包括模型重置后选择被清空）"""
+        self.selection_changed.emit()
+    
+    def on_double_clicked(self, index):
         """处理单元格双击"""
-        if row < len(self.accounts):
-            self.account_double_clicked.emit(self.accounts[row])
+        account = self.account_model.account_at(index.row())
+        if account is not None:
+            self.account_double_clicked.emit(account)
 
 
 class AccountPage(QWidget):
     """账号管理页面"""
     
-    def __init__(self, account_type_id: str, parent=None):
+    def __init__(self, account_type_id: str, parent=None, db_manager: AccountRepository = None):
         super().__init__(parent)
         self.account_type_id = account_type_id
         self.account_type = self.get_account_type_from_id(account_type_id)
-        self.db_manager = DatabaseManager()
+        self.db_manager = db_manager or get_database_manager()
+        
+        # 搜索输入停顿后才查询，查询在后台线程池中执行，只应用最新一次的结果
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(get_config_manager().get('ui.search_debounce_ms', 250))
+        self.search_runner = LatestTaskRunner()
         
         self.setup_ui()
         self.setup_connections()
@@ -236,7 +212,7 @@ class AccountPage(QWidget):
         layout.addWidget(filter_group)
         
         # 账号表格
-        self.account_table = AccountTableWidget()
+        self.account_table = AccountTableWidget(self.db_manager, self.account_type)
         layout.addWidget(self.account_table)
     
     def setup_connections(self):
@@ -258,53 +234,58 @@ class AccountPage(QWidget):
             self.switch_account_button.clicked.connect(self.show_switch_account_dialog)
         
         # 表格连接
-        self.account_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.account_table.selection_changed.connect(self.on_selection_changed)
         self.account_table.account_double_clicked.connect(self.edit_account_by_object)
         
         # 筛选连接
-        self.search_edit.textChanged.connect(self.apply_filters)
+        self.search_edit.textChanged.connect(self.on_search_text_changed)
+        self.search_edit.returnPressed.connect(self.apply_filters)
+        self.search_timer.timeout.connect(self.apply_filters)
         self.status_filter_combo.currentTextChanged.connect(self.apply_filters)
+        self.search_runner.completed.connect(self.on_filter_finished)
+        self.search_runner.failed.connect(self.on_filter_failed)
     
+    @timed("page_refresh_seconds", "页面刷新耗时（秒）", label="page", slot=True)
     def refresh_accounts(self):
-        """刷新账号列表"""
+        """刷新账号列表（按当前筛选条件同步重新加载，取代尚未返回的搜索）"""
+        self.search_timer.stop()
+        self.search_runner.cancel()
         try:
-            # 获取指定类型的账号
-            all_accounts = self.db_manager.get_all_accounts()
-            accounts = [acc for acc in all_accounts if acc.account_type == self.account_type]
-            
-            self.account_table.load_accounts(accounts)
-            self.count_label.setText(f"账号数量: {len(accounts)}")
+            model = self.account_table.account_model
+            model.set_filter(self.search_edit.text().strip(), self.status_filter_combo.currentData())
+            self.count_label.setText(f"账号数量: {model.total_count()}")
         except Exception as e:
             QMessageBox.critical(self, "错误", f"刷新数据失败: {str(e)}")
     
+    def on_search_text_changed(self, text: str):
+        """搜索框内容变化：重新开始计时，输入停顿后再查询"""
+        self.search_timer.start()
+    
+    @traced(category="ui", slot=True)
     def apply_filters(self):
-        """应用筛选条件"""
-        search_text = self.search_edit.text().strip()
-        selected_status = self.status_filter_combo.currentData()
-        
-        try:
-            # 获取所有账号
-            all_accounts = self.db_manager.get_all_accounts()
-            accounts = [acc for acc in all_accounts if acc.account_type == self.account_type]
-            
-            # 应用搜索筛选
-            if search_text:
-                accounts = [
-                    acc for acc in accounts 
-                    if search_text.lower() in acc.name.lower() 
-                    or search_text.lower() in acc.email.lower()
-                    or search_text.lower() in acc.tags.lower()
-                ]
-            
-            # 应用状态筛选
-            if selected_status:
-                accounts = [acc for acc in accounts if acc.status == selected_status]
-            
-            self.account_table.load_accounts(accounts)
-            self.count_label.setText(f"账号数量: {len(accounts)}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"筛选数据失败: {str(e)}")
+        """应用筛选条件：在后台查询第一页，之前未返回的查询结果被丢弃"""
+        self.search_timer.stop()
+        model = self.account_table.account_model
+        self.search_runner.submit(
+            model.query_first_page,
+            self.search_edit.text().strip(),
+            self.status_filter_combo.currentData(),
+            model.sort_column,
+            model.sort_order
+        )
+    
+    def on_filter_finished(self, result):
+        """筛选查询完成，一次性替换表格内容"""
+        model = self.account_table.account_model
+        if not model.apply_first_page(result):
+            # 查询期间排序已改变，按新排序重新查询
+            self.apply_filters()
+            return
+        self.count_label.setText(f"账号数量: {model.total_count()}")
+    
+    def on_filter_failed(self, error: str):
+        """筛选查询失败"""
+        QMessageBox.critical(self, "错误", f"筛选数据失败: {error}")
     
     def on_selection_changed(self):
         """选择变化处理"""
@@ -323,6 +304,8 @@ class AccountPage(QWidget):
         
         if dialog.exec() == QDialog.Accepted:
             account = dialog.get_account()
+            if not self.confirm_not_duplicate(account):
+                return
             try:
                 account_id = self.db_manager.add_account(account)
                 account.id = account_id
@@ -330,6 +313,20 @@ class AccountPage(QWidget):
                 QMessageBox.information(self, "成功", f"账号 '{account.name}' 添加成功")
             except Exception as e:
                 QMessageBox.critical(self, "错误", f"添加账号失败: {str(e)}")
+
+    def confirm_not_duplicate(self, account: Account) -> bool:
+        """检查重复账号，存在时询问是否继续"""
+        duplicate = self.db_manager.find_duplicate_account(account)
+        if duplicate is None:
+            return True
+
+        reply = QMessageBox.question(
+            self, "账号已存在",
+            f"已存在邮箱、用户名或API密钥相同的账号 '{duplicate.name}'。\n\n是否仍要添加？",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
     
     def edit_account(self):
         """编辑账号"""
@@ -570,7 +567,7 @@ class AccountPage(QWidget):
                 )
                 return
 
-            dialog = SwitchAccountDialog(cursor_accounts, self)
+            dialog = SwitchAccountDialog(cursor_accounts, self, db_manager=self.db_manager)
             dialog.account_switched.connect(self.on_account_switched)
             dialog.exec()
 
@@ -703,19 +700,19 @@ class AccountPage(QWidget):
                 padding: 0 5px 0 5px;
             }
             
-            QTableWidget {
+            QTableView {
                 border: 1px solid #dee2e6;
                 border-radius: 6px;
                 background-color: white;
                 gridline-color: #f1f3f4;
             }
             
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border-bottom: 1px solid #f1f3f4;
             }
             
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e3f2fd;
                 color: #1976d2;
             }
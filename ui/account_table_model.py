@@ -0,0 +1,289 @@
+"""
+账号表格模型
+
+AccountTableModel 从账号存储按页加载账号（canFetchMore/fetchMore，表格滚动到底部时加载下一页），
+单元格文本在 data() 中按需格式化，只处理可见的单元格；排序按列的实际类型进行，
+由存储的键集分页查询完成。筛选时第一页可在后台线程中查询（query_first_page），
+再在界面线程中一次性替换模型内容（apply_first_page）。状态、到期日期和密码泄露列按 TONE_ROLE 的类别
+通过 Qt.ForegroundRole 着色。
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QColor
+
+from models.account import Account, AccountType, AccountStatus
+from models.repository import AccountRepository
+
+
+# 表格列：(表头, 存储排序键)
+COLUMNS = [
+    ("ID", 'id'), ("名称", 'name'), ("邮箱", 'email'), ("用户名", 'username'),
+    ("状态", 'status'), ("订阅类型", 'subscription_type'), ("到期日期", 'expiry_date'),
+    ("标签", 'tags'), ("最后使用", 'last_used'), ("使用次数", 'usage_count'),
+    ("创建时间", 'created_at'), ("密码泄露", 'password_breached'),
+]
+
+COLUMN_STATUS = 4
+COLUMN_EXPIRY = 6
+COLUMN_CREATED = 10
+COLUMN_BREACH = 11
+
+# 排序值（ID、使用次数为整数，日期为 datetime）
+SORT_ROLE = Qt.UserRole
+# 着色类别：good / bad / warn，按 TONE_COLORS 转换为文字颜色
+TONE_ROLE = Qt.UserRole + 1
+
+TONE_COLORS = {
+    'good': QColor("#4caf50"),
+    'bad': QColor("#f44336"),
+    'warn': QColor("#ff9800"),
+}
+
+STATUS_TONES = {
+    AccountStatus.ACTIVE: 'good',
+    AccountStatus.EXPIRED: 'bad',
+    AccountStatus.SUSPENDED: 'warn',
+}
+
+
+def format_cell(account: Account, column: int) -> str:
+    """单元格显示文本"""
+    if column == 0:
+        return str(account.id or "")
+    if column == 1:
+        return account.name
+    if column == 2:
+        return account.email
+    if column == 3:
+        return account.username
+    if column == COLUMN_STATUS:
+        return account.status.value
+    if column == 5:
+        return account.subscription_type
+    if column == COLUMN_EXPIRY:
+        return account.expiry_date.strftime("%Y-%m-%d") if account.expiry_date else "无限期"
+    if column == 7:
+        return account.tags
+    if column == 8:
+        return account.last_used.strftime("%Y-%m-%d %H:%M") if account.last_used else ""
+    if column == 9:
+        return str(account.usage_count)
+    if column == COLUMN_CREATED:
+        return account.created_at.strftime("%Y-%m-%d %H:%M") if account.created_at else ""
+    if column == COLUMN_BREACH:
+        if account.is_password_breached():
+            return "⚠️ 已泄露"
+        return "安全" if account.password_breached == 0 else ""
+    return ""
+
+
+def sort_value(account: Account, column: int):
+    """
+    单元格排序值，与存储的排序表达式一致：
+    无到期日期排在最后，未使用和未检查排在最前
+    """
+    if column == 0:
+        return account.id or 0
+    if column == COLUMN_STATUS:
+        return account.status.value
+    if column == COLUMN_EXPIRY:
+        return account.expiry_date or datetime.max
+    if column == 8:
+        return account.last_used or datetime.min
+    if column == 9:
+        return account.usage_count or 0
+    if column == COLUMN_CREATED:
+        return account.created_at or datetime.min
+    if column == COLUMN_BREACH:
+        return -1 if account.password_breached is None else account.password_breached
+    return format_cell(account, column)
+
+
+def cell_tone(account: Account, column: int) -> Optional[str]:
+    """单元格着色类别"""
+    if column == COLUMN_STATUS:
+        return STATUS_TONES.get(account.status)
+    if column == COLUMN_EXPIRY:
+        return 'bad' if account.expiry_date and account.is_expired() else None
+    if column == COLUMN_BREACH:
+        if account.is_password_breached():
+            return 'bad'
+        return 'good' if account.password_breached == 0 else None
+    return None
+
+
+class AccountTableModel(QAbstractTableModel):
+    """
+    账号表格模型
+
+    默认从账号存储分页加载符合筛选条件的账号；set_accounts() 可改为显示固定的账号列表
+    （此时在内存中排序，不再分页）。
+    """
+
+    def __init__(self, db_manager: AccountRepository = None, account_type: AccountType = None,
+                 page_size: int = 200, parent=None):
+        """
+        Args:
+            db_manager: 账号存储
+            account_type: 只显示该类型的账号，为空时显示全部
+            page_size: 每次加载的行数
+        """
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.account_type = account_type
+        self.page_size = page_size
+        self.search = ""
+        self.status: Optional[AccountStatus] = None
+        self.sort_column = COLUMN_CREATED
+        self.sort_order = Qt.DescendingOrder
+        self.accounts: List[Account] = []
+        self._cursor: Optional[tuple] = None
+        self._total = 0
+        self._static = False
+
+    # ---- 数据加载 ----
+
+    def set_filter(self, search: str = "", status: Optional[AccountStatus] = None):
+        """设置筛选条件并重新加载"""
+        self.apply_first_page(self.query_first_page(search, status, self.sort_column, self.sort_order))
+
+    def reload(self):
+        """按当前筛选条件和排序从存储重新加载第一页"""
+        self.set_filter(self.search, self.status)
+
+    def query_first_page(self, search: str, status: Optional[AccountStatus],
+                         sort_column: int, sort_order) -> dict:
+        """
+        查询第一页和总数，不修改模型（可在后台线程中调用）
+
+        Returns:
+            交给 apply_first_page() 的查询结果
+        """
+        accounts, cursor = self._query(search, status, sort_column, sort_order, None)
+        return {
+            'search': search,
+            'status': status,
+            'sort': (sort_column, sort_order),
+            'accounts': accounts,
+            'cursor': cursor,
+            'total': self.db_manager.count_accounts(self.account_type, search, status),
+        }
+
+    def apply_first_page(self, result: dict) -> bool:
+        """
+        用 query_first_page() 的结果一次性替换模型内容
+
+        Returns:
+            查询后排序已改变时不应用并返回 False
+        """
+        if result['sort'] != (self.sort_column, self.sort_order):
+            return False
+
+        self.beginResetModel()
+        self._static = False
+        self.search = result['search']
+        self.status = result['status']
+        self.accounts = result['accounts']
+        self._cursor = result['cursor']
+        self._total = result['total']
+        self.endResetModel()
+        return True
+
+    def set_accounts(self, accounts: List[Account]):
+        """显示固定的账号列表（按当前排序列排序，不分页）"""
+        self.beginResetModel()
+        self._static = True
+        self.accounts = self._sorted(accounts)
+        self._cursor = None
+        self._total = len(accounts)
+        self.endResetModel()
+
+    def _query(self, search: str, status: Optional[AccountStatus], sort_column: int, sort_order,
+               after: Optional[tuple]):
+        return self.db_manager.get_accounts_page(
+            self.account_type, search, status,
+            sort_key=COLUMNS[sort_column][1],
+            descending=sort_order == Qt.DescendingOrder,
+            after=after, limit=self.page_size
+        )
+
+    def _sorted(self, accounts: List[Account]) -> List[Account]:
+        column = self.sort_column
+        # 与存储一致，排序值相同时按 ID 排序
+        return sorted(accounts, key=lambda account: (sort_value(account, column), account.id or 0),
+                      reverse=self.sort_order == Qt.DescendingOrder)
+
+    def total_count(self) -> int:
+        """符合筛选条件的账号总数（包括尚未加载的）"""
+        return self._total
+
+    def account_at(self, row: int) -> Optional[Account]:
+        """获取指定行的账号"""
+        if 0 <= row < len(self.accounts):
+            return self.accounts[row]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._cursor is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        """加载下一页"""
+        if not self.canFetchMore(parent):
+            return
+        page, cursor = self._query(self.search, self.status, self.sort_column, self.sort_order, self._cursor)
+        self._cursor = cursor
+        if not page:
+            return
+        first = len(self.accounts)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self.accounts.extend(page)
+        self.endInsertRows()
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """按列排序：分页时由存储排序并重新加载，固定列表在内存中排序"""
+        if (column, order) == (self.sort_column, self.sort_order):
+            return
+        self.sort_column = column
+        self.sort_order = order
+        if self._static:
+            self.layoutAboutToBeChanged.emit()
+            self.accounts = self._sorted(self.accounts)
+            self.layoutChanged.emit()
+        elif self.db_manager is not None:
+            self.reload()
+
+    # ---- 模型接口 ----
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.accounts)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.accounts):
+            return None
+
+        account = self.accounts[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return format_cell(account, column)
+        if role == TONE_ROLE:
+            return cell_tone(account, column)
+        if role == Qt.ForegroundRole:
+            return TONE_COLORS.get(cell_tone(account, column))
+        if role == SORT_ROLE:
+            return sort_value(account, column)
+        if role == Qt.ToolTipRole and column == COLUMN_BREACH and account.is_password_breached():
+            return f"该密码在泄露密码库中出现 {account.password_breached} 次，请尽快修改"
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        # 其余角色返回 None，不调用基类实现（部分 PySide6 版本中会导致进程崩溃）
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return COLUMNS[section][0] if 0 <= section < len(COLUMNS) else None
+        return section + 1
@@ -11,8 +11,12 @@ from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont, QColor
 
 from models.account import AccountType
+from models.database import get_database_manager
+from models.repository import AccountRepository
 from ui.account_page import AccountPage
 from utils.logger import get_logger
+from utils.metrics import timed
+from utils.tracing import traced
 
 
 class CursorInfoWidget(QFrame):
@@ -230,8 +234,9 @@ class CursorInfoWidget(QFrame):
 class CursorStatsWidget(QFrame):
     """Cursor统计信息组件"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_manager: AccountRepository = None):
         super().__init__(parent)
+        self.db_manager = db_manager or get_database_manager()
         self.setup_ui()
         self.apply_styles()
         self.update_stats()
@@ -310,15 +315,14 @@ class CursorStatsWidget(QFrame):
         
         return card
     
+    @traced(category="ui")
     def update_stats(self):
         """更新统计信息"""
         try:
-            from models.database import DatabaseManager
             from models.account import AccountStatus
             from datetime import datetime
             
-            db_manager = DatabaseManager()
-            accounts = db_manager.get_all_accounts()
+            accounts = self.db_manager.get_all_accounts()
             cursor_accounts = [acc for acc in accounts if acc.account_type == AccountType.CURSOR]
             
             # 更新统计
@@ -427,10 +431,11 @@ class CursorStatsWidget(QFrame):
 class CursorEnhancedPage(QWidget):
     """增强的Cursor页面"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_manager: AccountRepository = None):
         super().__init__(parent)
         self.account_type = AccountType.CURSOR
         self.account_type_id = "cursor"
+        self.db_manager = db_manager or get_database_manager()
         
         self.setup_ui()
         self.setup_timer()
@@ -445,7 +450,7 @@ class CursorEnhancedPage(QWidget):
         self.tab_widget = QTabWidget()
         
         # 账号管理标签页
-        self.account_page = AccountPage("cursor")
+        self.account_page = AccountPage("cursor", db_manager=self.db_manager)
         self.tab_widget.addTab(self.account_page, "📋 账号管理")
         
         # Cursor信息标签页
@@ -462,7 +467,7 @@ class CursorEnhancedPage(QWidget):
         stats_scroll.setWidgetResizable(True)
         stats_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         
-        self.stats_widget = CursorStatsWidget()
+        self.stats_widget = CursorStatsWidget(db_manager=self.db_manager)
         stats_scroll.setWidget(self.stats_widget)
         self.tab_widget.addTab(stats_scroll, "📊 统计信息")
         
@@ -477,6 +482,7 @@ class CursorEnhancedPage(QWidget):
         self.refresh_timer.timeout.connect(self.refresh_stats)
         self.refresh_timer.start(30000)  # 30秒刷新一次
     
+    @timed("page_refresh_seconds", "页面刷新耗时（秒）", label="page")
     def refresh_accounts(self):
         """刷新账号数据"""
         self.account_page.refresh_accounts()
@@ -0,0 +1,438 @@
+"""
+诊断页面
+"""
+import os
+import copy
+import math
+import time
+from datetime import datetime
+import PySide6
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit,
+    QMessageBox, QFileDialog, QAbstractItemView
+)
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFont
+
+from models.database import get_database_manager, slow_db_calls
+from utils.config import get_config_manager
+from utils.diagnostics_bundle import build_diagnostics_bundle
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+from utils.profiling import get_profiler
+from utils.tracing import get_tracer
+from ui.stall_watchdog import get_stall_watchdog
+from ui.workers import TaskWorker
+
+
+class DiagnosticsPage(QWidget):
+    """诊断页面：显示应用指标的实时值，控制性能跟踪"""
+
+    # 页面可见时的刷新间隔（毫秒）
+    REFRESH_INTERVAL = 1000
+
+    COLUMNS = ["指标", "标签", "类型", "值 / 次数", "速率(/秒)", "平均", "P50", "P95", "最大", "总计"]
+
+    STALL_COLUMNS = ["处理函数", "卡顿位置", "次数", "累计", "最长"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.metrics = get_metrics()
+        self.tracer = get_tracer()
+        self.watchdog = get_stall_watchdog()
+        self.bundle_worker = None
+
+        # 上次刷新时各指标的次数，用于计算速率
+        self.last_counts = {}
+        self.last_refresh_time = None
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh_metrics)
+
+        self.setup_ui()
+        self.apply_styles()
+
+    def setup_ui(self):
+        """设置UI"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(20)
+
+        # 标题区域
+        header_layout = QHBoxLayout()
+        title_label = QLabel("📈 运行诊断")
+        title_label.setObjectName("pageTitle")
+        title_font = QFont()
+        title_font.setPointSize(20)
+        title_font.setBold(True)
+        title_label.setFont(title_font)
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+
+        self.updated_label = QLabel("")
+        self.updated_label.setObjectName("statsLabel")
+        header_layout.addWidget(self.updated_label)
+        layout.addLayout(header_layout)
+
+        # 控制区域
+        controls_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("按指标名称或标签筛选...")
+        self.filter_edit.textChanged.connect(self.refresh_metrics)
+        controls_layout.addWidget(self.filter_edit)
+
+        export_json_button = QPushButton("📄 导出JSON")
+        export_json_button.clicked.connect(self.export_json)
+        controls_layout.addWidget(export_json_button)
+
+        export_prometheus_button = QPushButton("📊 导出Prometheus")
+        export_prometheus_button.clicked.connect(self.export_prometheus)
+        controls_layout.addWidget(export_prometheus_button)
+
+        reset_button = QPushButton("🔄 重置")
+        reset_button.clicked.connect(self.reset_metrics)
+        controls_layout.addWidget(reset_button)
+
+        self.bundle_button = QPushButton("🧰 导出诊断包")
+        self.bundle_button.setToolTip("打包数据库统计、脱敏配置、指标、慢查询、卡顿记录和日志末尾，用于反馈性能问题")
+        self.bundle_button.clicked.connect(self.export_bundle)
+        controls_layout.addWidget(self.bundle_button)
+        layout.addLayout(controls_layout)
+
+        # 跟踪控制：开启后记录页面切换、刷新、数据库和加密调用的嵌套区间
+        tracing_layout = QHBoxLayout()
+        self.trace_button = QPushButton()
+        self.trace_button.setCheckable(True)
+        self.trace_button.setChecked(self.tracer.enabled)
+        self.trace_button.toggled.connect(self.toggle_tracing)
+        tracing_layout.addWidget(self.trace_button)
+
+        export_trace_button = QPushButton("💾 导出跟踪")
+        export_trace_button.clicked.connect(self.export_trace)
+        tracing_layout.addWidget(export_trace_button)
+
+        clear_trace_button = QPushButton("🗑️ 清空跟踪")
+        clear_trace_button.clicked.connect(self.clear_trace)
+        tracing_layout.addWidget(clear_trace_button)
+
+        self.trace_label = QLabel("")
+        self.trace_label.setObjectName("statsLabel")
+        tracing_layout.addWidget(self.trace_label)
+        tracing_layout.addStretch()
+        layout.addLayout(tracing_layout)
+        self.update_trace_status()
+
+        # 指标表格
+        self.metrics_table = QTableWidget(0, len(self.COLUMNS))
+        self.metrics_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.metrics_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.metrics_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.metrics_table.setAlternatingRowColors(True)
+        self.metrics_table.verticalHeader().setVisible(False)
+        header = self.metrics_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.metrics_table, 2)
+
+        # 界面卡顿汇总：按调用位置累计，悬停查看最长一次卡顿的调用栈
+        stall_header_layout = QHBoxLayout()
+        stall_title = QLabel("界面卡顿")
+        stall_title.setObjectName("sectionTitle")
+        stall_header_layout.addWidget(stall_title)
+        self.stall_label = QLabel("")
+        self.stall_label.setObjectName("statsLabel")
+        stall_header_layout.addWidget(self.stall_label)
+        stall_header_layout.addStretch()
+        clear_stalls_button = QPushButton("清空卡顿记录")
+        clear_stalls_button.clicked.connect(self.clear_stalls)
+        stall_header_layout.addWidget(clear_stalls_button)
+        layout.addLayout(stall_header_layout)
+
+        self.stall_table = QTableWidget(0, len(self.STALL_COLUMNS))
+        self.stall_table.setHorizontalHeaderLabels(self.STALL_COLUMNS)
+        self.stall_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.stall_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.stall_table.verticalHeader().setVisible(False)
+        stall_header = self.stall_table.horizontalHeader()
+        stall_header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        stall_header.setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.stall_table, 1)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_metrics()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def refresh_metrics(self):
+        """刷新指标表格"""
+        now = time.monotonic()
+        elapsed = now - self.last_refresh_time if self.last_refresh_time else None
+        self.last_refresh_time = now
+
+        filter_text = self.filter_edit.text().strip().lower()
+        rows = []
+        for sample in self.metrics.snapshot()['metrics']:
+            labels = ", ".join(f"{key}={value}" for key, value in sample['labels'].items())
+            key = (sample['name'], labels)
+
+            # 速率：与上次刷新相比的次数（直方图）或数值（计数器）增量
+            current = sample['count'] if sample['type'] == 'histogram' else sample['value']
+            previous = self.last_counts.get(key)
+            self.last_counts[key] = current
+            rate = None
+            if sample['type'] != 'gauge' and elapsed and previous is not None:
+                rate = max(0, current - previous) / elapsed
+
+            if filter_text and filter_text not in sample['name'].lower() and filter_text not in labels.lower():
+                continue
+            rows.append(self.format_row(sample, labels, rate))
+
+        self.metrics_table.setUpdatesEnabled(False)
+        self.metrics_table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = self.metrics_table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column >= 3:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.metrics_table.setItem(row, column, item)
+                item.setText(value)
+        self.metrics_table.setUpdatesEnabled(True)
+
+        self.updated_label.setText(f"更新于 {datetime.now().strftime('%H:%M:%S')}  共 {len(rows)} 项")
+        self.update_trace_status()
+        self.refresh_stalls()
+
+    def refresh_stalls(self):
+        """刷新界面卡顿汇总"""
+        reports = self.watchdog.get_report()
+        state = "监视中" if self.watchdog.is_running() else "未启用"
+        self.stall_label.setText(f"{state}，阈值 {self.watchdog.threshold * 1000:.0f}ms")
+
+        self.stall_table.setRowCount(len(reports))
+        for row, report in enumerate(reports):
+            values = [report['handler'], report['site'], str(report['count']),
+                      f"{report['total_ms']:.0f}ms", f"{report['max_ms']:.0f}ms"]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setToolTip(report['stack'])
+                if column >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.stall_table.setItem(row, column, item)
+
+    def clear_stalls(self):
+        """清空卡顿记录"""
+        self.watchdog.clear_report()
+        self.refresh_stalls()
+
+    def format_row(self, sample, labels, rate):
+        """格式化表格行"""
+        rate_text = f"{rate:.1f}" if rate is not None else ""
+
+        if sample['type'] == 'histogram':
+            count = sample['count']
+            is_seconds = sample['name'].endswith('_seconds')
+            average = sample['sum'] / count if count else 0.0
+            return [
+                sample['name'], labels, "直方图", str(count), rate_text,
+                self.format_value(average, is_seconds) if count else "",
+                self.format_value(sample['p50'], is_seconds) if count else "",
+                self.format_value(sample['p95'], is_seconds) if count else "",
+                self.format_value(sample['max'], is_seconds) if count else "",
+                self.format_value(sample['sum'], is_seconds)
+            ]
+
+        type_name = "计数器" if sample['type'] == 'counter' else "仪表"
+        return [sample['name'], labels, type_name, self.format_value(sample['value']),
+                rate_text, "", "", "", "", ""]
+
+    def format_value(self, value, is_seconds=False):
+        """格式化数值，耗时以毫秒显示"""
+        if isinstance(value, float) and math.isnan(value):
+            return "-"
+        if is_seconds:
+            return f"{value * 1000:.2f}ms"
+        if isinstance(value, float) and not value.is_integer():
+            return f"{value:.3f}"
+        return str(int(value))
+
+    def export_json(self):
+        """导出 JSON 快照"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "导出指标",
+            f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            "JSON文件 (*.json);;所有文件 (*)"
+        )
+        if filename:
+            try:
+                self.metrics.export_json(filename)
+                QMessageBox.information(self, "成功", f"指标已导出到: {filename}")
+            except Exception as e:
+                QMessageBox.critical(self, "错误", f"导出指标失败: {str(e)}")
+
+    def export_prometheus(self):
+        """导出 Prometheus 文本格式"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "导出指标", "ai_tools_manager.prom",
+            "Prometheus文本 (*.prom);;所有文件 (*)"
+        )
+        if filename:
+            try:
+                self.metrics.export_prometheus(filename)
+                QMessageBox.information(self, "成功", f"指标已导出到: {filename}")
+            except Exception as e:
+                QMessageBox.critical(self, "错误", f"导出指标失败: {str(e)}")
+
+    def export_bundle(self):
+        """在后台生成诊断包，保存到诊断文件夹"""
+        if self.bundle_worker is not None and self.bundle_worker.isRunning():
+            return
+
+        config_manager = get_config_manager()
+        output_dir = get_profiler().output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(
+            output_dir, f"diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        )
+
+        # 界面线程上的数据在此复制一份，其余数据在后台线程读取
+        logger = get_logger()
+        self.bundle_worker = TaskWorker(
+            self._build_bundle, output_path,
+            db_path=get_database_manager().db_path,
+            config=copy.deepcopy(config_manager.config),
+            stalls=self.watchdog.get_report(),
+            log_files=[logger.log_file, logger.json_log_file],
+            log_tail_bytes=config_manager.get('diagnostics.log_tail_kb', 256) * 1024,
+            extra={
+                'pyside6': PySide6.__version__,
+                'log_level': logger.get_level(),
+                'tracing_enabled': self.tracer.enabled,
+                'stall_watchdog_running': self.watchdog.is_running()
+            }
+        )
+        self.bundle_worker.completed.connect(self.on_bundle_finished)
+        self.bundle_worker.failed.connect(self.on_bundle_failed)
+        self.bundle_button.setEnabled(False)
+        self.bundle_button.setText("⏳ 正在生成...")
+        self.bundle_worker.start()
+
+    def _build_bundle(self, output_path, **kwargs):
+        """后台线程：写完已入队的日志后生成诊断包"""
+        get_logger().flush(timeout=5)
+        return build_diagnostics_bundle(
+            output_path,
+            metrics=self.metrics.snapshot(),
+            slow_calls=slow_db_calls.entries(),
+            **kwargs
+        )
+
+    def on_bundle_finished(self, path):
+        """诊断包生成完成"""
+        self.bundle_button.setEnabled(True)
+        self.bundle_button.setText("🧰 导出诊断包")
+        QMessageBox.information(
+            self, "成功",
+            f"诊断包已保存到: {os.path.abspath(path)}\n配置和日志中的密码、密钥和邮箱已脱敏。"
+        )
+
+    def on_bundle_failed(self, error):
+        """诊断包生成失败"""
+        self.bundle_button.setEnabled(True)
+        self.bundle_button.setText("🧰 导出诊断包")
+        print(f"生成诊断包失败: {error}")
+        QMessageBox.critical(self, "错误", f"生成诊断包失败: {error}")
+
+    def toggle_tracing(self, enabled):
+        """开启或关闭跟踪"""
+        if enabled:
+            self.tracer.start()
+        else:
+            self.tracer.stop()
+        self.update_trace_status()
+
+    def update_trace_status(self):
+        """更新跟踪状态显示"""
+        self.trace_button.setText("⏹ 停止跟踪" if self.tracer.enabled else "⏺ 开始跟踪")
+        state = "记录中" if self.tracer.enabled else "已停止"
+        self.trace_label.setText(f"跟踪{state}，已记录 {self.tracer.event_count()} 个区间")
+
+    def export_trace(self):
+        """导出 Chrome 跟踪文件"""
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "导出跟踪",
+            f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            "Chrome跟踪文件 (*.json);;所有文件 (*)"
+        )
+        if filename:
+            try:
+                self.tracer.export_chrome_trace(filename)
+                QMessageBox.information(
+                    self, "成功",
+                    f"跟踪已导出到: {filename}\n可在 chrome://tracing 或 ui.perfetto.dev 中打开"
+                )
+            except Exception as e:
+                QMessageBox.critical(self, "错误", f"导出跟踪失败: {str(e)}")
+
+    def clear_trace(self):
+        """清空已记录的跟踪"""
+        self.tracer.clear()
+        self.update_trace_status()
+
+    def reset_metrics(self):
+        """清零全部指标"""
+        self.metrics.reset()
+        self.last_counts.clear()
+        self.last_refresh_time = None
+        self.refresh_metrics()
+
+    def apply_styles(self):
+        """应用样式"""
+        self.setStyleSheet("""
+            #pageTitle {
+                color: #1976d2;
+                margin-bottom: 10px;
+            }
+
+            #statsLabel {
+                color: #666;
+                font-size: 12px;
+            }
+
+            #sectionTitle {
+                font-weight: bold;
+                color: #333;
+            }
+
+            QTableWidget {
+                border: 2px solid #e9ecef;
+                border-radius: 6px;
+                background-color: white;
+                font-size: 11px;
+            }
+
+            QPushButton {
+                background-color: #f8f9fa;
+                border: 1px solid #dee2e6;
+                border-radius: 6px;
+                padding: 8px 16px;
+            }
+
+            QPushButton:hover {
+                background-color: #e9ecef;
+            }
+
+            QLineEdit {
+                border: 1px solid #dee2e6;
+                border-radius: 4px;
+                padding: 5px 10px;
+                background-color: white;
+            }
+        """)
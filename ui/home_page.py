@@ -8,8 +8,10 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont
 
-from models.database import DatabaseManager
+from models.database import get_database_manager
+from models.repository import AccountRepository
 from models.account import AccountType, AccountStatus
+from utils.metrics import timed
 from ui.automation_dialog import AutomationDialog
 
 
@@ -137,9 +139,9 @@ class HomePage(QWidget):
     # 信号定义
     tool_selected = Signal(str)  # 工具选择信号
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_manager: AccountRepository = None):
         super().__init__(parent)
-        self.db_manager = DatabaseManager()
+        self.db_manager = db_manager or get_database_manager()
         
         self.setup_ui()
         self.apply_styles()
@@ -171,6 +173,9 @@ class HomePage(QWidget):
         # 最近活动
         self.create_recent_activity_section(scroll_layout)
         
+        # 密码健康
+        self.create_password_health_section(scroll_layout)
+        
         scroll_layout.addStretch()
         
         scroll_area.setWidget(scroll_widget)
@@ -302,6 +307,42 @@ class HomePage(QWidget):
         
         layout.addWidget(activity_group)
     
+    def create_password_health_section(self, layout):
+        """创建密码健康区域"""
+        health_group = QGroupBox("🔐 密码健康")
+        health_layout = QVBoxLayout(health_group)
+        
+        self.health_label = QLabel("暂无密码数据")
+        self.health_label.setObjectName("activityText")
+        health_layout.addWidget(self.health_label)
+        
+        layout.addWidget(health_group)
+    
+    def refresh_password_health(self):
+        """刷新密码健康报告"""
+        try:
+            audit = self.db_manager.get_password_audit()
+            if not audit:
+                self.health_label.setText("暂无密码数据")
+                return
+            
+            lines = []
+            for account_type, stats in sorted(audit.items()):
+                line = f"{account_type}: 共 {stats['total']} 个密码"
+                if stats['reused']:
+                    line += f"，⚠️ 重复使用 {stats['reused']} 个"
+                if stats['weak']:
+                    line += f"，⚠️ 弱密码 {stats['weak']} 个"
+                if not stats['reused'] and not stats['weak']:
+                    line += "，✅ 状况良好"
+                lines.append(line)
+            self.health_label.setText("\n".join(lines))
+            
+        except Exception as e:
+            print(f"刷新密码健康报告失败: {e}")
+            self.health_label.setText("密码健康报告暂不可用")
+    
+    @timed("page_refresh_seconds", "页面刷新耗时（秒）", label="page")
     def refresh_data(self):
         """刷新数据"""
         try:
@@ -343,6 +384,9 @@ class HomePage(QWidget):
             else:
                 self.activity_label.setText("暂无账号数据")
 
+            # 密码健康报告
+            self.refresh_password_health()
+
         except Exception as e:
             print(f"刷新数据失败: {e}")
             # 设置默认值
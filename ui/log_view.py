@@ -0,0 +1,184 @@
+"""
+日志列表模型与绘制委托
+"""
+import os
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+from PySide6.QtWidgets import QStyledItemDelegate
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+
+
+# 日志级别对应的图标和颜色
+LEVEL_ICONS = {
+    'ERROR': '🔴',
+    'WARNING': '⚠️',
+    'INFO': 'ℹ️',
+    'DEBUG': '🐛'
+}
+
+LEVEL_COLORS = {
+    'ERROR': QColor("#d32f2f"),
+    'WARNING': QColor("#f57c00"),
+    'INFO': QColor("#333333"),
+    'DEBUG': QColor("#757575")
+}
+
+# 日志条目角色：返回原始的日志字典
+LogEntryRole = Qt.UserRole + 1
+
+
+def format_log_time(timestamp: str) -> str:
+    """格式化日志时间为 时:分:秒"""
+    try:
+        return datetime.fromisoformat(timestamp).strftime('%H:%M:%S')
+    except (TypeError, ValueError):
+        return timestamp or ''
+
+
+def format_log_entry(entry: Dict[str, Any]) -> str:
+    """格式化日志条目为单行文本"""
+    level = entry.get('level', 'INFO')
+    level_icon = LEVEL_ICONS.get(level, 'ℹ️')
+    return f"[{format_log_time(entry.get('timestamp', ''))}] {level_icon} {level}: {entry.get('message', '')}"
+
+
+class LogListModel(QAbstractListModel):
+    """
+    日志列表模型
+
+    日志来源是一个按显示顺序产出日志条目的迭代器，模型只在视图需要时
+    通过 fetchMore 分页取出，因此设置来源的开销与日志总数无关。
+    """
+
+    def __init__(self, page_size: int = 500, parent=None):
+        super().__init__(parent)
+        self.page_size = page_size
+        self._entries: List[Dict[str, Any]] = []
+        self._source = None
+        self._exhausted = True
+
+    def set_source(self, entries: Optional[Iterable[Dict[str, Any]]]):
+        """设置日志来源并加载第一页"""
+        self.beginResetModel()
+        self._entries = []
+        self._source = iter(entries) if entries is not None else None
+        self._exhausted = self._source is None
+        self.endResetModel()
+
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def prepend_entries(self, entries: List[Dict[str, Any]]):
+        """在列表顶部插入新日志（最新的在前），已加载的行、选择和分页位置不变"""
+        if not entries:
+            return
+
+        self.beginInsertRows(QModelIndex(), 0, len(entries) - 1)
+        self._entries[0:0] = entries
+        self.endInsertRows()
+
+    def is_exhausted(self) -> bool:
+        """日志来源是否已全部加载"""
+        return self._exhausted
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._entries)
+
+    def canFetchMore(self, parent):
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self._exhausted:
+            return
+
+        page = list(islice(self._source, self.page_size))
+        if len(page) < self.page_size:
+            self._exhausted = True
+            self._source = None
+        if not page:
+            return
+
+        first = len(self._entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._entries.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._entries):
+            return None
+
+        entry = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            return format_log_entry(entry).replace('\n', ' ')
+        if role == Qt.ToolTipRole:
+            return f"{entry.get('timestamp', '')}\n{entry.get('message', '')}"
+        if role == Qt.ForegroundRole:
+            return LEVEL_COLORS.get(entry.get('level'), LEVEL_COLORS['INFO'])
+        if role == LogEntryRole:
+            return entry
+        return None
+
+
+class LogItemDelegate(QStyledItemDelegate):
+    """
+    日志条目委托：固定行高，文字和颜色由模型的 DisplayRole 和 ForegroundRole 提供
+
+    不在 Python 中逐行绘制：部分 PySide6 版本在 Python 中调用 QPainter 等无返回值的方法时
+    会少计 None 的引用，逐行绘制很快就会使进程崩溃。
+    """
+
+    def __init__(self, font: QFont, parent=None):
+        super().__init__(parent)
+        self.row_height = QFontMetrics(font).height() + 6
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.row_height)
+
+
+class SearchResultModel(QAbstractListModel):
+    """日志搜索结果模型：结果由搜索线程分批追加"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._results: List[tuple] = []
+
+    def clear(self):
+        """清空结果"""
+        self.beginResetModel()
+        self._results = []
+        self.endResetModel()
+
+    def add_results(self, results: List[tuple]):
+        """追加一批 (文件路径, 行号, 行内容) 结果"""
+        if not results:
+            return
+
+        first = len(self._results)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self._results.extend(results)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._results)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._results):
+            return None
+
+        path, line_number, line = self._results[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{os.path.basename(path)}:{line_number}  {line}"
+        if role == Qt.ToolTipRole:
+            return f"{path}:{line_number}\n{line}"
+        if role == Qt.UserRole:
+            return path, line_number
+        return None
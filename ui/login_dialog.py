@@ -4,13 +4,16 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLineEdit, QPushButton, QLabel, QCheckBox, QMessageBox,
-    QTabWidget, QWidget, QFrame
+    QTabWidget, QWidget, QFrame, QProgressBar
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QPixmap, QPainter, QColor
 from utils.session import get_session_manager
-from models.database import DatabaseManager
+from models.database import get_database_manager
 from models.user import User, UserRole
+from utils.password_audit import score_password_strength, WEAK_PASSWORD_SCORE
+from ui.workers import TaskWorker
+from typing import Optional
 import re
 
 
@@ -22,7 +25,9 @@ class LoginDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.session_manager = get_session_manager()
-        self.db_manager = DatabaseManager()
+        self.db_manager = get_database_manager()
+        self.worker = None
+        self.pending_task = None
         
         self.setWindowTitle("AI工具管理器 - 登录")
         self.setFixedSize(400, 500)
@@ -77,6 +82,18 @@ class LoginDialog(QDialog):
         
         layout.addWidget(self.tab_widget)
         
+        # 密码哈希进度（后台执行，可取消）
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setTextVisible(False)
+        progress_layout.addWidget(self.progress_bar)
+        
+        self.cancel_button = QPushButton("取消")
+        progress_layout.addWidget(self.cancel_button)
+        layout.addLayout(progress_layout)
+        self.set_busy(False)
+        
         # 底部信息
         info_label = QLabel("首次使用？默认管理员账号：admin / admin123")
         info_label.setAlignment(Qt.AlignCenter)
@@ -159,6 +176,62 @@ class LoginDialog(QDialog):
         self.password_edit.returnPressed.connect(self.handle_login)
         self.reg_confirm_edit.returnPressed.connect(self.handle_register)
         self.reg_password_edit.textChanged.connect(self.check_password_strength)
+        self.cancel_button.clicked.connect(self.cancel_worker)
+    
+    def set_busy(self, busy: bool):
+        """切换后台处理状态"""
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setVisible(busy)
+        self.login_button.setEnabled(not busy)
+        self.register_button.setEnabled(not busy)
+        self.tab_widget.setEnabled(not busy)
+    
+    def start_worker(self, func, on_finished, *args):
+        """
+        在后台线程执行密码哈希（只计算，不写数据库）
+        
+        已取消的操作仍在计算时，新操作排在其后，线程结束后开始。
+        """
+        self.set_busy(True)
+        self.pending_task = (func, on_finished, args)
+        if self.worker is not None and self.worker.isRunning():
+            return
+        self.start_pending_worker()
+    
+    def start_pending_worker(self):
+        """开始排队的后台操作"""
+        if self.pending_task is None:
+            return
+        
+        func, on_finished, args = self.pending_task
+        self.pending_task = None
+        if self.worker is not None:
+            self.worker.wait()
+        self.worker = TaskWorker(func, *args)
+        self.worker.completed.connect(on_finished)
+        self.worker.failed.connect(self.on_worker_failed)
+        self.worker.finished.connect(self.start_pending_worker)
+        self.worker.start()
+    
+    def cancel_worker(self):
+        """取消后台操作：丢弃哈希结果，不会保存用户或创建会话"""
+        self.pending_task = None
+        if self.worker is not None:
+            self.worker.cancel()
+        self.set_busy(False)
+    
+    def on_worker_failed(self, error: str):
+        """后台操作失败"""
+        self.set_busy(False)
+        QMessageBox.critical(self, "错误", f"操作失败：{error}")
+    
+    def done(self, result):
+        """关闭对话框前等待后台线程结束"""
+        self.pending_task = None
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().done(result)
     
     def handle_login(self):
         """处理登录"""
@@ -169,7 +242,13 @@ class LoginDialog(QDialog):
             QMessageBox.warning(self, "警告", "请输入用户名和密码！")
             return
         
-        if self.session_manager.login(username, password):
+        self.start_worker(self.session_manager.authenticate, self.on_login_finished, username, password)
+    
+    def on_login_finished(self, user: Optional[User]):
+        """登录验证完成：在界面线程保存登录信息并创建会话"""
+        self.set_busy(False)
+        if user:
+            self.session_manager.start_session(user)
             self.login_successful.emit()
             self.accept()
         else:
@@ -203,19 +282,29 @@ class LoginDialog(QDialog):
         user.username = username
         user.email = email
         user.role = UserRole.USER
-        user.set_password(password)
         
+        self.start_worker(self.hash_user_password, self.on_register_finished, user, password)
+    
+    def hash_user_password(self, user: User, password: str) -> User:
+        """哈希密码（在后台线程执行，不保存用户）"""
+        user.set_password(password, self.session_manager.get_hash_iterations())
+        return user
+    
+    def on_register_finished(self, user: User):
+        """密码哈希完成：在界面线程保存用户"""
+        self.set_busy(False)
         try:
             user_id = self.db_manager.add_user(user)
-            if user_id > 0:
-                QMessageBox.information(self, "注册成功", "账号注册成功！请使用新账号登录。")
-                self.tab_widget.setCurrentIndex(0)  # 切换到登录选项卡
-                self.username_edit.setText(username)
-                self.clear_register_form()
-            else:
-                QMessageBox.critical(self, "注册失败", "注册失败，请稍后重试！")
         except Exception as e:
-            QMessageBox.critical(self, "注册失败", f"注册失败：{str(e)}")
+            print(f"注册用户失败: {e}")
+            user_id = 0
+        if user_id > 0:
+            QMessageBox.information(self, "注册成功", "账号注册成功！请使用新账号登录。")
+            self.tab_widget.setCurrentIndex(0)  # 切换到登录选项卡
+            self.username_edit.setText(self.reg_username_edit.text().strip())
+            self.clear_register_form()
+        else:
+            QMessageBox.critical(self, "注册失败", "注册失败，请稍后重试！")
     
     def validate_register_input(self, username: str, email: str, password: str, confirm: str) -> bool:
         """验证注册输入"""
@@ -253,35 +342,9 @@ class LoginDialog(QDialog):
             self.password_strength_label.setText("")
             return
         
-        strength = 0
-        feedback = []
-        
-        if len(password) >= 6:
-            strength += 1
-        else:
-            feedback.append("至少6个字符")
-        
-        if re.search(r'[a-z]', password):
-            strength += 1
-        else:
-            feedback.append("包含小写字母")
-        
-        if re.search(r'[A-Z]', password):
-            strength += 1
-        else:
-            feedback.append("包含大写字母")
-        
-        if re.search(r'\d', password):
-            strength += 1
-        else:
-            feedback.append("包含数字")
-        
-        if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-            strength += 1
-        else:
-            feedback.append("包含特殊字符")
+        strength = score_password_strength(password)
         
-        if strength <= 2:
+        if strength <= WEAK_PASSWORD_SCORE:
             self.password_strength_label.setText("密码强度: 弱")
             self.password_strength_label.setStyleSheet("color: red; font-size: 12px;")
         elif strength <= 3:
@@ -2,27 +2,62 @@
 日志管理页面
 """
 import os
+import re
 import json
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QTextEdit, QComboBox, QGroupBox, QSplitter, QListWidget,
     QListWidgetItem, QMessageBox, QFileDialog, QCheckBox,
-    QDateEdit, QSpinBox, QFormLayout, QFrame
+    QDateEdit, QSpinBox, QFormLayout, QFrame, QLineEdit,
+    QListView, QStackedWidget, QProgressBar
 )
-from PySide6.QtCore import Qt, Signal, QTimer, QDate
+from PySide6.QtCore import Qt, Signal, QTimer, QDate, QFileSystemWatcher, QPoint
 from PySide6.QtGui import QFont, QColor, QTextCursor
 
 from utils.logger import get_logger, LogLevel
+from utils.log_reader import LogFileReader
+from utils.log_search import compile_search_pattern, list_log_files
+from utils.metrics import timed
+from ui.log_view import LogListModel, LogItemDelegate, SearchResultModel, format_log_entry
+from ui.workers import LogSearchWorker, TaskWorker
 
 
 class LogsPage(QWidget):
     """日志管理页面"""
     
+    # 打开日志文件时只读取尾部的字节数，更早的内容滚动到顶部时按块加载
+    TAIL_BYTES = 64 * 1024
+    PAGE_BYTES = 64 * 1024
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.logger = get_logger()
-        self.auto_refresh_timer = QTimer()
+        self.log_dir = self.logger.log_dir
+        
+        # 跟踪模式：当前查看的文件及已显示内容的字节范围
+        self.current_file = None
+        self.file_reader = None
+        self.following = False
+        self.view_start = 0
+        self.view_end = 0
+        self.search_worker = None
+        # 在后台打开压缩归档（需要先完整解压），打开期间的新请求排在其后
+        self.open_worker = None
+        self.pending_open = None
+        self.opened_callback = None
+        self.filtered_count = None
+        # 列表视图已包含的日志缓存位置，之后的日志增量插入
+        self.cache_sequence = 0
+        
+        # 自动刷新由文件系统监视器驱动，变化通知经过短暂合并后再处理
+        self.file_watcher = QFileSystemWatcher(self)
+        self.auto_refresh_timer = QTimer(self)
+        self.auto_refresh_timer.setSingleShot(True)
+        self.auto_refresh_timer.setInterval(500)
+        self.files_refresh_timer = QTimer(self)
+        self.files_refresh_timer.setSingleShot(True)
+        self.files_refresh_timer.setInterval(1000)
         
         self.setup_ui()
         self.apply_styles()
@@ -30,7 +65,8 @@ class LogsPage(QWidget):
         self.load_logs()
         
         # 设置自动刷新
-        self.auto_refresh_timer.timeout.connect(self.refresh_logs)
+        self.auto_refresh_timer.timeout.connect(self.load_new_logs)
+        self.files_refresh_timer.timeout.connect(self.load_log_files)
         self.start_auto_refresh()
     
     def setup_ui(self):
@@ -108,6 +144,24 @@ class LogsPage(QWidget):
         
         controls_layout.addWidget(QLabel("  "))
         
+        # 文本搜索
+        search_label = QLabel("搜索:")
+        controls_layout.addWidget(search_label)
+        
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("日志内容...")
+        self.search_edit.setMaximumWidth(200)
+        controls_layout.addWidget(self.search_edit)
+        
+        self.regex_checkbox = QCheckBox("正则")
+        controls_layout.addWidget(self.regex_checkbox)
+        
+        self.search_files_button = QPushButton("🔍 搜索全部日志")
+        self.search_files_button.setToolTip("在当前及已轮转、已压缩的全部日志文件中搜索")
+        controls_layout.addWidget(self.search_files_button)
+        
+        controls_layout.addWidget(QLabel("  "))
+        
         # 自动刷新
         self.auto_refresh_checkbox = QCheckBox("自动刷新")
         self.auto_refresh_checkbox.setChecked(True)
@@ -158,10 +212,34 @@ class LogsPage(QWidget):
         content_label.setObjectName("sectionTitle")
         right_layout.addWidget(content_label)
         
+        # 结构化日志使用虚拟化列表显示，日志文件使用文本显示
+        self.log_stack = QStackedWidget()
+        
+        self.log_model = LogListModel(parent=self)
+        self.log_list = QListView()
+        self.log_list.setObjectName("logList")
+        self.log_list.setModel(self.log_model)
+        self.log_list.setFont(QFont("Consolas", 10))
+        self.log_list.setItemDelegate(LogItemDelegate(self.log_list.font(), self.log_list))
+        self.log_list.setUniformItemSizes(True)
+        self.log_list.setAlternatingRowColors(True)
+        self.log_list.setSelectionMode(QListView.ExtendedSelection)
+        self.log_stack.addWidget(self.log_list)
+        
         self.log_content = QTextEdit()
         self.log_content.setReadOnly(True)
         self.log_content.setFont(QFont("Consolas", 10))
-        right_layout.addWidget(self.log_content)
+        self.log_stack.addWidget(self.log_content)
+        
+        self.result_model = SearchResultModel(self)
+        self.result_list = QListView()
+        self.result_list.setObjectName("logList")
+        self.result_list.setModel(self.result_model)
+        self.result_list.setUniformItemSizes(True)
+        self.result_list.setFont(QFont("Consolas", 10))
+        self.log_stack.addWidget(self.result_list)
+        
+        right_layout.addWidget(self.log_stack)
         
         splitter.addWidget(right_widget)
         
@@ -181,6 +259,17 @@ class LogsPage(QWidget):
         self.stats_label.setObjectName("statsLabel")
         footer_layout.addWidget(self.stats_label)
         
+        # 搜索进度
+        self.search_progress = QProgressBar()
+        self.search_progress.setRange(0, 100)
+        self.search_progress.setMaximumWidth(200)
+        self.search_progress.hide()
+        footer_layout.addWidget(self.search_progress)
+        
+        self.cancel_search_button = QPushButton("停止搜索")
+        self.cancel_search_button.hide()
+        footer_layout.addWidget(self.cancel_search_button)
+        
         footer_layout.addStretch()
         
         # 日志级别说明
@@ -194,11 +283,20 @@ class LogsPage(QWidget):
         """设置信号连接"""
         self.level_combo.currentTextChanged.connect(self.filter_logs)
         self.date_combo.currentTextChanged.connect(self.filter_logs)
+        self.search_edit.returnPressed.connect(self.filter_logs)
         self.auto_refresh_checkbox.toggled.connect(self.toggle_auto_refresh)
         self.refresh_button.clicked.connect(self.refresh_logs)
         self.clear_button.clicked.connect(self.clear_logs)
         self.export_button.clicked.connect(self.export_logs)
         self.files_list.itemClicked.connect(self.load_selected_file)
+        self.file_watcher.fileChanged.connect(self.on_file_changed)
+        self.file_watcher.directoryChanged.connect(self.on_directory_changed)
+        self.log_content.verticalScrollBar().valueChanged.connect(self.on_scroll_changed)
+        self.log_model.rowsInserted.connect(self.on_log_rows_loaded)
+        self.search_files_button.clicked.connect(self.start_file_search)
+        self.cancel_search_button.clicked.connect(self.cancel_file_search)
+        self.result_list.activated.connect(self.open_search_result)
+        self.result_list.clicked.connect(self.open_search_result)
     
     def load_logs(self):
         """加载日志"""
@@ -210,33 +308,32 @@ class LogsPage(QWidget):
             self.load_current_logs()
             
         except Exception as e:
-            self.log_content.setText(f"加载日志失败: {str(e)}")
+            self.show_message(f"加载日志失败: {str(e)}")
     
     def load_log_files(self):
         """加载日志文件列表"""
         self.files_list.clear()
         
         # 获取日志目录
-        log_dir = "logs"
+        log_dir = self.log_dir
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
             return
         
-        # 扫描日志文件
+        # 扫描文本日志文件及轮转出的归档（已按修改时间从新到旧排序）
         log_files = []
-        for filename in os.listdir(log_dir):
-            if filename.endswith('.log'):
-                file_path = os.path.join(log_dir, filename)
+        for file_path in list_log_files(log_dir):
+            try:
                 file_stat = os.stat(file_path)
-                log_files.append({
-                    'name': filename,
-                    'path': file_path,
-                    'size': file_stat.st_size,
-                    'modified': datetime.fromtimestamp(file_stat.st_mtime)
-                })
-        
-        # 按修改时间排序
-        log_files.sort(key=lambda x: x['modified'], reverse=True)
+            except FileNotFoundError:
+                # 扫描期间被归档线程压缩或清理
+                continue
+            log_files.append({
+                'name': os.path.basename(file_path),
+                'path': file_path,
+                'size': file_stat.st_size,
+                'modified': datetime.fromtimestamp(file_stat.st_mtime)
+            })
         
         # 添加到列表
         for file_info in log_files:
@@ -246,8 +343,9 @@ class LogsPage(QWidget):
             size_kb = file_info['size'] / 1024
             modified_str = file_info['modified'].strftime('%m-%d %H:%M')
             
+            size_icon = "🗜️" if file_info['path'].endswith('.gz') else "📁"
             display_text = f"{file_info['name']}\n"
-            display_text += f"📁 {size_kb:.1f}KB  🕒 {modified_str}"
+            display_text += f"{size_icon} {size_kb:.1f}KB  🕒 {modified_str}"
             
             item.setText(display_text)
             item.setData(Qt.UserRole, file_info)
@@ -262,27 +360,66 @@ class LogsPage(QWidget):
             
             self.files_list.addItem(item)
         
-        # 默认选择第一个文件
+        # 保持当前跟踪文件的选中状态，否则默认选择第一个文件
+        for row in range(self.files_list.count()):
+            if self.files_list.item(row).data(Qt.UserRole)['path'] == self.current_file:
+                self.files_list.setCurrentRow(row)
+                return
+        
         if self.files_list.count() > 0:
             self.files_list.setCurrentRow(0)
     
     def load_current_logs(self):
         """加载当前日志内容"""
+        self.stop_following()
+        
         try:
-            # 获取最新的日志内容
-            log_entries = self.logger.get_recent_logs(limit=1000)
-            
-            # 应用筛选
-            filtered_entries = self.apply_filters(log_entries)
-            
-            # 显示日志
-            self.display_logs(filtered_entries)
+            # 列表模型按需分页取出日志，设置来源的开销与日志总数无关
+            self.cache_sequence = self.logger.log_cache.sequence
+            self.log_model.set_source(self.get_log_source())
+            self.log_stack.setCurrentWidget(self.log_list)
             
             # 更新统计
-            self.update_stats(len(filtered_entries))
+            self.filtered_count = self.count_filtered_logs()
+            self.update_stats(self.filtered_count)
             
         except Exception as e:
-            self.log_content.setText(f"加载日志内容失败: {str(e)}")
+            self.show_message(f"加载日志内容失败: {str(e)}")
+    
+    def load_new_logs(self):
+        """列表视图：只把上次加载之后的新日志插入到列表顶部，保留滚动位置和选择"""
+        if self.current_file is not None or self.log_stack.currentWidget() is not self.log_list:
+            return
+        
+        entries = self.logger.log_cache.entries_since(self.cache_sequence)
+        if entries is None:
+            # 新日志超过缓存容量或缓存被清空，重新加载
+            self.load_current_logs()
+            return
+        self.cache_sequence += len(entries)
+        
+        # 新日志晚于日期筛选的起点，只需按级别和搜索内容筛选
+        level = self.level_combo.currentData()
+        text = self.search_edit.text().strip().lower()
+        rows = [
+            entry for entry in reversed(entries)
+            if (level == "ALL" or entry.get('level') == level)
+            and (not text or text in entry.get('message', '').lower())
+        ]
+        if not rows:
+            return
+        
+        # 不在顶部时保持当前阅读的行不动
+        scroll_bar = self.log_list.verticalScrollBar()
+        top_row = self.log_list.indexAt(QPoint(0, 0)).row()
+        at_top = scroll_bar.value() == scroll_bar.minimum()
+        self.log_model.prepend_entries(rows)
+        if not at_top and top_row >= 0:
+            self.log_list.scrollTo(self.log_model.index(top_row + len(rows)), QListView.PositionAtTop)
+        
+        if self.filtered_count is not None:
+            self.filtered_count += len(rows)
+        self.update_stats(self.filtered_count)
     
     def load_selected_file(self, item):
         """加载选定的日志文件"""
@@ -291,76 +428,396 @@ class LogsPage(QWidget):
             if not file_info:
                 return
             
-            # 读取文件内容
-            with open(file_info['path'], 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            self.log_content.setText(content)
-            
-            # 滚动到底部
-            cursor = self.log_content.textCursor()
-            cursor.movePosition(QTextCursor.End)
-            self.log_content.setTextCursor(cursor)
+            self.follow_file(file_info['path'])
             
         except Exception as e:
-            self.log_content.setText(f"读取文件失败: {str(e)}")
+            self.show_message(f"读取文件失败: {str(e)}")
     
-    def apply_filters(self, log_entries):
-        """应用筛选条件"""
-        filtered = log_entries
+    def open_file(self, path, on_opened, line_number: int = 0):
+        """
+        打开日志文件后以读取器调用 on_opened
         
-        # 级别筛选
-        selected_level = self.level_combo.currentData()
-        if selected_level != "ALL":
-            filtered = [entry for entry in filtered if entry.get('level') == selected_level]
+        普通文件直接映射；压缩归档的解压（及跳转行的索引扫描）在后台线程进行，
+        完成后在界面线程回调。新的请求会取代尚未完成的请求。
+        """
+        self.stop_following()
+        self.pending_open = None
+        if self.open_worker is not None and self.open_worker.isRunning():
+            self.open_worker.cancel()
         
-        # 日期筛选
-        days = self.date_combo.currentData()
-        if days >= 0:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            filtered = [entry for entry in filtered 
-                       if datetime.fromisoformat(entry.get('timestamp', '')) >= cutoff_date]
-        
-        return filtered
-    
-    def display_logs(self, log_entries):
-        """显示日志条目"""
-        self.log_content.clear()
-        
-        for entry in log_entries:
-            # 格式化日志条目
-            timestamp = entry.get('timestamp', '')
-            level = entry.get('level', 'INFO')
-            message = entry.get('message', '')
-            
-            # 添加级别图标
-            level_icon = {
-                'ERROR': '🔴',
-                'WARNING': '⚠️',
-                'INFO': 'ℹ️',
-                'DEBUG': '🐛'
-            }.get(level, 'ℹ️')
-            
-            # 格式化时间
-            try:
-                dt = datetime.fromisoformat(timestamp)
-                time_str = dt.strftime('%H:%M:%S')
-            except:
-                time_str = timestamp
-            
-            # 添加到文本框
-            log_line = f"[{time_str}] {level_icon} {level}: {message}\n"
-            self.log_content.append(log_line.rstrip())
+        if not path.endswith('.gz'):
+            on_opened(LogFileReader(path))
+            return
+        
+        self.show_message(f"正在解压 {os.path.basename(path)}...")
+        self.pending_open = (path, on_opened, line_number)
+        if self.open_worker is None or not self.open_worker.isRunning():
+            self.start_pending_open()
+    
+    def start_pending_open(self):
+        """开始排队的打开请求（已取消的解压结束后才开始下一个）"""
+        if self.pending_open is None:
+            return
+        
+        path, self.opened_callback, line_number = self.pending_open
+        self.pending_open = None
+        if self.open_worker is not None:
+            self.open_worker.wait()
+        self.open_worker = TaskWorker(self._open_reader, path, line_number)
+        self.open_worker.completed.connect(self.on_file_opened)
+        self.open_worker.failed.connect(self.on_file_open_failed)
+        self.open_worker.finished.connect(self.start_pending_open)
+        self.open_worker.start()
+    
+    @staticmethod
+    def _open_reader(path, line_number):
+        """后台线程：打开读取器并预先扫描到目标行"""
+        reader = LogFileReader(path)
+        reader.open()
+        if line_number > 1:
+            reader.line_offset(line_number - 1)
+        return reader
+    
+    def on_file_opened(self, reader):
+        """后台打开完成"""
+        if self.sender() is not self.open_worker or self.open_worker.cancelled:
+            reader.close()
+            return
+        try:
+            self.opened_callback(reader)
+        except Exception as e:
+            reader.close()
+            self.show_message(f"读取文件失败: {str(e)}")
+    
+    def on_file_open_failed(self, message):
+        """后台打开失败"""
+        if self.sender() is self.open_worker and not self.open_worker.cancelled:
+            self.show_message(f"读取文件失败: {message}")
+    
+    def cancel_open_file(self):
+        """停止正在进行的后台打开（等待解压结束）"""
+        self.pending_open = None
+        if self.open_worker is not None and self.open_worker.isRunning():
+            self.open_worker.cancel()
+            self.open_worker.wait()
+    
+    def follow_file(self, path):
+        """打开日志文件并跟踪追加的内容：只读取尾部，之后只读取新增字节"""
+        self.open_file(path, self.show_file_tail)
+    
+    def show_file_tail(self, reader):
+        """显示文件尾部并开始跟踪"""
+        path = reader.path
+        size = reader.size
+        text, start, end = reader.read_range(max(0, size - self.TAIL_BYTES), size)
+        # 读取之间不占用文件，否则 Windows 下日志无法轮转
+        reader.release()
+        
+        # 先设置内容再记录当前文件，避免重置滚动条时触发加载更早内容
+        self.log_content.setPlainText(text)
+        self.log_stack.setCurrentWidget(self.log_content)
+        self.current_file = path
+        self.file_reader = reader
+        self.following = True
+        self.view_start = start
+        self.view_end = end
+        self.scroll_to_bottom()
+        
+        # 压缩归档不会再变化，无需监视
+        if (self.auto_refresh_checkbox.isChecked() and not path.endswith('.gz')
+                and path not in self.file_watcher.files()):
+            self.file_watcher.addPath(path)
+    
+    def stop_following(self):
+        """停止跟踪日志文件"""
+        if (self.current_file and self.current_file != self.logger.log_file
+                and self.current_file in self.file_watcher.files()):
+            self.file_watcher.removePath(self.current_file)
+        self.current_file = None
+        self.following = False
+        
+        if self.file_reader is not None:
+            self.file_reader.close()
+            self.file_reader = None
+    
+    def on_file_changed(self, path):
+        """文件变化：只读取并追加新增的内容"""
+        if self.current_file is None and path == self.logger.log_file:
+            # 查看结构化日志时，主日志文件的写入意味着有新日志
+            self.auto_refresh_timer.start()
+            return
+        
+        if path != self.current_file or not self.following:
+            return
+        
+        if not os.path.exists(path):
+            # 文件被轮转或删除，等待目录变化后重新打开
+            self.files_refresh_timer.start()
+            return
+        
+        # 部分平台在文件被替换后会移除监视，需要重新添加
+        if path not in self.file_watcher.files():
+            self.file_watcher.addPath(path)
+        
+        size = os.path.getsize(path)
+        if size < self.view_end:
+            # 文件被截断，重新从尾部加载
+            self.follow_file(path)
+            return
+        
+        size = self.file_reader.refresh()
+        text, _, end = self.file_reader.read_range(self.view_end, size)
+        self.file_reader.release()
+        if not text:
+            return
         
-        # 滚动到底部
+        scroll_bar = self.log_content.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        
+        cursor = QTextCursor(self.log_content.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self.view_end = end
+        
+        if at_bottom:
+            self.scroll_to_bottom()
+    
+    def on_directory_changed(self, path):
+        """日志目录变化：合并通知后刷新文件列表"""
+        self.files_refresh_timer.start()
+        
+        # 被轮转的日志文件重新创建后恢复监视
+        for file_path in (self.logger.log_file, self.current_file):
+            if file_path and os.path.exists(file_path) and file_path not in self.file_watcher.files():
+                self.file_watcher.addPath(file_path)
+    
+    def on_scroll_changed(self, value):
+        """滚动到顶部时加载更早的内容，未跟踪到文件末尾时滚动到底部加载之后的内容"""
+        scroll_bar = self.log_content.verticalScrollBar()
+        if value == scroll_bar.minimum():
+            self.load_older_content()
+        elif value == scroll_bar.maximum() and self.current_file and not self.following:
+            self.load_newer_content()
+    
+    def load_newer_content(self):
+        """按块加载当前位置之后的内容，到达文件末尾后恢复跟踪"""
+        size = self.file_reader.refresh()
+        text, _, end = self.file_reader.read_range(self.view_end, self.view_end + self.PAGE_BYTES)
+        if text:
+            cursor = QTextCursor(self.log_content.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(text)
+            self.view_end = end
+        
+        # 末尾未写完的行不算，跟踪时再读取
+        if self.view_end >= size or not self.file_reader.has_complete_line(self.view_end):
+            self.following = True
+        self.file_reader.release()
+    
+    def load_older_content(self):
+        """按块加载当前文件中更早的内容"""
+        if not self.current_file or self.view_start <= 0:
+            return
+        
+        # 单行超过块大小时扩大读取范围，直到读到完整的行
+        page = self.PAGE_BYTES
+        text = ""
+        start = self.view_start
+        while not text and start > 0:
+            text, start, _ = self.file_reader.read_range(max(0, self.view_start - page), self.view_start)
+            page *= 2
+        self.file_reader.release()
+        
+        if not text:
+            return
+        
+        scroll_bar = self.log_content.verticalScrollBar()
+        old_maximum = scroll_bar.maximum()
+        old_value = scroll_bar.value()
+        
+        cursor = QTextCursor(self.log_content.document())
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText(text)
+        self.view_start = start
+        
+        # 保持原来的阅读位置
+        scroll_bar.setValue(old_value + scroll_bar.maximum() - old_maximum)
+    
+    def scroll_to_bottom(self):
+        """滚动到底部"""
         cursor = self.log_content.textCursor()
         cursor.movePosition(QTextCursor.End)
         self.log_content.setTextCursor(cursor)
     
+    def get_log_source(self):
+        """获取符合当前筛选条件的日志迭代器（最新的在前）"""
+        level = self.level_combo.currentData()
+        cutoff = self.get_date_cutoff()
+        text = self.search_edit.text().strip()
+        
+        if self.logger.log_store is not None:
+            # 启用日志数据库时，在全部保留历史上执行索引查询
+            return self.logger.log_store.iter_logs(level=level, start=cutoff, text=text or None)
+        
+        # 级别和日期筛选直接使用缓存中按时间有序的级别视图
+        entries = reversed(self.logger.log_cache.snapshot(level, since=cutoff))
+        if text:
+            text = text.lower()
+            entries = (entry for entry in entries if text in entry.get('message', '').lower())
+        
+        return entries
+    
+    def count_filtered_logs(self):
+        """统计符合筛选条件的日志数量，无法直接得到时返回 None"""
+        level = self.level_combo.currentData()
+        cutoff = self.get_date_cutoff()
+        text = self.search_edit.text().strip()
+        
+        if self.logger.log_store is not None:
+            return self.logger.log_store.count_logs(level=level, start=cutoff, text=text or None)
+        if text:
+            return self.log_model.rowCount() if self.log_model.is_exhausted() else None
+        if cutoff:
+            return len(self.logger.log_cache.snapshot(level, since=cutoff))
+        return self.logger.log_cache.count(level)
+    
+    def get_date_cutoff(self):
+        """获取日期筛选的起始时间（ISO格式），全部时返回 None"""
+        days = self.date_combo.currentData()
+        if days < 0:
+            return None
+        
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight - timedelta(days=days)).isoformat()
+    
+    def on_log_rows_loaded(self):
+        """列表分页加载后更新统计（总数未知时显示已加载数量）"""
+        if self.filtered_count is None:
+            self.update_stats(None)
+    
+    def start_file_search(self):
+        """在全部日志文件中搜索"""
+        text = self.search_edit.text().strip()
+        if not text:
+            QMessageBox.information(self, "提示", "请输入要搜索的内容")
+            return
+        
+        try:
+            pattern = compile_search_pattern(text, use_regex=self.regex_checkbox.isChecked())
+        except re.error as e:
+            QMessageBox.warning(self, "错误", f"正则表达式无效: {e}")
+            return
+        
+        self.cancel_file_search()
+        self.stop_following()
+        
+        self.result_model.clear()
+        self.log_stack.setCurrentWidget(self.result_list)
+        self.search_progress.setValue(0)
+        self.search_progress.show()
+        self.cancel_search_button.show()
+        self.stats_label.setText("正在搜索...")
+        
+        # 先写完日志队列，使当前日志文件包含最新内容
+        self.logger.flush()
+        
+        self.search_worker = LogSearchWorker(list_log_files(self.log_dir), pattern)
+        self.search_worker.matches.connect(self.on_search_matches)
+        self.search_worker.progress.connect(self.search_progress.setValue)
+        self.search_worker.completed.connect(self.on_search_finished)
+        self.search_worker.failed.connect(self.on_search_failed)
+        self.search_worker.start()
+    
+    def cancel_file_search(self):
+        """停止正在进行的搜索"""
+        if self.search_worker is not None and self.search_worker.isRunning():
+            self.search_worker.requestInterruption()
+            self.search_worker.wait()
+        self.search_worker = None
+        self.search_progress.hide()
+        self.cancel_search_button.hide()
+    
+    def on_search_matches(self, matches):
+        """搜索结果分批到达"""
+        if self.sender() is not self.search_worker:
+            return
+        self.result_model.add_results(matches)
+        self.stats_label.setText(f"正在搜索... 已找到 {self.result_model.rowCount()} 条")
+    
+    def on_search_finished(self, count):
+        """搜索完成"""
+        if self.sender() is not self.search_worker:
+            return
+        # 结果信号在 run() 返回前发出，等线程结束后再释放，否则线程对象会在运行中被销毁
+        self.search_worker.wait()
+        self.search_worker = None
+        self.search_progress.hide()
+        self.cancel_search_button.hide()
+        self.stats_label.setText(f"搜索完成: 找到 {count} 条")
+    
+    def on_search_failed(self, message):
+        """搜索失败"""
+        if self.sender() is not self.search_worker:
+            return
+        self.cancel_file_search()
+        QMessageBox.critical(self, "错误", f"搜索日志失败: {message}")
+    
+    def open_search_result(self, index):
+        """打开搜索结果所在的文件位置"""
+        result = index.data(Qt.UserRole)
+        if not result:
+            return
+        
+        path, line_number = result
+        try:
+            self.show_file_at_line(path, line_number)
+        except Exception as e:
+            self.show_message(f"读取文件失败: {str(e)}")
+    
+    def show_file_at_line(self, path, line_number):
+        """显示文件中指定行附近的内容并定位到该行"""
+        self.open_file(path, lambda reader: self.show_reader_at_line(reader, line_number), line_number)
+    
+    def show_reader_at_line(self, reader, line_number):
+        """显示读取器中指定行附近的内容并选中该行"""
+        path = reader.path
+        # 通过稀疏行索引跳转，只读取目标行附近的字节范围
+        offset = reader.line_offset(line_number - 1)
+        text, start, end = reader.read_range(max(0, offset - self.PAGE_BYTES // 2),
+                                             offset + self.PAGE_BYTES // 2)
+        
+        self.log_content.setPlainText(text)
+        self.current_file = path
+        self.file_reader = reader
+        self.view_start = start
+        self.view_end = end
+        self.following = end >= reader.size
+        target_block = reader.read_bytes(start, offset).count(b'\n')
+        reader.release()
+        
+        if (self.following and self.auto_refresh_checkbox.isChecked() and not path.endswith('.gz')
+                and path not in self.file_watcher.files()):
+            self.file_watcher.addPath(path)
+        
+        self.log_stack.setCurrentWidget(self.log_content)
+        
+        # 选中目标行
+        block = self.log_content.document().findBlockByNumber(target_block)
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+        self.log_content.setTextCursor(cursor)
+        self.log_content.ensureCursorVisible()
+    
+    def show_message(self, message):
+        """在文本区域显示提示信息"""
+        self.log_content.setPlainText(message)
+        self.log_stack.setCurrentWidget(self.log_content)
+    
     def filter_logs(self):
         """筛选日志"""
         self.load_current_logs()
     
+    @timed("page_refresh_seconds", "页面刷新耗时（秒）", label="page", slot=True)
     def refresh_logs(self):
         """刷新日志"""
         self.load_logs()
@@ -380,7 +837,9 @@ class LogsPage(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
+                self.stop_following()
                 self.logger.clear_logs()
+                self.log_model.set_source(None)
                 self.log_content.clear()
                 self.load_log_files()
                 self.update_stats(0)
@@ -398,9 +857,16 @@ class LogsPage(QWidget):
             )
             
             if filename:
-                content = self.log_content.toPlainText()
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    if self.file_reader is not None:
+                        # 查看日志文件时导出整个文件，逐行读取不载入内存
+                        for line in self.file_reader.iter_lines():
+                            f.write(line + '\n')
+                        self.file_reader.release()
+                    else:
+                        # 导出符合当前筛选条件的全部日志，而不只是已加载的部分
+                        for entry in reversed(list(self.get_log_source())):
+                            f.write(format_log_entry(entry) + '\n')
                 
                 QMessageBox.information(self, "成功", f"日志已导出到: {filename}")
                 
@@ -415,16 +881,27 @@ class LogsPage(QWidget):
             self.stop_auto_refresh()
     
     def start_auto_refresh(self):
-        """开始自动刷新"""
-        self.auto_refresh_timer.start(30000)  # 30秒刷新一次
+        """开始自动刷新：监视日志目录和当前跟踪的文件"""
+        if os.path.isdir(self.log_dir) and self.log_dir not in self.file_watcher.directories():
+            self.file_watcher.addPath(self.log_dir)
+        for file_path in (self.logger.log_file, self.current_file):
+            if file_path and os.path.exists(file_path) and file_path not in self.file_watcher.files():
+                self.file_watcher.addPath(file_path)
     
     def stop_auto_refresh(self):
         """停止自动刷新"""
+        paths = self.file_watcher.files() + self.file_watcher.directories()
+        if paths:
+            self.file_watcher.removePaths(paths)
         self.auto_refresh_timer.stop()
+        self.files_refresh_timer.stop()
     
     def update_stats(self, count):
         """更新统计信息"""
-        self.stats_label.setText(f"总计: {count} 条日志")
+        if count is None:
+            self.stats_label.setText(f"已加载: {self.log_model.rowCount()} 条日志（滚动加载更多）")
+        else:
+            self.stats_label.setText(f"总计: {count} 条日志")
     
     def apply_styles(self):
         """应用样式"""
@@ -475,6 +952,12 @@ class LogsPage(QWidget):
                 border-left: 4px solid #1976d2;
             }
             
+            QListView#logList {
+                border: 2px solid #e9ecef;
+                border-radius: 6px;
+                background-color: #fafafa;
+            }
+            
             QTextEdit {
                 border: 2px solid #e9ecef;
                 border-radius: 6px;
@@ -528,6 +1011,13 @@ class LogsPage(QWidget):
                 background-color: white;
             }
             
+            QLineEdit {
+                border: 1px solid #dee2e6;
+                border-radius: 4px;
+                padding: 5px 10px;
+                background-color: white;
+            }
+            
             QGroupBox {
                 font-weight: bold;
                 border: 2px solid #e9ecef;
@@ -1,24 +1,33 @@
 """
 主窗口
 """
+import os
+
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout,
     QStackedWidget, QStatusBar, QMessageBox,
-    QLabel
+    QLabel, QFileDialog, QApplication, QDialog
 )
-from PySide6.QtCore import QTimer
-from PySide6.QtGui import QAction
+from PySide6.QtCore import Qt, QTimer, QUrl
+from PySide6.QtGui import QAction, QKeySequence, QDesktopServices
 
-from models.database import DatabaseManager
+from models.database import get_database_manager
+from models.repository import AccountRepository
 from utils.config import get_config_manager
-from utils.encryption import get_encryption_manager
+from utils.encryption import EncryptionManager, get_encryption_manager, set_master_password
+from utils.tracing import traced
+from utils.profiling import get_profiler
 from ui.styles import get_theme_style
 from ui.sidebar_navigation import SidebarNavigation
 from ui.account_page import AccountPage
 from ui.home_page import HomePage
 from ui.logs_page import LogsPage
+from ui.diagnostics_page import DiagnosticsPage
 from ui.settings_page import SettingsPage
 from ui.cursor_enhanced_page import CursorEnhancedPage
+from ui.workers import RekeyWorker, BreachScanWorker, TaskWorker
+from ui.master_password_dialog import ChangeMasterPasswordDialog
+from ui.stall_watchdog import get_stall_watchdog
 
 
 
@@ -27,9 +36,10 @@ from ui.cursor_enhanced_page import CursorEnhancedPage
 class MainWindow(QMainWindow):
     """主窗口"""
     
-    def __init__(self):
+    def __init__(self, db_manager: AccountRepository = None):
         super().__init__()
-        self.db_manager = DatabaseManager()
+        # 账号存储由配置选择，也可以直接注入（如测试和基准测试中使用内存存储）
+        self.db_manager = db_manager or get_database_manager()
         self.config_manager = get_config_manager()
         self.encryption_manager = get_encryption_manager()
         # self.session_manager = get_session_manager()  # 暂时禁用
@@ -57,6 +67,20 @@ class MainWindow(QMainWindow):
         self.refresh_timer.timeout.connect(self.refresh_current_page)
         self.refresh_timer.start(30000)  # 30秒刷新一次
 
+        # 后台加密旧版明文账号、处理主密钥轮换后的数据密钥更新
+        self.rekey_worker = None
+        self.start_rekey_worker()
+        self.master_password_worker = None
+
+        # 已配置泄露密码库时，后台检查尚未检查过的密码
+        self.breach_worker = None
+        if self.config_manager.get('security.breach_hash_file'):
+            self.start_breach_scan(only_unchecked=True, interactive=False)
+
+        # 监视主线程卡顿，记录卡顿时的调用栈
+        if self.config_manager.get('diagnostics.stall_watchdog', True):
+            get_stall_watchdog().start()
+
     # 登录功能暂时禁用（开发阶段）
     # def show_login_dialog(self) -> bool:
     #     """显示登录对话框"""
@@ -89,14 +113,14 @@ class MainWindow(QMainWindow):
     def create_pages(self):
         """创建所有页面"""
         # 创建首页
-        home_page = HomePage()
+        home_page = HomePage(db_manager=self.db_manager)
         home_page.tool_selected.connect(self.switch_page)
         self.pages["home"] = home_page
         self.page_stack.addWidget(home_page)
 
         # 创建工具页面
         # Cursor使用增强页面
-        cursor_page = CursorEnhancedPage()
+        cursor_page = CursorEnhancedPage(db_manager=self.db_manager)
         self.pages["cursor"] = cursor_page
         self.page_stack.addWidget(cursor_page)
 
@@ -107,7 +131,7 @@ class MainWindow(QMainWindow):
         ]
 
         for page_id, _ in other_page_configs:
-            page = AccountPage(page_id)
+            page = AccountPage(page_id, db_manager=self.db_manager)
             self.pages[page_id] = page
             self.page_stack.addWidget(page)
 
@@ -117,6 +141,11 @@ class MainWindow(QMainWindow):
         self.pages["logs"] = logs_page
         self.page_stack.addWidget(logs_page)
 
+        # 诊断页面
+        diagnostics_page = DiagnosticsPage()
+        self.pages["diagnostics"] = diagnostics_page
+        self.page_stack.addWidget(diagnostics_page)
+
         # 设置页面
         settings_page = SettingsPage()
         settings_page.settings_changed.connect(self.on_settings_changed)
@@ -155,9 +184,50 @@ class MainWindow(QMainWindow):
         refresh_action.triggered.connect(self.refresh_current_page)
         view_menu.addAction(refresh_action)
 
+        # 工具菜单
+        tools_menu = menubar.addMenu("工具")
+
+        breach_action = QAction("检查泄露密码...", self)
+        breach_action.triggered.connect(lambda: self.start_breach_scan(only_unchecked=False))
+        tools_menu.addAction(breach_action)
+
+        master_password_action = QAction("修改主密码...", self)
+        master_password_action.triggered.connect(self.show_change_master_password)
+        tools_menu.addAction(master_password_action)
+
         # 帮助菜单
         help_menu = menubar.addMenu("帮助")
 
+        # 性能分析：运行中按需开启，结果写入诊断文件夹
+        profiling_menu = help_menu.addMenu("性能分析")
+
+        self.profile_action = QAction("开始 CPU 分析", self)
+        self.profile_action.setShortcut(QKeySequence("Ctrl+Shift+P"))
+        self.profile_action.triggered.connect(self.toggle_cpu_profile)
+        profiling_menu.addAction(self.profile_action)
+
+        memory_snapshot_action = QAction("拍摄内存快照", self)
+        memory_snapshot_action.setShortcut(QKeySequence("Ctrl+Shift+M"))
+        memory_snapshot_action.triggered.connect(self.take_memory_snapshot)
+        profiling_menu.addAction(memory_snapshot_action)
+
+        self.stop_memory_action = QAction("停止内存跟踪", self)
+        self.stop_memory_action.setEnabled(False)
+        self.stop_memory_action.triggered.connect(self.stop_memory_tracing)
+        profiling_menu.addAction(self.stop_memory_action)
+
+        profiling_menu.addSeparator()
+
+        bundle_action = QAction("导出诊断包", self)
+        bundle_action.triggered.connect(self.pages["diagnostics"].export_bundle)
+        profiling_menu.addAction(bundle_action)
+
+        open_diagnostics_action = QAction("打开诊断文件夹", self)
+        open_diagnostics_action.triggered.connect(self.open_diagnostics_folder)
+        profiling_menu.addAction(open_diagnostics_action)
+
+        help_menu.addSeparator()
+
         about_action = QAction("关于", self)
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
@@ -178,6 +248,7 @@ class MainWindow(QMainWindow):
         # 侧边导航连接
         self.sidebar.page_changed.connect(self.switch_page)
 
+    @traced(category="ui")
     def switch_page(self, page_id: str):
         """切换页面"""
         if page_id in self.pages:
@@ -193,6 +264,9 @@ class MainWindow(QMainWindow):
                 self.status_label.setText("当前页面: 日志")
                 # 刷新日志数据
                 page.refresh_logs()
+            elif page_id == "diagnostics":
+                self.status_label.setText("当前页面: 诊断")
+                page.refresh_metrics()
             elif page_id == "settings":
                 self.status_label.setText("当前页面: 设置")
                 # 加载设置数据
@@ -207,8 +281,8 @@ class MainWindow(QMainWindow):
                 # 刷新页面数据
                 page.refresh_accounts()
 
-            # 更新侧边导航选择状态
-            self.sidebar.select_page(page_id)
+            # 更新侧边导航选择状态（不再发出信号，避免同一页面刷新两次）
+            self.sidebar.select_page(page_id, emit=False)
 
     def refresh_current_page(self):
         """刷新当前页面"""
@@ -219,6 +293,8 @@ class MainWindow(QMainWindow):
             current_widget.refresh_data()
         elif isinstance(current_widget, LogsPage):
             current_widget.refresh_logs()
+        elif isinstance(current_widget, DiagnosticsPage):
+            current_widget.refresh_metrics()
         elif isinstance(current_widget, SettingsPage):
             current_widget.load_settings()
         elif isinstance(current_widget, CursorEnhancedPage):
@@ -248,6 +324,126 @@ class MainWindow(QMainWindow):
         style = get_theme_style(theme)
         self.setStyleSheet(style)
 
+    def start_rekey_worker(self):
+        """启动数据密钥重新加密后台任务"""
+        if self.rekey_worker is not None and self.rekey_worker.isRunning():
+            return
+
+        self.rekey_worker = RekeyWorker(self.db_manager)
+        self.rekey_worker.completed.connect(self.on_rekey_finished)
+        self.rekey_worker.start()
+
+    def on_rekey_finished(self, total: int):
+        """数据密钥重新加密完成"""
+        if total > 0:
+            from utils.logger import get_logger
+            get_logger().info(f"已重新加密 {total} 个账号的敏感字段")
+
+    def start_breach_scan(self, only_unchecked: bool = False, interactive: bool = True):
+        """启动泄露密码后台扫描"""
+        if self.breach_worker is not None and self.breach_worker.isRunning():
+            self.status_label.setText("泄露密码检查正在进行中...")
+            return
+
+        hash_file = self.config_manager.get('security.breach_hash_file')
+        if interactive:
+            filename, _ = QFileDialog.getOpenFileName(
+                self, "选择泄露密码库（按哈希排序的SHA-1文件）",
+                hash_file or "",
+                "文本文件 (*.txt);;所有文件 (*)"
+            )
+            if not filename:
+                return
+            hash_file = filename
+            self.config_manager.set('security.breach_hash_file', hash_file)
+
+        self.breach_worker = BreachScanWorker(self.db_manager, hash_file, only_unchecked)
+        self.breach_worker.progress.connect(
+            lambda done, total: self.status_label.setText(f"正在检查泄露密码: {done}/{total}")
+        )
+        self.breach_worker.completed.connect(lambda results: self.on_breach_scan_finished(results, interactive))
+        self.breach_worker.cancelled.connect(
+            lambda done: self.status_label.setText(f"泄露密码检查已取消: 已检查 {done} 个密码")
+        )
+        self.breach_worker.failed.connect(lambda error: self.on_breach_scan_failed(error, interactive))
+        self.breach_worker.start()
+
+    def on_breach_scan_finished(self, results: dict, interactive: bool):
+        """泄露密码扫描完成"""
+        breached = sum(1 for count in results.values() if count)
+        self.status_label.setText(f"泄露密码检查完成: {len(results)} 个密码，{breached} 个已泄露")
+        self.refresh_current_page()
+
+        if interactive:
+            if breached:
+                QMessageBox.warning(
+                    self, "发现泄露密码",
+                    f"共检查 {len(results)} 个密码，其中 {breached} 个出现在泄露密码库中。\n\n"
+                    "请在账号列表的“密码泄露”列查看并尽快修改。"
+                )
+            else:
+                QMessageBox.information(self, "检查完成", f"共检查 {len(results)} 个密码，未发现泄露。")
+
+    def on_breach_scan_failed(self, error: str, interactive: bool):
+        """泄露密码扫描失败"""
+        self.status_label.setText("泄露密码检查失败")
+        if interactive:
+            QMessageBox.critical(self, "错误", f"泄露密码检查失败: {error}")
+
+    def show_change_master_password(self):
+        """显示修改主密码对话框"""
+        if self.master_password_worker is not None and self.master_password_worker.isRunning():
+            return
+
+        dialog = ChangeMasterPasswordDialog(self.db_manager, self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+
+        # 正在进行的重新加密仍使用旧主密钥，先停止，轮换后重新启动
+        if self.rekey_worker is not None and self.rekey_worker.isRunning():
+            self.rekey_worker.requestInterruption()
+            self.rekey_worker.wait()
+
+        # 密钥派生和轮换在后台线程执行，完成前禁用窗口，避免轮换期间修改账号
+        self.master_password_worker = TaskWorker(
+            self.change_master_password, dialog.current_password, dialog.new_password
+        )
+        self.master_password_worker.completed.connect(self.on_master_password_changed)
+        self.master_password_worker.failed.connect(self.on_master_password_failed)
+        self.setEnabled(False)
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        self.status_label.setText("正在修改主密码...")
+        self.master_password_worker.start()
+
+    def change_master_password(self, current_password: str, password: str):
+        """后台线程：校验当前主密码，然后重新包装数据密钥表（数据本身由重新加密任务在后台处理）"""
+        params = self.db_manager.get_master_key_params()
+        if params is not None:
+            salt, key_check = params
+            if not EncryptionManager(current_password, salt).verify_key_check(key_check):
+                raise ValueError("当前主密码错误")
+        set_master_password(password, self.db_manager)
+
+    def on_master_password_changed(self, _result):
+        """主密码修改完成"""
+        self.encryption_manager = get_encryption_manager()
+        self._finish_master_password_change()
+        self.status_label.setText("主密码已修改")
+        QMessageBox.information(self, "成功", "主密码已修改，下次启动时请使用新主密码解锁")
+
+    def on_master_password_failed(self, error: str):
+        """主密码修改失败（轮换在事务中进行，失败时数据保持不变）"""
+        print(f"修改主密码失败: {error}")
+        self._finish_master_password_change()
+        self.status_label.setText("主密码修改失败")
+        QMessageBox.critical(self, "错误", f"修改主密码失败: {error}")
+
+    def _finish_master_password_change(self):
+        """恢复窗口并重新启动数据密钥重新加密任务"""
+        QApplication.restoreOverrideCursor()
+        self.setEnabled(True)
+        self.start_rekey_worker()
+
     def import_accounts(self):
         """导入账号"""
         QMessageBox.information(self, "提示", "导入功能正在开发中...")
@@ -256,6 +452,66 @@ class MainWindow(QMainWindow):
         """导出账号"""
         QMessageBox.information(self, "提示", "导出功能正在开发中...")
 
+    def toggle_cpu_profile(self):
+        """开始或停止 CPU 分析"""
+        profiler = get_profiler()
+        if not profiler.is_profiling():
+            profiler.start_profile()
+            self.profile_action.setText("停止 CPU 分析并保存")
+            self.status_label.setText("CPU 分析中... 再次按 Ctrl+Shift+P 停止")
+            return
+
+        self.profile_action.setText("开始 CPU 分析")
+        try:
+            files = profiler.stop_profile()
+        except Exception as e:
+            print(f"保存CPU分析结果失败: {e}")
+            QMessageBox.critical(self, "错误", f"保存CPU分析结果失败: {str(e)}")
+            return
+
+        self.status_label.setText(f"CPU 分析已保存: {files['pstats']}")
+        QMessageBox.information(
+            self, "CPU 分析完成",
+            f"pstats 文件: {files['pstats']}\n"
+            f"折叠栈（火焰图）: {files['collapsed']}\n"
+            f"耗时排行: {files['summary']}"
+        )
+
+    def take_memory_snapshot(self):
+        """拍摄内存快照，与上一次快照比较"""
+        try:
+            files = get_profiler().take_memory_snapshot()
+        except Exception as e:
+            print(f"拍摄内存快照失败: {e}")
+            QMessageBox.critical(self, "错误", f"拍摄内存快照失败: {str(e)}")
+            return
+
+        self.stop_memory_action.setEnabled(True)
+        self.status_label.setText(f"内存快照已保存: {files['snapshot']}")
+        if 'diff' in files:
+            QMessageBox.information(
+                self, "内存快照",
+                f"快照文件: {files['snapshot']}\n分配增长排行: {files['diff']}"
+            )
+        else:
+            QMessageBox.information(
+                self, "内存快照",
+                f"已开始跟踪内存分配，首个快照: {files['snapshot']}\n"
+                "执行要分析的操作后再次拍摄快照，即可得到两次快照之间的分配增长排行。"
+            )
+
+    def stop_memory_tracing(self):
+        """停止内存跟踪"""
+        get_profiler().stop_memory_tracing()
+        self.stop_memory_action.setEnabled(False)
+        self.status_label.setText("已停止内存跟踪")
+
+    def open_diagnostics_folder(self):
+        """在文件管理器中打开诊断文件夹"""
+        output_dir = get_profiler().output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(output_dir)))
+
     def show_about(self):
         """显示关于对话框"""
         QMessageBox.about(
@@ -284,4 +540,31 @@ class MainWindow(QMainWindow):
             geometry.width(), geometry.height()
         )
 
+        # 等待正在进行的主密钥轮换完成
+        if self.master_password_worker is not None:
+            self.master_password_worker.wait()
+
+        # 停止后台任务（未完成的部分下次启动继续）
+        for worker in (self.rekey_worker, self.breach_worker):
+            if worker is not None and worker.isRunning():
+                worker.requestInterruption()
+                worker.wait()
+
+        # 停止日志搜索、归档解压和卡顿监视
+        self.pages["logs"].cancel_file_search()
+        self.pages["logs"].cancel_open_file()
+        get_stall_watchdog().stop()
+
+        # 退出时仍在进行的 CPU 分析直接保存
+        profiler = get_profiler()
+        if profiler.is_profiling():
+            try:
+                profiler.stop_profile()
+            except Exception as e:
+                print(f"保存CPU分析结果失败: {e}")
+
+        # 写完日志队列中剩余的日志
+        from utils.logger import get_logger
+        get_logger().flush()
+
         event.accept()
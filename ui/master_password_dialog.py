@@ -0,0 +1,111 @@
+"""
+主密码对话框
+
+unlock_vault() 在启动时提示输入主密码并用数据库中保存的校验值验证，
+ChangeMasterPasswordDialog 用于输入当前和新的主密码（校验当前主密码和轮换在后台线程进行）。
+"""
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
+    QLineEdit, QPushButton, QLabel, QInputDialog, QMessageBox
+)
+
+from models.repository import AccountRepository
+from utils.encryption import unlock_master_password
+
+# 主密码最小长度
+MIN_MASTER_PASSWORD_LENGTH = 8
+
+
+def unlock_vault(db_manager: AccountRepository, parent=None) -> bool:
+    """
+    解锁账号数据
+
+    未设置主密码时直接返回 True；否则反复提示输入主密码直到校验通过。
+
+    Returns:
+        是否已解锁（用户取消时返回 False）
+    """
+    params = db_manager.get_master_key_params()
+    if params is None:
+        return True
+
+    salt, key_check = params
+    while True:
+        password, ok = QInputDialog.getText(
+            parent, "解锁", "请输入主密码:", QLineEdit.Password
+        )
+        if not ok:
+            return False
+        if unlock_master_password(password, salt, key_check):
+            return True
+        QMessageBox.warning(parent, "解锁失败", "主密码错误，请重试")
+
+
+class ChangeMasterPasswordDialog(QDialog):
+    """修改主密码对话框"""
+
+    def __init__(self, db_manager: AccountRepository, parent=None):
+        super().__init__(parent)
+        self.params = db_manager.get_master_key_params()
+        self.current_password = ""
+        self.new_password = ""
+
+        self.setWindowTitle("修改主密码")
+        self.setModal(True)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """设置UI"""
+        layout = QVBoxLayout(self)
+
+        hint_label = QLabel(
+            "主密码用于保护所有账号的密码和 API 密钥，每次启动时需要输入。\n"
+            "主密码丢失后已保存的数据将无法恢复，请妥善保管。"
+        )
+        hint_label.setWordWrap(True)
+        layout.addWidget(hint_label)
+
+        form_layout = QFormLayout()
+        self.current_edit = QLineEdit()
+        self.current_edit.setEchoMode(QLineEdit.Password)
+        if self.params is not None:
+            form_layout.addRow("当前主密码:", self.current_edit)
+
+        self.new_edit = QLineEdit()
+        self.new_edit.setEchoMode(QLineEdit.Password)
+        self.new_edit.setPlaceholderText(f"至少 {MIN_MASTER_PASSWORD_LENGTH} 个字符")
+        form_layout.addRow("新主密码:", self.new_edit)
+
+        self.confirm_edit = QLineEdit()
+        self.confirm_edit.setEchoMode(QLineEdit.Password)
+        form_layout.addRow("确认新主密码:", self.confirm_edit)
+        layout.addLayout(form_layout)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        cancel_button = QPushButton("取消")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_button)
+        ok_button = QPushButton("确定")
+        ok_button.setDefault(True)
+        ok_button.clicked.connect(self.accept)
+        button_layout.addWidget(ok_button)
+        layout.addLayout(button_layout)
+
+    def accept(self):
+        """校验输入后关闭"""
+        if self.params is not None and not self.current_edit.text():
+            QMessageBox.warning(self, "警告", "请输入当前主密码")
+            return
+
+        password = self.new_edit.text()
+        if len(password) < MIN_MASTER_PASSWORD_LENGTH:
+            QMessageBox.warning(self, "警告", f"新主密码至少需要 {MIN_MASTER_PASSWORD_LENGTH} 个字符")
+            return
+        if password != self.confirm_edit.text():
+            QMessageBox.warning(self, "警告", "两次输入的新主密码不一致")
+            return
+
+        self.current_password = self.current_edit.text()
+        self.new_password = password
+        super().accept()
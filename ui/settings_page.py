@@ -12,6 +12,7 @@ from PySide6.QtGui import QFont
 
 from utils.config import get_config_manager
 from utils.logger import get_logger
+from utils.metrics import timed
 
 
 class SettingsPage(QWidget):
@@ -461,6 +462,7 @@ class SettingsPage(QWidget):
         # 日志操作
         self.browse_log_button.clicked.connect(self.browse_log_directory)
     
+    @timed("page_refresh_seconds", "页面刷新耗时（秒）", label="page", slot=True)
     def load_settings(self):
         """加载设置"""
         try:
@@ -548,6 +550,9 @@ class SettingsPage(QWidget):
             # 保存配置
             self.config_manager.save_config()
             
+            # 日志级别立即生效，无需重启
+            self.logger.set_level(self.log_level_combo.currentText())
+            
             self.logger.info("设置已应用")
             QMessageBox.information(self, "成功", "设置已保存并应用")
             
@@ -571,6 +576,7 @@ class SettingsPage(QWidget):
             try:
                 self.config_manager.reset_to_defaults()
                 self.load_settings()
+                self.logger.set_level(self.log_level_combo.currentText())
                 self.logger.info("设置已重置为默认值")
                 QMessageBox.information(self, "成功", "设置已重置为默认值")
             except Exception as e:
@@ -111,6 +111,12 @@ class SidebarNavigation(QWidget):
         )
         nav_layout.addWidget(logs_btn)
 
+        # 诊断页面
+        diagnostics_btn = self.create_nav_button(
+            "diagnostics", "诊断", "运行指标和性能数据", "📈"
+        )
+        nav_layout.addWidget(diagnostics_btn)
+
         # 设置页面
         settings_btn = self.create_nav_button(
             "settings", "设置", "应用程序配置和偏好设置", "⚙️"
@@ -192,8 +198,14 @@ class SidebarNavigation(QWidget):
         
         return button
     
-    def select_page(self, page_id):
-        """选择页面"""
+    def select_page(self, page_id, emit: bool = True):
+        """
+        选择页面
+
+        Args:
+            page_id: 页面ID
+            emit: 是否发出 page_changed 信号；由主窗口切换页面后同步选中状态时为 False
+        """
         if self.current_page == page_id:
             return
         
@@ -207,7 +219,8 @@ class SidebarNavigation(QWidget):
             button.style().polish(button)
         
         self.current_page = page_id
-        self.page_changed.emit(page_id)
+        if emit:
+            self.page_changed.emit(page_id)
     
     def get_current_page(self):
         """获取当前页面"""
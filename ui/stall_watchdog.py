@@ -0,0 +1,201 @@
+"""
+界面卡顿监视
+
+主线程的 QTimer 定时记录心跳，后台线程检查心跳是否超时；
+超时期间对主线程的 Python 调用栈采样，心跳恢复后记录卡顿时长和调用位置，
+并按调用位置汇总，便于找出需要移出主线程的处理函数。
+"""
+import os
+import sys
+import time
+import threading
+import traceback
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Qt
+
+from utils.config import get_config_manager
+from utils.logger import get_logger
+from utils.metrics import get_metrics
+
+
+# 项目根目录，用于在调用栈中定位项目自身的代码
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 定位调用位置时跳过的文件：程序入口及计时/跟踪装饰器
+IGNORED_FILES = {
+    os.path.join(PROJECT_ROOT, 'main.py'),
+    os.path.join(PROJECT_ROOT, 'run.py'),
+    os.path.join(PROJECT_ROOT, 'utils', 'metrics.py'),
+    os.path.join(PROJECT_ROOT, 'utils', 'tracing.py'),
+}
+
+
+def summarize_stack(stack: traceback.StackSummary) -> Tuple[str, str]:
+    """
+    从调用栈中找出处理函数和卡顿位置
+
+    Returns:
+        (处理函数, 卡顿位置)：分别是栈中最外层和最内层的项目代码帧，
+        格式为 "相对路径:行号 函数名"
+    """
+    project_frames = [
+        frame for frame in stack
+        if frame.filename.startswith(PROJECT_ROOT) and frame.filename not in IGNORED_FILES
+    ]
+    if not project_frames:
+        frame = stack[-1] if stack else None
+        location = f"{frame.filename}:{frame.lineno} {frame.name}" if frame else "未知"
+        return location, location
+
+    def describe(frame):
+        return f"{os.path.relpath(frame.filename, PROJECT_ROOT)}:{frame.lineno} {frame.name}"
+
+    return describe(project_frames[0]), describe(project_frames[-1])
+
+
+class StallWatchdog(QObject):
+    """界面卡顿监视器"""
+
+    def __init__(self, threshold_ms: int = 100, interval_ms: int = 50, parent=None):
+        """
+        初始化监视器
+
+        Args:
+            threshold_ms: 心跳晚到超过该毫秒数视为卡顿
+            interval_ms: 心跳间隔（毫秒）
+        """
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.logger = get_logger()
+        self.stall_histogram = get_metrics().histogram("ui_stall_seconds", "界面事件循环卡顿时长（秒）")
+
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.monotonic()
+        self._lock = threading.Lock()
+        self._samples: List[traceback.StackSummary] = []
+        self._stop_event = threading.Event()
+        self._monitor = None
+
+        # 按 (处理函数, 卡顿位置) 汇总的卡顿记录
+        self._reports: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.setTimerType(Qt.PreciseTimer)
+        self.heartbeat_timer.setInterval(interval_ms)
+        self.heartbeat_timer.timeout.connect(self.on_heartbeat)
+
+    def start(self):
+        """开始监视（需在主线程调用）"""
+        if self._monitor is not None:
+            return
+
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="StallWatchdog", daemon=True)
+        self._monitor.start()
+        self.heartbeat_timer.start()
+
+    def stop(self):
+        """停止监视"""
+        self.heartbeat_timer.stop()
+        if self._monitor is not None:
+            self._stop_event.set()
+            self._monitor.join(1.0)
+            self._monitor = None
+
+    def is_running(self) -> bool:
+        """是否正在监视"""
+        return self._monitor is not None
+
+    def _monitor_loop(self):
+        """后台线程：心跳超时期间周期性采样主线程调用栈"""
+        # 超时达到阈值一半即开始采样，保证刚超过阈值的卡顿也至少有一次采样；
+        # 最终没有构成卡顿的采样在下次心跳时丢弃
+        sample_interval = self.threshold / 4
+        while not self._stop_event.wait(sample_interval):
+            if time.monotonic() - self._last_beat < self.interval + self.threshold / 2:
+                continue
+
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+
+            with self._lock:
+                self._samples.append(stack)
+
+    def on_heartbeat(self):
+        """主线程心跳：如果距上次心跳过久，记录刚结束的卡顿"""
+        now = time.monotonic()
+        stall = now - self._last_beat - self.interval
+        self._last_beat = now
+
+        with self._lock:
+            samples, self._samples = self._samples, []
+
+        # 没有采样到调用栈的长间隔（如系统休眠）不计为卡顿
+        if stall >= self.threshold and samples:
+            self.record_stall(stall, samples)
+
+    def record_stall(self, duration: float, samples: List[traceback.StackSummary]):
+        """
+        记录一次卡顿
+
+        Args:
+            duration: 卡顿时长（秒）
+            samples: 卡顿期间采样到的主线程调用栈
+        """
+        # 以采样次数最多的位置作为卡顿位置
+        summaries = [summarize_stack(stack) for stack in samples]
+        (handler, site), _ = Counter(summaries).most_common(1)[0]
+        stack = samples[summaries.index((handler, site))]
+        stack_text = ''.join(traceback.format_list(stack))
+
+        self.stall_histogram.observe(duration)
+
+        report = self._reports.get((handler, site))
+        if report is None:
+            report = {'handler': handler, 'site': site, 'count': 0,
+                      'total_ms': 0.0, 'max_ms': 0.0, 'stack': stack_text}
+            self._reports[(handler, site)] = report
+
+        duration_ms = duration * 1000
+        report['count'] += 1
+        report['total_ms'] += duration_ms
+        if duration_ms >= report['max_ms']:
+            report['max_ms'] = duration_ms
+            report['stack'] = stack_text
+
+        self.logger.warning(
+            "界面卡顿 %.0fms，位置: %s，处理函数: %s", duration_ms, site, handler,
+            category='ui_stall', duration_ms=round(duration_ms, 1), stack=stack_text
+        )
+
+    def get_report(self) -> List[Dict[str, Any]]:
+        """按累计卡顿时长从高到低返回汇总记录"""
+        return sorted((dict(report) for report in self._reports.values()),
+                      key=lambda report: report['total_ms'], reverse=True)
+
+    def clear_report(self):
+        """清空汇总记录"""
+        self._reports.clear()
+
+
+# 全局监视器实例
+_stall_watchdog: Optional[StallWatchdog] = None
+
+
+def get_stall_watchdog() -> StallWatchdog:
+    """获取界面卡顿监视器（阈值取自配置）"""
+    global _stall_watchdog
+    if _stall_watchdog is None:
+        config = get_config_manager()
+        _stall_watchdog = StallWatchdog(
+            threshold_ms=config.get('diagnostics.stall_threshold_ms', 100),
+            interval_ms=config.get('diagnostics.stall_heartbeat_ms', 50)
+        )
+    return _stall_watchdog
@@ -8,7 +8,7 @@ QMainWindow {
     background-color: #f5f5f5;
 }
 
-QTableWidget {
+QTableView {
     background-color: white;
     border: 1px solid #ddd;
     border-radius: 8px;
@@ -16,12 +16,12 @@ QTableWidget {
     selection-background-color: #e3f2fd;
 }
 
-QTableWidget::item {
+QTableView::item {
     padding: 8px;
     border-bottom: 1px solid #f0f0f0;
 }
 
-QTableWidget::item:selected {
+QTableView::item:selected {
     background-color: #e3f2fd;
     color: #1976d2;
 }
@@ -191,7 +191,7 @@ QMainWindow {
     color: #ffffff;
 }
 
-QTableWidget {
+QTableView {
     background-color: #3c3c3c;
     border: 1px solid #555;
     border-radius: 8px;
@@ -200,12 +200,12 @@ QTableWidget {
     color: #ffffff;
 }
 
-QTableWidget::item {
+QTableView::item {
     padding: 8px;
     border-bottom: 1px solid #555;
 }
 
-QTableWidget::item:selected {
+QTableView::item:selected {
     background-color: #4a4a4a;
     color: #ffffff;
 }
@@ -10,7 +10,8 @@ from PySide6.QtCore import Qt, Signal, QThread
 from PySide6.QtGui import QFont, QColor
 
 from models.account import Account, AccountType, AccountStatus
-from models.database import DatabaseManager
+from models.database import get_database_manager
+from models.repository import AccountRepository
 from automation.automation_manager import get_automation_manager, AutomationResult
 
 
@@ -66,10 +67,10 @@ class SwitchAccountDialog(QDialog):
     
     account_switched = Signal(object)  # Account对象
     
-    def __init__(self, current_accounts, parent=None):
+    def __init__(self, current_accounts, parent=None, db_manager: AccountRepository = None):
         super().__init__(parent)
         self.current_accounts = current_accounts
-        self.db_manager = DatabaseManager()
+        self.db_manager = db_manager or get_database_manager()
         self.worker = None
         
         self.setWindowTitle("切换Cursor账号")
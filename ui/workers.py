@@ -0,0 +1,256 @@
+"""
+后台工作线程
+"""
+import os
+import time
+from typing import Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThread, QThreadPool, Signal
+
+from models.repository import AccountRepository
+from utils.breach_check import BreachedPasswordChecker
+from utils.config import get_config_manager
+from utils.log_search import search_log_file
+
+
+class RekeyWorker(QThread):
+    """数据密钥惰性重新加密工作线程"""
+
+    progress = Signal(int)  # 已处理的账号数量
+    completed = Signal(int)  # 处理总数
+
+    def __init__(self, db_manager: AccountRepository, batch_size: int = 100):
+        super().__init__()
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+
+    def run(self):
+        total = 0
+        while not self.isInterruptionRequested():
+            count = self.db_manager.rekey_pending_accounts(self.batch_size)
+            if count == 0:
+                break
+            total += count
+            self.progress.emit(total)
+
+        self.completed.emit(total)
+
+
+class BreachScanWorker(QThread):
+    """
+    泄露密码扫描工作线程
+
+    被中断时保存已检查账号的结果（下次只检查未检查的账号时从中断处继续），
+    然后发出 cancelled 而不是 completed。
+    """
+
+    progress = Signal(int, int)  # 已检查数量, 总数
+    completed = Signal(object)  # {账号ID: 泄露次数}
+    cancelled = Signal(int)  # 中断前已检查的数量
+    failed = Signal(str)  # 错误信息
+
+    def __init__(self, db_manager: AccountRepository, hash_file: str, only_unchecked: bool = True):
+        super().__init__()
+        self.db_manager = db_manager
+        self.hash_file = hash_file
+        self.only_unchecked = only_unchecked
+
+    def run(self):
+        try:
+            candidates = self.db_manager.get_password_check_candidates(self.only_unchecked)
+            results = {}
+            with BreachedPasswordChecker(self.hash_file) as checker:
+                for index, (account_id, password) in enumerate(candidates, 1):
+                    if self.isInterruptionRequested():
+                        break
+                    results[account_id] = checker.lookup_password(password)
+                    if index % 100 == 0 or index == len(candidates):
+                        self.progress.emit(index, len(candidates))
+
+            self.db_manager.save_password_check_results(results)
+            if self.isInterruptionRequested():
+                self.cancelled.emit(len(results))
+            else:
+                self.completed.emit(results)
+
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class TaskWorker(QThread):
+    """通用后台任务线程：在后台执行函数并返回结果"""
+
+    completed = Signal(object)  # 函数返回值
+    failed = Signal(str)  # 错误信息
+
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+
+    def cancel(self):
+        """取消任务：无法中断的操作会继续执行完，但结果不再发出"""
+        self.cancelled = True
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+            if not self.cancelled:
+                self.completed.emit(result)
+        except Exception as e:
+            if not self.cancelled:
+                self.failed.emit(str(e))
+
+
+# 页面后台查询共用的线程池
+_query_pool: Optional[QThreadPool] = None
+
+
+def get_query_pool() -> QThreadPool:
+    """获取页面后台查询共用的线程池（线程数取自配置 ui.query_threads）"""
+    global _query_pool
+    if _query_pool is None:
+        _query_pool = QThreadPool()
+        _query_pool.setMaxThreadCount(max(1, get_config_manager().get('ui.query_threads', 2)))
+    return _query_pool
+
+
+class _PooledTask(QRunnable):
+    """LatestTaskRunner 提交到线程池的任务"""
+
+    def __init__(self, runner: 'LatestTaskRunner', token: int, func, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.runner = runner
+        self.token = token
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        # 开始执行前已有更新的请求时直接跳过
+        if self.runner.active_token != self.token:
+            self.runner.task_done.emit(self.token, False, None)
+            return
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.runner.task_done.emit(self.token, False, str(e))
+        else:
+            self.runner.task_done.emit(self.token, True, result)
+
+
+class LatestTaskRunner(QObject):
+    """
+    只发出最新请求结果的后台查询执行器
+
+    查询在共享线程池中执行。提交新查询时，尚未开始的旧查询从线程池队列中移除，
+    已在执行的旧查询无法中断，执行完后丢弃其结果。
+    """
+
+    completed = Signal(object)  # 最新查询的返回值
+    failed = Signal(str)  # 最新查询的错误信息
+    task_done = Signal(int, bool, object)  # 内部使用：任务序号, 是否成功, 返回值或错误信息
+
+    def __init__(self, pool: QThreadPool = None):
+        super().__init__()
+        self.pool = pool or get_query_pool()
+        self.active_token: Optional[int] = None
+        self._next_token = 0
+        self._tasks = {}
+        self.task_done.connect(self.on_task_done)
+
+    def submit(self, func, *args, **kwargs) -> int:
+        """提交查询并取消之前的查询，返回任务序号"""
+        self.cancel()
+        self._next_token += 1
+        task = _PooledTask(self, self._next_token, func, args, kwargs)
+        self._tasks[task.token] = task
+        self.active_token = task.token
+        self.pool.start(task)
+        return task.token
+
+    def cancel(self):
+        """取消当前查询：未开始的从队列中移除，执行中的结果将被丢弃"""
+        self.active_token = None
+        for token, task in list(self._tasks.items()):
+            if self.pool.tryTake(task):
+                del self._tasks[token]
+
+    def is_busy(self) -> bool:
+        """是否有尚未返回结果的查询"""
+        return self.active_token is not None
+
+    def on_task_done(self, token: int, succeeded: bool, payload):
+        """任务结束（在创建执行器的线程中调用），只发出最新查询的结果"""
+        self._tasks.pop(token, None)
+        if token != self.active_token:
+            return
+        self.active_token = None
+        if succeeded:
+            self.completed.emit(payload)
+        else:
+            self.failed.emit(payload)
+
+
+class LogSearchWorker(QThread):
+    """日志搜索工作线程：逐个文件搜索并分批发出匹配结果"""
+
+    matches = Signal(object)  # [(文件路径, 行号, 行内容), ...]
+    progress = Signal(int)  # 进度百分比
+    completed = Signal(int)  # 匹配总数
+    failed = Signal(str)  # 错误信息
+
+    # 分批发出结果的间隔（秒）和批大小
+    EMIT_INTERVAL = 0.1
+    EMIT_BATCH_SIZE = 500
+
+    def __init__(self, files, pattern, max_results: int = 100000):
+        super().__init__()
+        self.files = files
+        self.pattern = pattern
+        self.max_results = max_results
+        self._scanned = 0
+        self._total = 0
+
+    def run(self):
+        try:
+            self._total = sum(os.path.getsize(path) for path in self.files if os.path.exists(path)) or 1
+            count = 0
+            batch = []
+            last_emit = time.monotonic()
+
+            for path in self.files:
+                if self.isInterruptionRequested() or count >= self.max_results:
+                    break
+                if not os.path.exists(path):
+                    continue
+
+                for line_number, line in search_log_file(path, self.pattern,
+                                                         self.isInterruptionRequested, self._on_progress):
+                    batch.append((path, line_number, line))
+                    count += 1
+                    if count >= self.max_results:
+                        break
+
+                    if len(batch) >= self.EMIT_BATCH_SIZE or time.monotonic() - last_emit >= self.EMIT_INTERVAL:
+                        self.matches.emit(batch)
+                        batch = []
+                        last_emit = time.monotonic()
+
+                if batch:
+                    self.matches.emit(batch)
+                    batch = []
+                    last_emit = time.monotonic()
+
+            self.completed.emit(count)
+
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def _on_progress(self, scanned: int):
+        self._scanned += scanned
+        self.progress.emit(min(100, self._scanned * 100 // self._total))
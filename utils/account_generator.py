@@ -76,7 +76,7 @@ class AccountGenerator:
             
             username = f"{prefix}{suffix}"
             
-            self.logger.debug(f"生成用户名: {username}")
+            self.logger.debug("生成用户名: %s", username)
             return username
             
         except Exception as e:
@@ -97,7 +97,7 @@ class AccountGenerator:
             timestamp = str(int(time.time()))[-4:]
             email = f"{username}{timestamp}@{domain}"
 
-            self.logger.debug(f"生成邮箱: {email}")
+            self.logger.debug("生成邮箱: %s", email)
             return email
 
         except Exception as e:
@@ -145,7 +145,7 @@ class AccountGenerator:
             if config.get("include_symbols", True) and not any(c in config.get("symbols", "!@#$%^&*") for c in password):
                 password = password[:-1] + random.choice(config.get("symbols", "!@#$%^&*"))
             
-            self.logger.debug(f"生成密码: {'*' * len(password)} (长度: {len(password)})")
+            self.logger.debug("生成密码: %s (长度: %d)", '*' * len(password), len(password))
             return password
             
         except Exception as e:
@@ -157,7 +157,7 @@ class AccountGenerator:
         """生成PIN码"""
         try:
             pin = ''.join(random.choices(string.digits, k=length))
-            self.logger.debug(f"生成PIN: {pin}")
+            self.logger.debug("生成PIN: %s", pin)
             return pin
             
         except Exception as e:
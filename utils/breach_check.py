@@ -0,0 +1,102 @@
+"""
+离线泄露密码检查模块
+
+使用按哈希排序的 SHA-1 密码库文件（HIBP Pwned Passwords 格式，每行 "HASH:COUNT"），
+通过 mmap 映射文件并二分查找，不把文件读入内存。
+"""
+import hashlib
+import mmap
+from typing import Optional
+
+
+class BreachedPasswordChecker:
+    """泄露密码检查器"""
+
+    HASH_LENGTH = 40  # SHA-1 十六进制长度
+
+    def __init__(self, hash_file: str):
+        """
+        初始化检查器
+
+        Args:
+            hash_file: 按哈希升序排序的 SHA-1 密码库文件路径
+        """
+        self.hash_file = hash_file
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    def open(self):
+        """映射密码库文件"""
+        if self._mmap is not None:
+            return
+
+        self._file = open(self.hash_file, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            self._file.close()
+            self._file = None
+            raise
+
+    def close(self):
+        """取消映射并关闭文件"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def lookup_hash(self, sha1_hex: str) -> int:
+        """
+        查找 SHA-1 哈希
+
+        Args:
+            sha1_hex: 40位十六进制 SHA-1 哈希
+
+        Returns:
+            泄露次数，未出现时返回0
+        """
+        self.open()
+        mm = self._mmap
+        target = sha1_hex.upper().encode()
+        size = len(mm)
+
+        # 在字节偏移上二分，每次比较 mid 所在行的哈希
+        lo, hi = 0, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mm.rfind(b'\n', 0, mid) + 1
+            end = mm.find(b'\n', start)
+            if end == -1:
+                end = size
+
+            key = mm[start:start + self.HASH_LENGTH].upper()
+            if key < target:
+                lo = end + 1
+            elif key > target:
+                hi = start
+            else:
+                count = mm[start + self.HASH_LENGTH + 1:end].strip()
+                return int(count) if count.isdigit() else 1
+
+        return 0
+
+    def lookup_password(self, password: str) -> int:
+        """
+        查找明文密码
+
+        Returns:
+            泄露次数，未出现时返回0
+        """
+        if not password:
+            return 0
+        return self.lookup_hash(hashlib.sha1(password.encode('utf-8')).hexdigest())
@@ -43,16 +43,49 @@ class ConfigManager:
                 "y": 100
             },
             "database": {
+                "backend": "sqlite",
                 "path": "accounts.db"
             },
             "security": {
                 "auto_lock_minutes": 30,
-                "require_password": False
+                "require_password": False,
+                "password_hash_iterations": 100000
+            },
+            "logging": {
+                "level": "INFO",
+                "cache_size": 1000,
+                "queue_size": 10000,
+                "batch_size": 256,
+                "flush_interval_ms": 100,
+                "overflow_policy": "drop_oldest",
+                "sqlite_store": False,
+                "sqlite_max_entries": 100000,
+                "max_file_mb": 10,
+                "rotate_daily": True,
+                "compress_archives": True,
+                "retention_days": 14,
+                "max_total_mb": 200
+            },
+            "diagnostics": {
+                "stall_watchdog": True,
+                "stall_threshold_ms": 100,
+                "stall_heartbeat_ms": 50,
+                "output_dir": "diagnostics",
+                "profile_top_n": 30,
+                "tracemalloc_frames": 25,
+                "slow_query_ms": 50,
+                "log_tail_kb": 256
+            },
+            "tracing": {
+                "enabled": False,
+                "max_events": 200000
             },
             "ui": {
                 "theme": "light",
                 "language": "zh_CN",
-                "show_sensitive_data": False
+                "show_sensitive_data": False,
+                "search_debounce_ms": 250,
+                "query_threads": 2
             },
             "backup": {
                 "auto_backup": True,
@@ -0,0 +1,199 @@
+"""
+诊断包导出模块
+
+把排查性能问题所需的数据打包为一个 zip 文件：数据库统计、脱敏后的配置、
+指标快照、最近的慢数据库调用、界面卡顿记录和日志末尾。
+配置和日志中的密码、密钥、邮箱等敏感信息在写入前脱敏。
+"""
+import os
+import re
+import sys
+import json
+import sqlite3
+import zipfile
+import platform
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+# 键名匹配时整体替换值的配置项
+SENSITIVE_KEY_PATTERN = re.compile(
+    r'pass|secret|token|key|pin|auth|cookie|credential|email|mail|domain|user',
+    re.IGNORECASE
+)
+
+REDACTED = '***'
+
+# 文本中需要替换的敏感内容：邮箱地址以及 key=value / key: value 形式的密码、密钥
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+SECRET_ASSIGNMENT_PATTERN = re.compile(
+    r'((?:password|passwd|pwd|secret|token|api_key|apikey|pin)["\']?\s*[:=]\s*["\']?)([^\s"\',}]+)',
+    re.IGNORECASE
+)
+
+
+def redact_config(value: Any, key: str = '') -> Any:
+    """
+    递归脱敏配置
+
+    Args:
+        value: 配置值
+        key: 配置项键名，键名看起来敏感时整体替换非空的值
+
+    Returns:
+        脱敏后的副本
+    """
+    if isinstance(value, dict):
+        return {k: redact_config(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact_config(item, key) for item in value]
+    if isinstance(value, str):
+        if value and SENSITIVE_KEY_PATTERN.search(key):
+            return REDACTED
+        return scrub_text(value)
+    return value
+
+
+def scrub_text(text: str) -> str:
+    """替换文本中的邮箱地址和形如 password=xxx 的敏感值"""
+    text = EMAIL_PATTERN.sub('<email>', text)
+    return SECRET_ASSIGNMENT_PATTERN.sub(lambda m: m.group(1) + REDACTED, text)
+
+
+def collect_database_stats(db_path: str) -> Dict[str, Any]:
+    """
+    收集数据库统计信息（只读打开，不修改数据库）
+
+    Returns:
+        包含 SQLite 版本、页大小、页数、空闲页数、各表行数、索引列表
+        以及（SQLite 编译了 dbstat 时）各表和索引占用空间的字典
+    """
+    if not os.path.exists(db_path):
+        return {'path': os.path.basename(db_path), 'error': '数据库文件不存在'}
+
+    stats: Dict[str, Any] = {
+        'path': os.path.basename(db_path),
+        'file_size': os.path.getsize(db_path),
+        'sqlite_version': sqlite3.sqlite_version
+    }
+
+    uri = 'file:' + os.path.abspath(db_path).replace('?', '%3f').replace('#', '%23') + '?mode=ro'
+    with sqlite3.connect(uri, uri=True) as conn:
+        cursor = conn.cursor()
+        for pragma in ('page_size', 'page_count', 'freelist_count', 'journal_mode',
+                       'auto_vacuum', 'user_version'):
+            stats[pragma] = cursor.execute(f'PRAGMA {pragma}').fetchone()[0]
+
+        tables = [row[0] for row in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+        )]
+        row_counts = {}
+        for table in tables:
+            try:
+                row_counts[table] = cursor.execute(
+                    'SELECT COUNT(*) FROM "{}"'.format(table.replace('"', '""'))
+                ).fetchone()[0]
+            except sqlite3.Error as e:
+                row_counts[table] = f'错误: {e}'
+        stats['row_counts'] = row_counts
+
+        stats['indexes'] = [
+            {'name': name, 'table': table, 'sql': sql}
+            for name, table, sql in cursor.execute(
+                "SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'index' ORDER BY tbl_name, name"
+            )
+        ]
+
+        try:
+            stats['object_sizes'] = [
+                {'name': name, 'pages': pages, 'bytes': size, 'unused_bytes': unused}
+                for name, pages, size, unused in cursor.execute(
+                    'SELECT name, COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat '
+                    'GROUP BY name ORDER BY SUM(pgsize) DESC'
+                )
+            ]
+        except sqlite3.Error as e:
+            stats['object_sizes'] = f'dbstat 不可用: {e}'
+
+    return stats
+
+
+def read_log_tail(path: str, max_bytes: int) -> str:
+    """
+    读取日志文件末尾（从完整的一行开始）
+
+    Args:
+        path: 日志文件路径
+        max_bytes: 最多读取的字节数
+    """
+    if not os.path.exists(path):
+        return ''
+
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - max_bytes))
+        data = f.read()
+
+    if size > max_bytes:
+        newline = data.find(b'\n')
+        data = data[newline + 1:] if newline >= 0 else data
+    return data.decode('utf-8', errors='replace')
+
+
+def build_diagnostics_bundle(output_path: str, db_path: str, config: Dict[str, Any],
+                             metrics: Dict[str, Any], slow_calls: List[Dict[str, Any]],
+                             stalls: List[Dict[str, Any]], log_files: List[str],
+                             log_tail_bytes: int = 256 * 1024,
+                             extra: Optional[Dict[str, Any]] = None) -> str:
+    """
+    生成诊断包
+
+    Args:
+        output_path: zip 文件路径
+        db_path: 数据库文件路径
+        config: 配置（写入前脱敏）
+        metrics: 指标快照
+        slow_calls: 最近的慢数据库调用
+        stalls: 界面卡顿汇总
+        log_files: 需要附带末尾内容的日志文件
+        log_tail_bytes: 每个日志文件附带的最大字节数
+        extra: 附加到 manifest.json 的环境信息
+
+    Returns:
+        生成的 zip 文件路径
+    """
+    def dump(data) -> str:
+        return json.dumps(data, ensure_ascii=False, indent=2, default=str)
+
+    manifest = {
+        'created_at': datetime.now().isoformat(),
+        'python': sys.version,
+        'platform': platform.platform(),
+        **(extra or {})
+    }
+
+    try:
+        database_stats = collect_database_stats(db_path)
+    except Exception as e:
+        database_stats = {'error': str(e)}
+
+    # 先写入临时文件，失败时不留下不完整的诊断包
+    temp_path = output_path + '.tmp'
+    try:
+        with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr('manifest.json', dump(manifest))
+            bundle.writestr('database.json', dump(database_stats))
+            bundle.writestr('config.json', dump(redact_config(config)))
+            bundle.writestr('metrics.json', dump(metrics))
+            bundle.writestr('slow_queries.json', dump(slow_calls))
+            bundle.writestr('ui_stalls.json', dump(stalls))
+            for path in log_files:
+                tail = read_log_tail(path, log_tail_bytes)
+                bundle.writestr(f'logs/{os.path.basename(path)}.tail', scrub_text(tail))
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return output_path
@@ -3,29 +3,55 @@
 """
 import os
 import base64
+import hashlib
+import hmac
+from typing import Optional
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+from utils.metrics import timed
+
+
+# 字段密文前缀，用于区分数据密钥加密的密文和旧版明文数据
+ENCRYPTED_PREFIX = "enc:v1:"
+
+# 未设置主密码时使用的默认主密码和盐
+DEFAULT_PASSWORD = "ai_tools_manager_default_key"
+DEFAULT_SALT = b'ai_tools_manager_salt_2024'
+
+# 主密钥校验值的明文：用主密钥加密后保存，启动时解密成功即说明主密码正确
+KEY_CHECK_PLAINTEXT = b'ai_tools_manager_master_key_check'
+
+# 加密操作耗时（按操作记录）
+crypto_timed = timed("encryption_seconds", "加密操作耗时（秒）", label="operation")
+
 
 class EncryptionManager:
     """加密管理器"""
     
-    def __init__(self, password: str = None):
+    def __init__(self, password: str = None, salt: bytes = None):
         """
         初始化加密管理器
         
         Args:
             password: 主密码，如果为None则使用默认密码
+            salt: 密钥派生的盐，如果为None则使用默认盐（设置主密码时随机生成并保存在数据库中）
         """
         if password is None:
-            password = "ai_tools_manager_default_key"
+            password = DEFAULT_PASSWORD
         
         self.password = password.encode()
-        self.salt = b'ai_tools_manager_salt_2024'  # 在实际应用中应该随机生成
+        self.salt = salt or DEFAULT_SALT
         self.key = self._derive_key()
         self.cipher = Fernet(self.key)
+        # 由主密钥派生的索引密钥：保险库尚未保存随机索引密钥时（旧库迁移）沿用
+        self.index_key = self._derive_index_key()
+        # 已解包的数据密钥缓存，按包装后的密钥索引
+        self._unwrapped_keys = {}
     
+    @crypto_timed
     def _derive_key(self) -> bytes:
         """从密码派生加密密钥"""
         kdf = PBKDF2HMAC(
@@ -36,7 +62,42 @@ class EncryptionManager:
         )
         key = base64.urlsafe_b64encode(kdf.derive(self.password))
         return key
+
+    def _derive_index_key(self) -> bytes:
+        """派生盲索引密钥（与加密密钥相互独立）"""
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=self.salt,
+            info=b'ai_tools_manager_blind_index',
+        )
+        return hkdf.derive(self.key)
+
+    @crypto_timed
+    def blind_index(self, field: str, value: str, index_key: bytes = None) -> Optional[str]:
+        """
+        计算字段的盲索引，用于在不解密的情况下精确匹配
+
+        Args:
+            field: 字段名，不同字段的相同值得到不同索引
+            value: 字段明文
+            index_key: 盲索引密钥（保险库中由主密钥包装保存），为空时使用派生的索引密钥
+
+        Returns:
+            HMAC-SHA256 十六进制摘要，值为空时返回None
+        """
+        value = value or ""
+        if field != 'password':
+            value = value.strip()
+        if not value:
+            return None
+        if field in ('email', 'username'):
+            value = value.casefold()
+
+        message = f"{field}\x00{value}".encode()
+        return hmac.new(index_key or self.index_key, message, hashlib.sha256).hexdigest()
     
+    @crypto_timed
     def encrypt(self, data: str) -> str:
         """
         加密字符串
@@ -53,6 +114,7 @@ class EncryptionManager:
         encrypted_data = self.cipher.encrypt(data.encode())
         return base64.urlsafe_b64encode(encrypted_data).decode()
     
+    @crypto_timed
     def decrypt(self, encrypted_data: str) -> str:
         """
         解密字符串
@@ -112,6 +174,95 @@ class EncryptionManager:
         
         return decrypted_dict
 
+    def create_key_check(self) -> str:
+        """生成主密钥校验值（用主密钥加密的固定明文）"""
+        return self.cipher.encrypt(KEY_CHECK_PLAINTEXT).decode()
+
+    def verify_key_check(self, key_check: str) -> bool:
+        """检查校验值是否由当前主密钥生成，即主密码是否正确"""
+        try:
+            return self.cipher.decrypt(key_check.encode()) == KEY_CHECK_PLAINTEXT
+        except Exception:
+            return False
+
+    def generate_data_key(self) -> bytes:
+        """生成新的记录级数据密钥"""
+        return Fernet.generate_key()
+
+    @crypto_timed
+    def wrap_key(self, data_key: bytes) -> str:
+        """
+        用主密钥包装数据密钥
+
+        Args:
+            data_key: 明文数据密钥
+
+        Returns:
+            包装后的数据密钥
+        """
+        return self.cipher.encrypt(data_key).decode()
+
+    @crypto_timed
+    def unwrap_key(self, wrapped_key: str) -> bytes:
+        """
+        用主密钥解包数据密钥
+
+        Args:
+            wrapped_key: 包装后的数据密钥
+
+        Returns:
+            明文数据密钥，主密钥不匹配时抛出 InvalidToken
+        """
+        data_key = self._unwrapped_keys.get(wrapped_key)
+        if data_key is None:
+            data_key = self.cipher.decrypt(wrapped_key.encode())
+            self._unwrapped_keys[wrapped_key] = data_key
+        return data_key
+
+    @crypto_timed
+    def encrypt_with_key(self, data: str, data_key: bytes) -> str:
+        """
+        用数据密钥加密字段
+
+        Args:
+            data: 要加密的字符串
+            data_key: 明文数据密钥
+
+        Returns:
+            带 ENCRYPTED_PREFIX 前缀的密文
+        """
+        if not data:
+            return ""
+
+        return ENCRYPTED_PREFIX + Fernet(data_key).encrypt(data.encode()).decode()
+
+    @crypto_timed
+    def decrypt_with_key(self, encrypted_data: str, data_key: bytes) -> str:
+        """
+        用数据密钥解密字段，没有前缀的旧版明文原样返回
+
+        Args:
+            encrypted_data: 字段密文
+            data_key: 明文数据密钥
+
+        Returns:
+            解密后的原始字符串
+        """
+        if not encrypted_data or not is_encrypted(encrypted_data):
+            return encrypted_data or ""
+
+        try:
+            token = encrypted_data[len(ENCRYPTED_PREFIX):].encode()
+            return Fernet(data_key).decrypt(token).decode()
+        except Exception as e:
+            print(f"解密失败: {e}")
+            return ""
+
+
+def is_encrypted(value: str) -> bool:
+    """检查字段是否为数据密钥加密的密文"""
+    return bool(value) and value.startswith(ENCRYPTED_PREFIX)
+
 
 # 全局加密管理器实例
 _encryption_manager = None
@@ -125,7 +276,37 @@ def get_encryption_manager(password: str = None) -> EncryptionManager:
     return _encryption_manager
 
 
-def set_master_password(password: str):
-    """设置主密码"""
+def unlock_master_password(password: str, salt: bytes, key_check: str) -> bool:
+    """
+    用主密码解锁：校验通过后替换全局加密管理器
+
+    Args:
+        password: 用户输入的主密码
+        salt: 数据库中保存的盐
+        key_check: 数据库中保存的主密钥校验值
+
+    Returns:
+        主密码是否正确
+    """
+    global _encryption_manager
+    manager = EncryptionManager(password, salt)
+    if not manager.verify_key_check(key_check):
+        return False
+    _encryption_manager = manager
+    return True
+
+
+def set_master_password(password: str, db_manager=None):
+    """
+    设置主密码（使用新的随机盐）
+
+    Args:
+        password: 新的主密码
+        db_manager: 传入时在同一事务中用新主密钥重新包装所有数据密钥和盲索引密钥并保存盐和校验值，
+            字段数据由后台任务惰性地换用新数据密钥
+    """
     global _encryption_manager
-    _encryption_manager = EncryptionManager(password)
+    new_manager = EncryptionManager(password, os.urandom(16))
+    if db_manager is not None:
+        db_manager.rotate_master_key(get_encryption_manager(), new_manager)
+    _encryption_manager = new_manager
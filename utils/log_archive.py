@@ -0,0 +1,150 @@
+"""
+日志归档模块
+
+日志文件轮转后，由后台线程把轮转出的分段压缩为 gzip 归档，
+并按保留天数和总大小删除最旧的归档，使日志占用的磁盘空间有上限。
+"""
+import os
+import re
+import gzip
+import time
+import queue
+import shutil
+import threading
+from datetime import datetime
+from typing import List
+
+
+class LogArchiver(threading.Thread):
+    """日志归档线程"""
+
+    _STOP = object()
+
+    def __init__(self, log_file: str, compress: bool = True,
+                 retention_days: int = 14, max_total_bytes: int = 200 * 1024 * 1024):
+        """
+        初始化归档线程
+
+        Args:
+            log_file: 活动日志文件路径，轮转分段命名为 {log_file}.{时间戳}
+            compress: 是否压缩轮转出的分段
+            retention_days: 归档保留天数，0 表示不按时间清理
+            max_total_bytes: 日志文件与归档的总大小上限，0 表示不按大小清理
+        """
+        super().__init__(name="LogArchiver", daemon=True)
+        self.log_file = os.path.abspath(log_file)
+        self.log_dir = os.path.dirname(self.log_file)
+        self.compress = compress
+        self.retention_days = retention_days
+        self.max_total_bytes = max_total_bytes
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._archive_pattern = re.compile(
+            rf"^{re.escape(os.path.basename(self.log_file))}\.\d{{8}}-\d{{6}}(-\d+)?(\.gz)?$"
+        )
+
+    def next_archive_path(self) -> str:
+        """生成下一个轮转分段的路径（按轮转时间命名，同一秒内重复时加序号）"""
+        base = f"{self.log_file}.{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        path = base
+        counter = 1
+        while os.path.exists(path) or os.path.exists(path + '.gz'):
+            path = f"{base}-{counter}"
+            counter += 1
+        return path
+
+    def submit(self):
+        """通知归档线程处理新的轮转分段"""
+        self._queue.put(None)
+
+    def run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+
+            # 合并排队中的通知，一次扫描处理所有分段
+            try:
+                while self._queue.get_nowait() is not self._STOP:
+                    pass
+                stop = True
+            except queue.Empty:
+                stop = False
+
+            self.process()
+            if stop:
+                return
+
+    def stop(self, timeout: float = 5.0):
+        """停止归档线程（未压缩完的分段在下次启动时继续处理）"""
+        if self.is_alive():
+            self._queue.put(self._STOP)
+            self.join(timeout)
+
+    def archives(self) -> List[str]:
+        """列出轮转出的分段（含已压缩的归档），按修改时间从旧到新排序"""
+        try:
+            entries = [entry for entry in os.scandir(self.log_dir)
+                       if entry.is_file() and self._archive_pattern.match(entry.name)]
+        except FileNotFoundError:
+            return []
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        return [entry.path for entry in entries]
+
+    def process(self):
+        """压缩未压缩的分段并执行保留策略"""
+        with self._lock:
+            try:
+                self._remove_partial_archives()
+                if self.compress:
+                    for path in self.archives():
+                        if not path.endswith('.gz'):
+                            self._compress_file(path)
+                self._apply_retention()
+            except Exception as e:
+                print(f"归档日志失败: {e}")
+
+    def remove_archives(self):
+        """删除全部归档"""
+        with self._lock:
+            for path in self.archives():
+                os.remove(path)
+            self._remove_partial_archives()
+
+    def _remove_partial_archives(self):
+        """删除中断的压缩留下的临时文件"""
+        prefix = os.path.basename(self.log_file) + '.'
+        for entry in os.scandir(self.log_dir):
+            if entry.name.startswith(prefix) and entry.name.endswith('.gz.tmp'):
+                os.remove(entry.path)
+
+    def _compress_file(self, path: str):
+        """压缩单个分段：先写入临时文件再替换，保留原修改时间"""
+        temp_path = path + '.gz.tmp'
+        stat = os.stat(path)
+
+        with open(path, 'rb') as src, gzip.open(temp_path, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+
+        os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(temp_path, path + '.gz')
+        os.remove(path)
+
+    def _apply_retention(self):
+        """按保留天数和总大小删除最旧的归档"""
+        archives = self.archives()
+
+        if self.retention_days > 0:
+            cutoff = time.time() - self.retention_days * 86400
+            while archives and os.path.getmtime(archives[0]) < cutoff:
+                os.remove(archives.pop(0))
+
+        if self.max_total_bytes > 0:
+            total = sum(os.path.getsize(path) for path in archives)
+            if os.path.exists(self.log_file):
+                total += os.path.getsize(self.log_file)
+            while archives and total > self.max_total_bytes:
+                path = archives.pop(0)
+                total -= os.path.getsize(path)
+                os.remove(path)
@@ -0,0 +1,291 @@
+"""
+大日志文件读取模块
+
+通过 mmap 映射日志文件，不把文件读入内存；按需构建稀疏的行偏移索引，
+支持跳转到任意行或字节范围，以及从文件末尾反向逐行读取。
+gzip 压缩的归档先解压到临时文件再映射，对调用方透明。
+
+查看仍在写入的日志文件时，每次读取后调用 release() 释放文件句柄和映射：
+Windows 下文件被打开或映射时无法重命名，会导致日志轮转失败。
+"""
+import os
+import gzip
+import mmap
+import shutil
+import tempfile
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+
+class LogFileReader:
+    """日志文件读取器"""
+
+    # 稀疏索引间隔：大约每隔多少字节记录一个检查点（行号及其行首偏移）
+    INDEX_BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        """
+        初始化读取器
+
+        Args:
+            path: 日志文件路径
+            encoding: 文件编码
+        """
+        self.path = path
+        self.encoding = encoding
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._size = 0
+
+        # 稀疏索引：第 _index_lines[i] 行从字节偏移 _index_offsets[i] 开始，
+        # 最后一个检查点即已扫描到的位置（总是位于行首）
+        self._reset_index()
+
+    def open(self):
+        """映射日志文件（release 后重新打开时保留稀疏索引，文件变小时重置）"""
+        if self._file is not None:
+            return
+
+        if self.path.endswith('.gz'):
+            # 压缩归档无法随机访问，解压到临时文件（关闭时自动删除）
+            self._file = tempfile.TemporaryFile()
+            with gzip.open(self.path, 'rb') as src:
+                shutil.copyfileobj(src, self._file, 1024 * 1024)
+            self._file.flush()
+        else:
+            self._file = open(self.path, 'rb')
+
+        old_size = self._size
+        self._map()
+        if self._size < old_size:
+            self._reset_index()
+
+    def release(self):
+        """
+        释放文件句柄和映射，保留稀疏索引，下次读取时重新打开
+
+        压缩归档的解压结果保存在临时文件中，不释放，避免重复解压。
+        """
+        if self.path.endswith('.gz') or self._file is None:
+            return
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+        self._file = None
+
+    def close(self):
+        """取消映射并关闭文件"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._size = 0
+        self._reset_index()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _map(self):
+        """按文件当前大小重新映射（空文件无法映射）"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        self._size = os.fstat(self._file.fileno()).st_size
+        if self._size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def refresh(self) -> int:
+        """
+        文件追加内容后重新映射
+
+        Returns:
+            文件当前大小；文件变小（被截断）时稀疏索引会被重置
+        """
+        self.open()
+        old_size = self._size
+        if os.fstat(self._file.fileno()).st_size != old_size:
+            self._map()
+            if self._size < old_size:
+                self._reset_index()
+        return self._size
+    
+    def _reset_index(self):
+        """清空稀疏索引"""
+        self._index_lines = [0]
+        self._index_offsets = [0]
+
+    @property
+    def size(self) -> int:
+        """文件大小（字节）"""
+        self.open()
+        return self._size
+
+    def read_bytes(self, start: int, end: int) -> bytes:
+        """读取字节范围"""
+        self.open()
+        if self._mmap is None:
+            return b''
+        return self._mmap[max(0, start):min(end, self._size)]
+
+    def read_range(self, start: int, end: int) -> Tuple[str, int, int]:
+        """
+        读取字节范围，并对齐到完整的行
+
+        Returns:
+            (文本, 实际起始偏移, 实际结束偏移)；起始处不完整的行被丢弃，
+            末尾未写完的行留到下次读取
+        """
+        self.open()
+        end = min(end, self._size)
+        if self._mmap is None or start >= end:
+            return "", start, start
+
+        mm = self._mmap
+        if start > 0 and mm[start - 1:start] != b'\n':
+            newline = mm.find(b'\n', start, end)
+            if newline == -1:
+                return "", end, end
+            start = newline + 1
+
+        complete = mm.rfind(b'\n', start, end) + 1
+        if complete <= start:
+            return "", start, start
+        return mm[start:complete].decode(self.encoding, errors='replace'), start, complete
+
+    def has_complete_line(self, start: int) -> bool:
+        """start 之后是否还有完整的行（只查找下一个换行符，不读取和解码内容）"""
+        self.open()
+        if self._mmap is None or start >= self._size:
+            return False
+        return self._mmap.find(b'\n', start, self._size) != -1
+
+    def _extend_index(self, target_line: Optional[int] = None):
+        """向后扫描文件扩展稀疏索引，直到覆盖 target_line（None 表示扫描到文件末尾）"""
+        mm = self._mmap
+        if mm is None:
+            return
+
+        offset = self._index_offsets[-1]
+        line = self._index_lines[-1]
+
+        while offset < self._size and (target_line is None or line < target_line):
+            # 块末尾对齐到行尾，保证检查点总在行首
+            block_end = min(offset + self.INDEX_BLOCK_SIZE, self._size)
+            last_newline = mm.rfind(b'\n', offset, block_end)
+            if last_newline == -1:
+                # 超长行：继续找到行尾；文件末尾未写完的行不计入
+                last_newline = mm.find(b'\n', block_end)
+                if last_newline == -1:
+                    break
+            block_end = last_newline + 1
+
+            line += mm[offset:block_end].count(b'\n')
+            offset = block_end
+            self._index_lines.append(line)
+            self._index_offsets.append(offset)
+
+    def line_offset(self, line_number: int) -> int:
+        """
+        获取行首的字节偏移
+
+        Args:
+            line_number: 行号（从0开始）
+
+        Returns:
+            字节偏移；超出文件行数时返回文件大小
+        """
+        self.open()
+        if self._mmap is None or line_number <= 0:
+            return 0
+
+        if line_number > self._index_lines[-1]:
+            self._extend_index(line_number)
+
+        # 从最近的检查点逐行前进（最多一个索引块）
+        checkpoint = bisect_right(self._index_lines, line_number) - 1
+        offset = self._index_offsets[checkpoint]
+        for _ in range(line_number - self._index_lines[checkpoint]):
+            newline = self._mmap.find(b'\n', offset)
+            if newline == -1:
+                return self._size
+            offset = newline + 1
+        return offset
+
+    def line_count(self) -> int:
+        """获取行数（末尾没有换行的行也计入）"""
+        self.open()
+        if self._mmap is None:
+            return 0
+
+        self._extend_index()
+        return self._index_lines[-1] + (1 if self._mmap[self._size - 1:] != b'\n' else 0)
+
+    def read_lines(self, start_line: int, count: int) -> List[str]:
+        """
+        读取从 start_line 开始的若干行
+
+        Args:
+            start_line: 起始行号（从0开始）
+            count: 行数
+        """
+        offset = self.line_offset(start_line)
+        return list(self.iter_lines(offset, limit=count))
+
+    def iter_lines(self, start: int = 0, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        从字节偏移 start 开始顺序逐行读取
+
+        Args:
+            start: 起始字节偏移（应位于行首）
+            limit: 最多读取的行数
+        """
+        self.open()
+        mm = self._mmap
+        if mm is None:
+            return
+
+        offset = start
+        produced = 0
+        while offset < self._size and (limit is None or produced < limit):
+            newline = mm.find(b'\n', offset)
+            end = self._size if newline == -1 else newline
+            yield mm[offset:end].decode(self.encoding, errors='replace').rstrip('\r')
+            offset = end + 1
+            produced += 1
+
+    def iter_lines_reversed(self, end: Optional[int] = None) -> Iterator[str]:
+        """
+        从字节偏移 end（默认文件末尾）开始反向逐行读取
+
+        空行会被跳过。
+        """
+        self.open()
+        mm = self._mmap
+        if mm is None:
+            return
+
+        position = self._size if end is None else min(end, self._size)
+        while position > 0:
+            newline = mm.rfind(b'\n', 0, position)
+            line = mm[newline + 1:position]
+            if line.strip():
+                yield line.decode(self.encoding, errors='replace').rstrip('\r')
+            position = newline if newline >= 0 else 0
+
+    def tail(self, count: int) -> List[str]:
+        """读取最后 count 行（按文件顺序返回）"""
+        lines = []
+        for line in self.iter_lines_reversed():
+            lines.append(line)
+            if len(lines) >= count:
+                break
+        lines.reverse()
+        return lines
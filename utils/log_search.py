@@ -0,0 +1,155 @@
+"""
+日志搜索模块
+
+在日志目录下的所有文本日志文件（当前文件、轮转分段及 gzip 压缩归档）中
+流式搜索正则表达式或普通文本。按块在字节上匹配，只对命中的行解码。
+"""
+import os
+import re
+import gzip
+from typing import Callable, Iterator, List, Optional, Pattern, Tuple
+
+
+# 参与搜索的日志文件后缀（结构化日志 .jsonl 与文本日志内容重复，不参与搜索）
+LOG_FILE_SUFFIXES = ('.log', '.gz')
+
+# 每次读取的块大小
+SEARCH_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class SearchPattern:
+    """编译后的搜索模式（在 UTF-8 字节上匹配）"""
+
+    def __init__(self, regex: Pattern[bytes], fold_case: bool = False):
+        self.regex = regex
+        # 为 True 时先把数据转为小写再匹配（bytes.lower 只转换 ASCII，长度不变）
+        self.fold_case = fold_case
+
+    def finditer(self, data: bytes):
+        """在数据中查找所有匹配"""
+        return self.regex.finditer(data.lower() if self.fold_case else data)
+
+
+def compile_search_pattern(text: str, use_regex: bool = False,
+                           case_sensitive: bool = False) -> SearchPattern:
+    """
+    编译搜索模式
+
+    Args:
+        text: 搜索文本或正则表达式
+        use_regex: 是否按正则表达式解析
+        case_sensitive: 是否区分大小写（只影响 ASCII 字符）
+
+    Raises:
+        re.error: 正则表达式无效
+    """
+    pattern = text.encode('utf-8')
+    if use_regex:
+        flags = 0 if case_sensitive else re.IGNORECASE
+        return SearchPattern(re.compile(pattern, flags))
+
+    # 普通文本不区分大小写时，比较小写后的数据比 IGNORECASE 快得多
+    fold_case = not case_sensitive
+    if fold_case:
+        pattern = pattern.lower()
+    return SearchPattern(re.compile(re.escape(pattern)), fold_case)
+
+
+def is_log_file(filename: str) -> bool:
+    """是否为可搜索的文本日志文件（含轮转后带编号或日期后缀的文件，不含压缩中的临时文件和结构化日志）"""
+    if filename.endswith(('.tmp', '.jsonl')):
+        return False
+    return filename.endswith(LOG_FILE_SUFFIXES) or '.log.' in filename
+
+
+def list_log_files(log_dir: str) -> List[str]:
+    """
+    列出日志目录下可搜索的日志文件
+
+    Returns:
+        按修改时间从新到旧排序的文件路径
+    """
+    try:
+        entries = [entry for entry in os.scandir(log_dir)
+                   if entry.is_file() and is_log_file(entry.name)]
+    except FileNotFoundError:
+        return []
+
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    return [entry.path for entry in entries]
+
+
+def open_log_file(path: str):
+    """以二进制方式打开日志文件，gzip 压缩的归档透明解压"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def search_log_file(path: str, pattern: SearchPattern,
+                    is_cancelled: Optional[Callable[[], bool]] = None,
+                    on_progress: Optional[Callable[[int], None]] = None) -> Iterator[Tuple[int, str]]:
+    """
+    在单个日志文件中搜索
+
+    Args:
+        path: 日志文件路径
+        pattern: compile_search_pattern 编译的模式
+        is_cancelled: 返回 True 时停止搜索
+        on_progress: 每读完一块后以本块读取的（压缩前）字节数回调
+
+    Yields:
+        (行号（从1开始）, 行内容)，每行最多产出一次
+    """
+    with open_log_file(path) as f:
+        raw = getattr(f, 'fileobj', None)
+        line_number = 1
+        remainder = b''
+        last_raw_position = 0
+
+        while True:
+            if is_cancelled and is_cancelled():
+                return
+
+            block = f.read(SEARCH_BLOCK_SIZE)
+            if on_progress:
+                # 压缩文件按读取的压缩字节计算进度
+                position = raw.tell() if raw is not None else f.tell()
+                on_progress(position - last_raw_position)
+                last_raw_position = position
+
+            if not block:
+                data = remainder
+                remainder = b''
+            else:
+                data = remainder + block
+                # 块末尾不完整的行留到下一块
+                cut = data.rfind(b'\n') + 1
+                if cut == 0:
+                    remainder = data
+                    continue
+                data, remainder = data[:cut], data[cut:]
+
+            counted_to = 0
+            last_line_end = -1
+            for match in pattern.finditer(data):
+                start = match.start()
+                if start < last_line_end:
+                    # 同一行内的后续匹配
+                    continue
+
+                line_start = data.rfind(b'\n', 0, start) + 1
+                line_end = data.find(b'\n', start)
+                if line_end == -1:
+                    line_end = len(data)
+
+                line_number += data.count(b'\n', counted_to, line_start)
+                counted_to = line_start
+                last_line_end = line_end + 1
+
+                yield line_number, data[line_start:line_end].decode('utf-8', errors='replace').rstrip('\r')
+
+            line_number += data.count(b'\n', counted_to)
+
+            if not block:
+                return
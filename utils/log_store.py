@@ -0,0 +1,281 @@
+"""
+SQLite 日志存储模块
+
+把结构化日志写入独立的 SQLite 数据库，按时间、级别、分类、操作建立索引，
+并用 FTS5（trigram 分词，支持中文子串）对消息建立全文索引，
+使日志页面的筛选可以在全部保留历史上以索引查询完成。
+"""
+import json
+import sqlite3
+import threading
+from typing import List, Dict, Any, Iterator, Optional
+
+
+# 日志条目中单独成列的字段，其余字段序列化到 data 列
+LOG_COLUMNS = ['timestamp', 'level', 'logger', 'message', 'category', 'operation']
+
+# trigram 分词至少需要3个字符，更短的搜索词退回 LIKE
+FTS_MIN_QUERY_LENGTH = 3
+
+
+class LogStore:
+    """SQLite 日志存储"""
+
+    def __init__(self, db_path: str, max_entries: int = 100000):
+        """
+        初始化日志存储
+
+        Args:
+            db_path: 日志数据库路径
+            max_entries: 保留的最大日志条数
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.fts_enabled = False
+        self._lock = threading.Lock()
+        self._inserted_since_prune = 0
+        self.init_database()
+
+    def init_database(self):
+        """初始化数据库"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    logger TEXT,
+                    message TEXT NOT NULL,
+                    category TEXT,
+                    operation TEXT,
+                    data TEXT
+                )
+            ''')
+
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_level ON logs(level, timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_category ON logs(category, timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_operation ON logs(operation, timestamp)')
+
+            # 全文索引（外部内容表，由触发器同步）
+            try:
+                cursor.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(
+                        message, content='logs', content_rowid='id', tokenize='trigram'
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+                        INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message);
+                    END
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN
+                        INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+                    END
+                ''')
+                self.fts_enabled = True
+            except sqlite3.OperationalError as e:
+                # SQLite 未编译 FTS5 或不支持 trigram 时退回 LIKE 搜索
+                print(f"日志全文索引不可用: {e}")
+
+            conn.commit()
+
+    def add_entries(self, entries: List[Dict[str, Any]]):
+        """
+        批量写入日志条目
+
+        Args:
+            entries: 结构化日志条目列表
+        """
+        if not entries:
+            return
+
+        rows = []
+        for entry in entries:
+            extra = {key: value for key, value in entry.items() if key not in LOG_COLUMNS}
+            rows.append((
+                entry.get('timestamp', ''),
+                entry.get('level', ''),
+                entry.get('logger'),
+                entry.get('message', ''),
+                entry.get('category'),
+                entry.get('operation'),
+                json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+            ))
+
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT INTO logs (timestamp, level, logger, message, category, operation, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+
+                # 每写入一定数量后按保留条数清理旧日志
+                self._inserted_since_prune += len(rows)
+                if self._inserted_since_prune >= max(1000, self.max_entries // 10):
+                    self._prune(cursor)
+                    self._inserted_since_prune = 0
+
+                conn.commit()
+
+    def _prune(self, cursor):
+        """删除超出保留条数的旧日志"""
+        cursor.execute('SELECT MAX(id) FROM logs')
+        max_id = cursor.fetchone()[0]
+        if max_id is not None:
+            cursor.execute('DELETE FROM logs WHERE id <= ?', (max_id - self.max_entries,))
+
+    def query_logs(self, level: Optional[str] = None, start: Optional[str] = None,
+                   end: Optional[str] = None, text: Optional[str] = None,
+                   category: Optional[str] = None, operation: Optional[str] = None,
+                   limit: int = 1000, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        查询日志
+
+        Args:
+            level: 日志级别，None 或 "ALL" 表示全部
+            start: 起始时间（ISO格式，包含）
+            end: 结束时间（ISO格式，不包含）
+            text: 消息中包含的文本
+            category: 日志分类
+            operation: 操作名称
+            limit: 最多返回的条数
+            offset: 跳过的条数
+
+        Returns:
+            最新的在前的日志条目列表
+        """
+        where, params = self._build_filters(level, start, end, text, category, operation)
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT timestamp, level, logger, message, category, operation, data
+                    FROM logs {where}
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ? OFFSET ?
+                ''', params + [limit, offset])
+                return [self._row_to_entry(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"查询日志失败: {e}")
+            return []
+
+    def iter_logs(self, level: Optional[str] = None, start: Optional[str] = None,
+                  end: Optional[str] = None, text: Optional[str] = None,
+                  category: Optional[str] = None, operation: Optional[str] = None,
+                  page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        按最新在前的顺序逐页迭代符合条件的日志
+
+        使用上一页最后一条的 (timestamp, id) 作为下一页的起点，
+        每页都是索引范围查询，不随翻页深度变慢。
+        """
+        where, params = self._build_filters(level, start, end, text, category, operation)
+        last_key = None
+
+        while True:
+            page_where = where
+            page_params = list(params)
+            if last_key is not None:
+                page_where += (' AND ' if where else 'WHERE ') + '(timestamp, id) < (?, ?)'
+                page_params.extend(last_key)
+
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(f'''
+                        SELECT timestamp, level, logger, message, category, operation, data, id
+                        FROM logs {page_where}
+                        ORDER BY timestamp DESC, id DESC
+                        LIMIT ?
+                    ''', page_params + [page_size])
+                    rows = cursor.fetchall()
+            except Exception as e:
+                print(f"查询日志失败: {e}")
+                return
+
+            for row in rows:
+                yield self._row_to_entry(row)
+
+            if len(rows) < page_size:
+                return
+            last_key = (rows[-1][0], rows[-1][7])
+
+    def count_logs(self, level: Optional[str] = None, start: Optional[str] = None,
+                   end: Optional[str] = None, text: Optional[str] = None,
+                   category: Optional[str] = None, operation: Optional[str] = None) -> int:
+        """统计符合条件的日志条数"""
+        where, params = self._build_filters(level, start, end, text, category, operation)
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'SELECT COUNT(*) FROM logs {where}', params)
+                return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"统计日志失败: {e}")
+            return 0
+
+    def clear(self):
+        """清空日志"""
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM logs')
+                if self.fts_enabled:
+                    cursor.execute("INSERT INTO logs_fts(logs_fts) VALUES ('delete-all')")
+                conn.commit()
+
+    def _build_filters(self, level, start, end, text, category, operation):
+        """构建查询条件"""
+        conditions = []
+        params = []
+
+        if level and level != "ALL":
+            conditions.append('level = ?')
+            params.append(level)
+        if start:
+            conditions.append('timestamp >= ?')
+            params.append(start)
+        if end:
+            conditions.append('timestamp < ?')
+            params.append(end)
+        if category:
+            conditions.append('category = ?')
+            params.append(category)
+        if operation:
+            conditions.append('operation = ?')
+            params.append(operation)
+        if text:
+            if self.fts_enabled and len(text) >= FTS_MIN_QUERY_LENGTH:
+                # 作为短语匹配，避免用户输入被解析为 FTS 查询语法
+                conditions.append('id IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)')
+                params.append('"' + text.replace('"', '""') + '"')
+            else:
+                conditions.append("message LIKE ? ESCAPE '\\'")
+                escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                params.append(f'%{escaped}%')
+
+        where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        return where, params
+
+    def _row_to_entry(self, row) -> Dict[str, Any]:
+        """将数据库行转换为日志条目"""
+        entry = {}
+        if row[6]:
+            try:
+                entry.update(json.loads(row[6]))
+            except json.JSONDecodeError:
+                pass
+
+        for column, value in zip(LOG_COLUMNS, row[:6]):
+            if value is not None:
+                entry[column] = value
+
+        return entry
@@ -2,12 +2,26 @@
 日志管理工具
 """
 import os
+import re
 import json
+import queue
+import atexit
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
+import logging.handlers
+import threading
+import time
+from collections import deque
+from itertools import islice
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterator, Optional
 from enum import Enum
 
+from utils.config import get_config_manager
+from utils.log_store import LogStore
+from utils.log_reader import LogFileReader
+from utils.log_archive import LogArchiver
+from utils.metrics import get_metrics
+
 
 class LogLevel(Enum):
     """日志级别"""
@@ -17,14 +31,415 @@ class LogLevel(Enum):
     ERROR = "ERROR"
 
 
+# 日志级别对应的标准库级别数值
+LEVEL_NUMBERS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR
+}
+
+
+class LogRingBuffer:
+    """
+    固定容量的日志环形缓冲区
+    
+    按到达顺序保存日志（即时间顺序），写满后淘汰最旧的条目。
+    每个级别单独维护一个队列和计数，插入与淘汰都是 O(1)，
+    按级别查看最近日志时无需复制整个缓存或重新排序。
+    """
+    
+    def __init__(self, capacity: int = 1000):
+        self.capacity = max(1, capacity)
+        self._entries = deque()
+        self._by_level = {level.value: deque() for level in LogLevel}
+        self._sequence = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def sequence(self) -> int:
+        """累计添加的条目数，配合 entries_since 增量读取新日志"""
+        return self._sequence
+    
+    def append(self, log_entry: Dict[str, Any]):
+        """添加日志条目，超出容量时淘汰最旧的条目"""
+        with self._lock:
+            if len(self._entries) >= self.capacity:
+                evicted = self._entries.popleft()
+                level_entries = self._by_level.get(evicted.get('level'))
+                if level_entries:
+                    # 最旧的条目也必然是其级别队列中最旧的
+                    level_entries.popleft()
+            
+            self._entries.append(log_entry)
+            self._sequence += 1
+            level_entries = self._by_level.get(log_entry.get('level'))
+            if level_entries is not None:
+                level_entries.append(log_entry)
+    
+    def entries_since(self, sequence: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        获取 sequence 之后添加的日志（按时间顺序）
+        
+        Returns:
+            新增的日志列表，其中部分已被淘汰或缓冲区被清空时返回 None
+        """
+        with self._lock:
+            count = self._sequence - sequence
+            if count > len(self._entries):
+                return None
+            return list(islice(reversed(self._entries), count))[::-1]
+    
+    def recent(self, limit: int = 100, level: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        获取最近的日志
+        
+        Args:
+            limit: 最多返回的条数
+            level: 日志级别，None 或 "ALL" 表示全部
+            
+        Returns:
+            最新的在前的日志列表
+        """
+        with self._lock:
+            if level and level != "ALL":
+                entries = self._by_level.get(level, ())
+            else:
+                entries = self._entries
+            return list(islice(reversed(entries), limit))
+    
+    def snapshot(self, level: Optional[str] = None, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        获取当前日志的快照（按时间顺序），只复制条目引用
+        
+        Args:
+            level: 日志级别，None 或 "ALL" 表示全部
+            since: 起始时间（ISO格式，包含），条目按时间有序，二分查找起点
+        """
+        with self._lock:
+            if level and level != "ALL":
+                entries = list(self._by_level.get(level, ()))
+            else:
+                entries = list(self._entries)
+        
+        if since:
+            lo, hi = 0, len(entries)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if entries[mid].get('timestamp', '') < since:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            entries = entries[lo:]
+        
+        return entries
+    
+    def count(self, level: Optional[str] = None) -> int:
+        """获取日志条数"""
+        if level and level != "ALL":
+            return len(self._by_level.get(level, ()))
+        return len(self._entries)
+    
+    def clear(self):
+        """清空缓冲区"""
+        with self._lock:
+            self._entries.clear()
+            for entries in self._by_level.values():
+                entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            return iter(list(self._entries))
+
+
+class QueueOverflowPolicy(Enum):
+    """日志队列满时的处理策略"""
+    BLOCK = "block"              # 阻塞调用方直到有空位（超时后丢弃）
+    DROP_NEW = "drop_new"        # 丢弃新日志
+    DROP_OLDEST = "drop_oldest"  # 丢弃队列中最旧的日志
+
+
+class BatchFileHandler(logging.FileHandler):
+    """批量写入的文件处理器：写入时不立即刷新，由后台线程在每批结束后统一刷新"""
+    
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class RotatingBatchFileHandler(BatchFileHandler):
+    """按大小和日期轮转的批量文件处理器：轮转出的分段交给归档线程压缩和清理"""
+    
+    # 轮转失败（文件被占用）后重试的间隔（秒）
+    ROLLOVER_RETRY_SECONDS = 30
+    
+    def __init__(self, filename: str, archiver: LogArchiver, max_bytes: int = 0,
+                 rotate_daily: bool = True, encoding: Optional[str] = None):
+        super().__init__(filename, encoding=encoding, delay=True)
+        self.archiver = archiver
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        
+        # 已有的日志文件从其最后修改的那天算起，跨天启动时第一条日志就会触发轮转
+        start = os.path.getmtime(self.baseFilename) if os.path.exists(self.baseFilename) else time.time()
+        self._rollover_at = self._next_midnight(start)
+        self._retry_at = 0.0
+    
+    @staticmethod
+    def _next_midnight(timestamp: float) -> float:
+        """获取时间戳之后的下一个零点"""
+        day = datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (day + timedelta(days=1)).timestamp()
+    
+    def emit(self, record):
+        if self.rotate_daily and record.created >= max(self._rollover_at, self._retry_at):
+            self.do_rollover()
+        super().emit(record)
+    
+    def flush(self):
+        # 写入线程每批结束后刷新一次，在此检查大小，避免逐条获取文件位置
+        self.acquire()
+        try:
+            super().flush()
+            if (self.max_bytes > 0 and self.stream is not None and time.time() >= self._retry_at
+                    and self.stream.tell() >= self.max_bytes):
+                self.do_rollover()
+        finally:
+            self.release()
+    
+    def do_rollover(self):
+        """关闭当前文件并重命名为轮转分段，下一条日志写入新文件"""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        
+        try:
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                os.replace(self.baseFilename, self.archiver.next_archive_path())
+                self.archiver.submit()
+        except OSError as e:
+            # 文件被占用时（如 Windows 下被其他程序打开）继续写入原文件，稍后重试
+            print(f"轮转日志文件失败: {e}")
+            self._retry_at = time.time() + self.ROLLOVER_RETRY_SECONDS
+            return
+        
+        self._retry_at = 0.0
+        self._rollover_at = self._next_midnight(time.time())
+
+
+class StructuredLogHandler(logging.Handler):
+    """结构化日志处理器：把记录附带的日志条目追加到 JSONL 文件"""
+    
+    def __init__(self, custom_logger: "CustomLogger"):
+        super().__init__(logging.DEBUG)
+        self.custom_logger = custom_logger
+    
+    def emit(self, record):
+        log_entry = getattr(record, 'structured', None)
+        if log_entry is not None:
+            self.custom_logger._save_to_json_file(log_entry)
+    
+    def flush(self):
+        self.custom_logger._flush_json_file()
+
+
+class SQLiteLogHandler(logging.Handler):
+    """SQLite 日志处理器：攒批后在一次事务中写入日志存储"""
+    
+    def __init__(self, log_store: LogStore):
+        super().__init__(logging.DEBUG)
+        self.log_store = log_store
+        self._pending = []
+    
+    def emit(self, record):
+        log_entry = getattr(record, 'structured', None)
+        if log_entry is not None:
+            self._pending.append(log_entry)
+    
+    def flush(self):
+        if not self._pending:
+            return
+        
+        entries, self._pending = self._pending, []
+        try:
+            self.log_store.add_entries(entries)
+        except Exception as e:
+            print(f"写入日志数据库失败: {e}")
+
+
+class LogWriterThread(threading.Thread):
+    """日志写入线程：独占所有日志输出，按批从队列取出记录并写入"""
+    
+    _STOP = object()
+    
+    def __init__(self, log_queue: queue.Queue, handlers: List[logging.Handler],
+                 batch_size: int = 256, flush_interval: float = 0.1):
+        super().__init__(name="LogWriterThread", daemon=True)
+        self.log_queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._wakeup = threading.Event()
+        
+        # 每个输出处理一批记录的耗时及写入的记录数
+        metrics = get_metrics()
+        self._sink_histograms = [
+            metrics.histogram("log_sink_seconds", "日志输出处理一批记录的耗时（秒）", sink=type(handler).__name__)
+            for handler in handlers
+        ]
+        self._records_counter = metrics.counter("log_records_total", "写入线程处理的日志记录数")
+    
+    def wakeup(self):
+        """立即处理队列，不再等待攒批"""
+        self._wakeup.set()
+    
+    def run(self):
+        running = True
+        while running:
+            item = self.log_queue.get()
+            if (isinstance(item, logging.LogRecord) and self.flush_interval > 0
+                    and self.log_queue.qsize() < self.batch_size):
+                # 等待一小段时间攒够一批，避免每条日志都唤醒写入线程与调用线程争抢 GIL
+                self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            records = []
+            flush_events = []
+            for item in batch:
+                if item is self._STOP:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    flush_events.append(item)
+                else:
+                    records.append(item)
+            
+            self.handle_records(records)
+            for event in flush_events:
+                event.set()
+    
+    def handle_records(self, records: List[logging.LogRecord]):
+        """把一批记录分发给各处理器，每批只刷新一次"""
+        if not records:
+            return
+        
+        self._records_counter.inc(len(records))
+        for handler, histogram in zip(self.handlers, self._sink_histograms):
+            start = time.perf_counter()
+            for record in records:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            try:
+                handler.flush()
+            except Exception as e:
+                print(f"刷新日志失败: {e}")
+            histogram.observe(time.perf_counter() - start)
+    
+    def stop(self, timeout: float = 5.0):
+        """写完队列中已有的日志后停止"""
+        if self.is_alive():
+            self.log_queue.put(self._STOP)
+            self.wakeup()
+            self.join(timeout)
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """异步队列处理器：调用线程只负责入队，格式化和写入都在写入线程完成"""
+    
+    def __init__(self, log_queue: queue.Queue, writer: LogWriterThread,
+                 overflow_policy: QueueOverflowPolicy = QueueOverflowPolicy.DROP_OLDEST,
+                 block_timeout: float = 1.0):
+        super().__init__(log_queue)
+        self.writer = writer
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.dropped_count = 0
+    
+    def prepare(self, record):
+        # 消息已是字符串，不在调用线程格式化
+        return record
+    
+    def emit(self, record):
+        if not self.writer.is_alive():
+            # 写入线程未启动或已停止时直接同步写入
+            self.writer.handle_records([record])
+            return
+        super().emit(record)
+    
+    def enqueue(self, record):
+        if self.overflow_policy == QueueOverflowPolicy.BLOCK:
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped_count += 1
+        elif self.overflow_policy == QueueOverflowPolicy.DROP_NEW:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped_count += 1
+        else:
+            rotated = 0
+            while True:
+                try:
+                    self.queue.put_nowait(record)
+                    break
+                except queue.Full:
+                    try:
+                        oldest = self.queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    if isinstance(oldest, logging.LogRecord):
+                        self.dropped_count += 1
+                        continue
+                    # 停止标记和 flush 事件等控制项不能丢弃，移到队尾
+                    self.queue.put(oldest)
+                    rotated += 1
+                    if rotated >= self.queue.maxsize:
+                        # 队列中只剩控制项，丢弃新记录
+                        self.dropped_count += 1
+                        break
+
+
 class CustomLogger:
     """自定义日志管理器"""
     
-    def __init__(self, name="ai_tools_manager"):
+    # 结构化日志单个分段的最大字节数，超过后轮转
+    MAX_SEGMENT_BYTES = 1024 * 1024
+    # 结构化日志保留的最大条目数（轮转时只删除整个超出范围的旧分段）
+    MAX_FILE_ENTRIES = 10000
+    
+    def __init__(self, name="ai_tools_manager", log_dir: str = "logs"):
         self.name = name
-        self.log_dir = "logs"
+        self.log_dir = log_dir
         self.log_file = os.path.join(self.log_dir, f"{name}.log")
-        self.json_log_file = os.path.join(self.log_dir, f"{name}_structured.json")
+        # 结构化日志：追加写入的 JSONL 活动分段，轮转后的分段为 {name}_structured.NNNNNN.jsonl
+        self.json_log_file = os.path.join(self.log_dir, f"{name}_structured.jsonl")
+        self.legacy_json_log_file = os.path.join(self.log_dir, f"{name}_structured.json")
+        self._segment_pattern = re.compile(rf"^{re.escape(name)}_structured\.(\d+)\.jsonl$")
+        self._json_file = None
+        self._json_file_size = 0
+        self._json_file_lines = 0
+        # 已轮转分段的行数缓存 {路径: 行数}，轮转时不必重新读取历史分段
+        self._segment_lines: Dict[str, int] = {}
+        self._json_lock = threading.Lock()
+        
+        # 最低记录级别：低于该级别的调用在格式化消息、构建日志条目之前直接返回
+        self.min_level = LEVEL_NUMBERS.get(
+            str(get_config_manager().get('logging.level', 'INFO')).upper(), logging.INFO
+        )
         
         # 确保日志目录存在
         os.makedirs(self.log_dir, exist_ok=True)
@@ -33,25 +448,48 @@ class CustomLogger:
         self.setup_standard_logger()
         
         # 内存中的日志缓存
-        self.log_cache = []
-        self.max_cache_size = 1000
+        self.max_cache_size = get_config_manager().get('logging.cache_size', 1000)
+        self.log_cache = LogRingBuffer(self.max_cache_size)
+        
+        # 迁移旧版整体重写的 JSON 日志文件
+        self._migrate_legacy_json_file()
+        
+        # 退出时写完队列中剩余的日志
+        atexit.register(self.shutdown)
     
     def setup_standard_logger(self):
-        """设置标准日志记录器"""
+        """设置标准日志记录器：调用线程只入队，写入线程负责所有输出"""
+        # 重复设置时先停止旧的写入线程
+        self.shutdown()
+        
         self.logger = logging.getLogger(self.name)
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(self.min_level)
         
         # 清除现有处理器
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
         
-        # 文件处理器
-        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        config = get_config_manager()
+        
+        # 文件处理器：按大小和日期轮转，轮转出的分段在后台压缩并按保留策略清理
+        self._archiver = LogArchiver(
+            self.log_file,
+            compress=config.get('logging.compress_archives', True),
+            retention_days=config.get('logging.retention_days', 14),
+            max_total_bytes=int(config.get('logging.max_total_mb', 200) * 1024 * 1024)
+        )
+        file_handler = RotatingBatchFileHandler(
+            self.log_file, self._archiver,
+            max_bytes=int(config.get('logging.max_file_mb', 10) * 1024 * 1024),
+            rotate_daily=config.get('logging.rotate_daily', True),
+            encoding='utf-8'
+        )
         file_handler.setLevel(logging.DEBUG)
         
         # 控制台处理器
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
+        self._console_handler = console_handler
         
         # 格式化器
         formatter = logging.Formatter(
@@ -62,10 +500,120 @@ class CustomLogger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # 队列与写入线程
+        try:
+            overflow_policy = QueueOverflowPolicy(config.get('logging.overflow_policy', 'drop_oldest'))
+        except ValueError:
+            overflow_policy = QueueOverflowPolicy.DROP_OLDEST
+        
+        self._handlers = [file_handler, console_handler, StructuredLogHandler(self)]
+        
+        # 可选的 SQLite 日志存储，用于全部历史的索引查询
+        self.log_store = None
+        if config.get('logging.sqlite_store', False):
+            try:
+                self.log_store = LogStore(
+                    os.path.join(self.log_dir, f"{self.name}_logs.db"),
+                    max_entries=config.get('logging.sqlite_max_entries', 100000)
+                )
+                self._handlers.append(SQLiteLogHandler(self.log_store))
+            except Exception as e:
+                print(f"初始化日志数据库失败: {e}")
+                self.log_store = None
+        self._log_queue = queue.Queue(maxsize=config.get('logging.queue_size', 10000))
+        self._writer = LogWriterThread(
+            self._log_queue, self._handlers,
+            batch_size=config.get('logging.batch_size', 256),
+            flush_interval=config.get('logging.flush_interval_ms', 100) / 1000
+        )
+        self._queue_handler = AsyncQueueHandler(self._log_queue, self._writer, overflow_policy)
+        
+        self.logger.addHandler(self._queue_handler)
+        self._writer.start()
+        
+        # 队列积压和丢弃数量在读取指标时计算，不增加记录日志的开销
+        metrics = get_metrics()
+        metrics.gauge("log_queue_depth", "日志队列中等待写入的记录数").set_function(self._log_queue.qsize)
+        metrics.gauge("log_dropped_total", "因队列已满被丢弃的日志数").set_function(self.get_dropped_count)
+        
+        # 启动时处理上次未压缩的分段并执行保留策略
+        self._archiver.start()
+        self._archiver.submit()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        等待写入线程写完当前已入队的日志
+        
+        Args:
+            timeout: 最长等待秒数
+            
+        Returns:
+            是否在超时前写完
+        """
+        writer = getattr(self, '_writer', None)
+        if writer is None or not writer.is_alive():
+            return True
+        
+        event = threading.Event()
+        self._log_queue.put(event)
+        writer.wakeup()
+        return event.wait(timeout)
     
-    def _log_to_cache(self, level: str, message: str, **kwargs):
+    def shutdown(self, timeout: float = 5.0):
+        """写完剩余日志并停止写入线程"""
+        writer = getattr(self, '_writer', None)
+        if writer is None:
+            return
+        
+        writer.stop(timeout)
+        for handler in self._handlers:
+            handler.close()
+        with self._json_lock:
+            self._close_json_file()
+        self._archiver.stop(timeout)
+    
+    def get_dropped_count(self) -> int:
+        """获取因队列已满被丢弃的日志数量"""
+        return self._queue_handler.dropped_count
+    
+    def set_level(self, level: str):
+        """
+        运行时修改日志级别，对之后的日志立即生效
+        
+        Args:
+            level: 日志级别名称（DEBUG/INFO/WARNING/ERROR）
+        """
+        levelno = LEVEL_NUMBERS.get(str(level).upper())
+        if levelno is None:
+            raise ValueError(f"未知的日志级别: {level}")
+        
+        self.min_level = levelno
+        self.logger.setLevel(levelno)
+    
+    def set_console_enabled(self, enabled: bool):
+        """开启或关闭控制台输出（如基准测试时避免大量日志刷屏），不影响文件和结构化日志"""
+        self._console_handler.setLevel(logging.INFO if enabled else logging.CRITICAL + 1)
+    
+    def get_level(self) -> str:
+        """获取当前日志级别名称"""
+        return logging.getLevelName(self.min_level)
+    
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        """指定级别的日志是否会被记录，用于跳过构建代价较高的日志参数"""
+        return LEVEL_NUMBERS[level.value] >= self.min_level
+    
+    def _log(self, level: LogLevel, message: str, *args, **kwargs):
+        """记录日志：格式化消息，写入缓存并把记录交给写入线程（调用方已检查级别）"""
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args}"
+        
+        log_entry = self._log_to_cache(level.value, message, **kwargs)
+        self.logger.log(LEVEL_NUMBERS[level.value], message, extra={'structured': log_entry})
+    
+    def _log_to_cache(self, level: str, message: str, **kwargs) -> Dict[str, Any]:
         """添加日志到缓存"""
         log_entry = {
             'timestamp': datetime.now().isoformat(),
@@ -76,63 +624,173 @@ class CustomLogger:
         }
         
         self.log_cache.append(log_entry)
-        
-        # 限制缓存大小
-        if len(self.log_cache) > self.max_cache_size:
-            self.log_cache = self.log_cache[-self.max_cache_size:]
-        
-        # 保存到JSON文件
-        self._save_to_json_file(log_entry)
+        return log_entry
     
     def _save_to_json_file(self, log_entry: Dict[str, Any]):
-        """保存日志条目到JSON文件"""
+        """追加日志条目到 JSONL 文件，每条日志的开销与历史日志数量无关"""
         try:
-            # 读取现有日志
-            logs = []
-            if os.path.exists(self.json_log_file):
-                try:
-                    with open(self.json_log_file, 'r', encoding='utf-8') as f:
-                        logs = json.load(f)
-                except (json.JSONDecodeError, FileNotFoundError):
-                    logs = []
-            
-            # 添加新日志
-            logs.append(log_entry)
+            line = json.dumps(log_entry, ensure_ascii=False, default=str) + '\n'
+            data = line.encode('utf-8')
             
-            # 限制文件大小（保留最近1000条）
-            if len(logs) > 1000:
-                logs = logs[-1000:]
-            
-            # 保存到文件
-            with open(self.json_log_file, 'w', encoding='utf-8') as f:
-                json.dump(logs, f, ensure_ascii=False, indent=2)
+            with self._json_lock:
+                if self._json_file is None:
+                    self._open_json_file()
+                
+                self._json_file.write(data)
+                self._json_file_size += len(data)
+                self._json_file_lines += 1
+                
+                if self._json_file_size >= self.MAX_SEGMENT_BYTES:
+                    self._rotate_json_file()
                 
         except Exception as e:
-            # 如果JSON保存失败，至少记录到标准日志
-            self.logger.error(f"保存结构化日志失败: {e}")
+            # 在写入线程中执行，不能再写日志
+            print(f"保存结构化日志失败: {e}")
     
-    def debug(self, message: str, **kwargs):
-        """调试日志"""
-        self.logger.debug(message)
-        self._log_to_cache(LogLevel.DEBUG.value, message, **kwargs)
+    def _flush_json_file(self):
+        """刷新活动分段"""
+        with self._json_lock:
+            if self._json_file is not None:
+                self._json_file.flush()
     
-    def info(self, message: str, **kwargs):
-        """信息日志"""
-        self.logger.info(message)
-        self._log_to_cache(LogLevel.INFO.value, message, **kwargs)
+    def _open_json_file(self):
+        """以追加方式打开活动分段"""
+        self._json_file = open(self.json_log_file, 'ab')
+        self._json_file_size = self._json_file.tell()
+        
+        # 上次异常退出时可能留下不完整的最后一行，补上换行避免与新条目粘连
+        if self._json_file_size > 0:
+            with open(self.json_log_file, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._json_file.write(b'\n')
+                    self._json_file_size += 1
+            self._json_file.flush()
+            self._json_file_lines = self._count_lines(self.json_log_file)
     
-    def warning(self, message: str, **kwargs):
-        """警告日志"""
-        self.logger.warning(message)
-        self._log_to_cache(LogLevel.WARNING.value, message, **kwargs)
+    def _close_json_file(self):
+        """关闭活动分段"""
+        if self._json_file is not None:
+            self._json_file.flush()
+            self._json_file.close()
+            self._json_file = None
+            self._json_file_size = 0
+            self._json_file_lines = 0
     
-    def error(self, message: str, **kwargs):
-        """错误日志"""
-        self.logger.error(message)
-        self._log_to_cache(LogLevel.ERROR.value, message, **kwargs)
+    def _rotated_segments(self) -> List[str]:
+        """获取已轮转的分段路径（从旧到新）"""
+        segments = []
+        try:
+            for filename in os.listdir(self.log_dir):
+                match = self._segment_pattern.match(filename)
+                if match:
+                    segments.append((int(match.group(1)), os.path.join(self.log_dir, filename)))
+        except FileNotFoundError:
+            return []
+        
+        segments.sort()
+        return [path for _, path in segments]
+    
+    def _json_segments(self) -> List[str]:
+        """获取全部结构化日志分段（从旧到新，活动分段在最后）"""
+        segments = self._rotated_segments()
+        if os.path.exists(self.json_log_file):
+            segments.append(self.json_log_file)
+        return segments
+    
+    @staticmethod
+    def _count_lines(path: str) -> int:
+        """统计文件行数"""
+        with open(path, 'rb') as f:
+            return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1024 * 1024), b''))
+    
+    def _rotate_json_file(self):
+        """轮转活动分段并删除超出保留范围的旧分段（调用方需持有锁）"""
+        lines = self._json_file_lines
+        self._close_json_file()
+        
+        rotated = self._rotated_segments()
+        next_index = 1
+        if rotated:
+            next_index = int(self._segment_pattern.match(os.path.basename(rotated[-1])).group(1)) + 1
+        
+        segment_path = os.path.join(self.log_dir, f"{self.name}_structured.{next_index:06d}.jsonl")
+        os.replace(self.json_log_file, segment_path)
+        self._segment_lines[segment_path] = lines
+        self._retire_segments(rotated + [segment_path])
+    
+    def _retire_segments(self, rotated: List[str]):
+        """
+        删除最旧的分段，直到再删除一个就不足 MAX_FILE_ENTRIES 条
+        
+        行数来自缓存（启动后首次用到的分段统计一次），不读取也不重写保留的分段。
+        """
+        for path in rotated:
+            if path not in self._segment_lines:
+                self._segment_lines[path] = self._count_lines(path)
+        
+        total = sum(self._segment_lines[path] for path in rotated)
+        for path in rotated[:-1]:
+            lines = self._segment_lines[path]
+            if total - lines < self.MAX_FILE_ENTRIES:
+                break
+            os.remove(path)
+            del self._segment_lines[path]
+            total -= lines
+    
+    def _migrate_legacy_json_file(self):
+        """
+        将旧版 JSON 数组格式的日志转换为 JSONL 分段
+        
+        只在还没有 JSONL 分段时转换一次；旧文件保留不删除，之后启动时不再读取。
+        """
+        if not os.path.exists(self.legacy_json_log_file) or self._json_segments():
+            return
+        
+        try:
+            with open(self.legacy_json_log_file, 'r', encoding='utf-8') as f:
+                logs = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            logs = []
+        if not logs:
+            return
+        
+        try:
+            with self._json_lock:
+                temp_path = self.json_log_file + '.tmp'
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    for entry in logs[-self.MAX_FILE_ENTRIES:]:
+                        f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+                os.replace(temp_path, self.json_log_file)
+        except Exception as e:
+            self.logger.error(f"迁移结构化日志失败: {e}")
+    
+    def debug(self, message: str, *args, **kwargs):
+        """调试日志（args 按 % 格式化，仅在级别启用时执行）"""
+        if self.min_level <= logging.DEBUG:
+            self._log(LogLevel.DEBUG, message, *args, **kwargs)
+    
+    def info(self, message: str, *args, **kwargs):
+        """信息日志（args 按 % 格式化，仅在级别启用时执行）"""
+        if self.min_level <= logging.INFO:
+            self._log(LogLevel.INFO, message, *args, **kwargs)
+    
+    def warning(self, message: str, *args, **kwargs):
+        """警告日志（args 按 % 格式化，仅在级别启用时执行）"""
+        if self.min_level <= logging.WARNING:
+            self._log(LogLevel.WARNING, message, *args, **kwargs)
+    
+    def error(self, message: str, *args, **kwargs):
+        """错误日志（args 按 % 格式化，仅在级别启用时执行）"""
+        if self.min_level <= logging.ERROR:
+            self._log(LogLevel.ERROR, message, *args, **kwargs)
     
     def log_operation(self, operation: str, details: Dict[str, Any] = None, success: bool = True):
         """记录操作日志"""
+        level = LogLevel.INFO if success else LogLevel.ERROR
+        if not self.is_enabled_for(level):
+            return
+        
         status = "成功" if success else "失败"
         message = f"操作{status}: {operation}"
 
@@ -142,13 +800,14 @@ class CustomLogger:
             'details': details or {}
         }
 
-        if success:
-            self.info(message, **log_data)
-        else:
-            self.error(message, **log_data)
+        self._log(level, message, **log_data)
     
     def log_automation(self, tool: str, action: str, result: str, details: Dict[str, Any] = None):
         """记录自动化操作日志"""
+        level = LogLevel.INFO if "成功" in result or "success" in result.lower() else LogLevel.ERROR
+        if not self.is_enabled_for(level):
+            return
+        
         message = f"自动化操作 - {tool}: {action} - {result}"
         
         log_data = {
@@ -159,13 +818,14 @@ class CustomLogger:
             'details': details or {}
         }
         
-        if "成功" in result or "success" in result.lower():
-            self.info(message, **log_data)
-        else:
-            self.error(message, **log_data)
+        self._log(level, message, **log_data)
     
     def log_account_operation(self, operation: str, account_name: str, account_type: str, success: bool = True):
         """记录账号操作日志"""
+        level = LogLevel.INFO if success else LogLevel.ERROR
+        if not self.is_enabled_for(level):
+            return
+        
         status = "成功" if success else "失败"
         message = f"账号操作{status}: {operation} - {account_name} ({account_type})"
         
@@ -177,50 +837,66 @@ class CustomLogger:
             'success': success
         }
         
-        if success:
-            self.info(message, **log_data)
-        else:
-            self.error(message, **log_data)
+        self._log(level, message, **log_data)
     
     def get_recent_logs(self, limit: int = 100, level: str = None) -> List[Dict[str, Any]]:
-        """获取最近的日志"""
-        logs = self.log_cache.copy()
-        
-        # 按级别筛选
-        if level and level != "ALL":
-            logs = [log for log in logs if log.get('level') == level]
-        
-        # 按时间排序（最新的在前）
-        logs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        
-        return logs[:limit]
+        """获取最近的日志（最新的在前）"""
+        return self.log_cache.recent(limit, level)
     
     def get_logs_from_file(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """从文件获取日志"""
+        """从文件获取最近的日志（从文件尾部反向读取，按时间顺序返回）"""
+        logs = []
         try:
-            if os.path.exists(self.json_log_file):
-                with open(self.json_log_file, 'r', encoding='utf-8') as f:
-                    logs = json.load(f)
-                    # 返回最近的日志
-                    return logs[-limit:] if len(logs) > limit else logs
+            self.flush()
+            with self._json_lock:
+                segments = self._json_segments()
+            
+            for path in reversed(segments):
+                try:
+                    with LogFileReader(path) as reader:
+                        for line in reader.iter_lines_reversed():
+                            try:
+                                logs.append(json.loads(line))
+                            except json.JSONDecodeError:
+                                # 跳过异常退出时写了一半的行
+                                continue
+                            if len(logs) >= limit:
+                                break
+                except FileNotFoundError:
+                    # 读取期间分段被轮转或压缩
+                    continue
+                
+                if len(logs) >= limit:
+                    break
+                
         except Exception as e:
             self.error(f"读取日志文件失败: {e}")
         
-        return []
+        logs.reverse()
+        return logs
     
     def clear_logs(self):
         """清空日志"""
         try:
+            # 先写完队列中的日志，避免清空后又被写入
+            self.flush()
+            
             # 清空缓存
             self.log_cache.clear()
             
-            # 清空文件
+            # 清空文件及轮转出的归档
             if os.path.exists(self.log_file):
                 open(self.log_file, 'w').close()
+            self._archiver.remove_archives()
+            
+            with self._json_lock:
+                self._close_json_file()
+                for path in self._json_segments():
+                    os.remove(path)
+                self._segment_lines.clear()
             
-            if os.path.exists(self.json_log_file):
-                with open(self.json_log_file, 'w', encoding='utf-8') as f:
-                    json.dump([], f)
+            if self.log_store is not None:
+                self.log_store.clear()
             
             self.info("日志已清空")
             
@@ -229,18 +905,9 @@ class CustomLogger:
     
     def get_log_stats(self) -> Dict[str, int]:
         """获取日志统计"""
-        stats = {
-            'total': len(self.log_cache),
-            'debug': 0,
-            'info': 0,
-            'warning': 0,
-            'error': 0
-        }
-        
-        for log in self.log_cache:
-            level = log.get('level', '').lower()
-            if level in stats:
-                stats[level] += 1
+        stats = {'total': self.log_cache.count()}
+        for level in LogLevel:
+            stats[level.value.lower()] = self.log_cache.count(level.value)
         
         return stats
     
@@ -249,7 +916,7 @@ class CustomLogger:
         try:
             if format.lower() == 'json':
                 with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(self.log_cache, f, ensure_ascii=False, indent=2)
+                    json.dump(list(self.log_cache), f, ensure_ascii=False, indent=2)
             else:
                 # 文本格式
                 with open(filename, 'w', encoding='utf-8') as f:
@@ -280,48 +947,43 @@ def get_logger(name: str = "ai_tools_manager") -> CustomLogger:
 
 
 def setup_logging(log_level: str = "INFO", log_dir: str = "logs"):
-    """设置日志系统"""
+    """设置日志系统（已有日志实例时先写完其日志并停止其后台线程）"""
     global _logger_instance
-    _logger_instance = CustomLogger("ai_tools_manager")
-    _logger_instance.log_dir = log_dir
-    
-    # 设置日志级别
-    level_map = {
-        "DEBUG": logging.DEBUG,
-        "INFO": logging.INFO,
-        "WARNING": logging.WARNING,
-        "ERROR": logging.ERROR
-    }
+    if _logger_instance is not None:
+        atexit.unregister(_logger_instance.shutdown)
+        _logger_instance.shutdown()
+    _logger_instance = CustomLogger("ai_tools_manager", log_dir)
     
-    if log_level.upper() in level_map:
-        _logger_instance.logger.setLevel(level_map[log_level.upper()])
+    # 设置日志级别（同时作用于缓存、结构化日志和文件输出）
+    if log_level.upper() in LEVEL_NUMBERS:
+        _logger_instance.set_level(log_level)
     
     return _logger_instance
 
 
 # 便捷函数
-def log_info(message: str, **kwargs):
+def log_info(message: str, *args, **kwargs):
     """记录信息日志"""
     logger = get_logger()
-    logger.info(message, **kwargs)
+    logger.info(message, *args, **kwargs)
 
 
-def log_error(message: str, **kwargs):
+def log_error(message: str, *args, **kwargs):
     """记录错误日志"""
     logger = get_logger()
-    logger.error(message, **kwargs)
+    logger.error(message, *args, **kwargs)
 
 
-def log_warning(message: str, **kwargs):
+def log_warning(message: str, *args, **kwargs):
     """记录警告日志"""
     logger = get_logger()
-    logger.warning(message, **kwargs)
+    logger.warning(message, *args, **kwargs)
 
 
-def log_debug(message: str, **kwargs):
+def log_debug(message: str, *args, **kwargs):
     """记录调试日志"""
     logger = get_logger()
-    logger.debug(message, **kwargs)
+    logger.debug(message, *args, **kwargs)
 
 
 def log_operation(operation: str, success: bool = True, details: Dict[str, Any] = None):
@@ -0,0 +1,453 @@
+"""
+应用指标模块
+
+进程内的轻量指标注册表，提供计数器、仪表和固定分桶直方图，
+可导出为 JSON 快照或 Prometheus 文本格式文件。
+"""
+import os
+import json
+import math
+import time
+import functools
+import threading
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.tracing import get_tracer, slot_arg_limit
+
+
+# 默认的耗时分桶上限（秒）
+DEFAULT_LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """计数器：只增不减"""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, labels: LabelKey):
+        self.name = name
+        self.labels = labels
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        """增加计数"""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def reset(self):
+        with self._lock:
+            self._value = 0
+
+    def sample(self) -> Dict[str, Any]:
+        return {'value': self._value}
+
+
+class Gauge:
+    """仪表：可增可减的当前值，也可以在读取时由函数计算"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, labels: LabelKey):
+        self.name = name
+        self.labels = labels
+        self._value = 0
+        self._function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        """设置当前值"""
+        self._value = value
+
+    def inc(self, amount: float = 1):
+        """增加当前值"""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1):
+        """减少当前值"""
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        """读取时调用函数获取当前值（如队列长度），不需要在热路径上更新"""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return self._function()
+            except Exception:
+                return math.nan
+        return self._value
+
+    def reset(self):
+        self._value = 0
+
+    def sample(self) -> Dict[str, Any]:
+        return {'value': self.value}
+
+
+class Histogram:
+    """固定分桶直方图：记录观测值的分布、总和、次数与最大值"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, labels: LabelKey, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """记录一个观测值"""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+            if value > self._max:
+                self._max = value
+
+    def time(self) -> "_HistogramTimer":
+        """返回计时上下文管理器，退出时记录耗时（秒）"""
+        return _HistogramTimer(self)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def quantile(self, q: float) -> float:
+        """
+        根据分桶估算分位数（桶内线性插值）
+
+        Args:
+            q: 分位数，0 到 1 之间
+
+        Returns:
+            估算值，不超过实际观测到的最大值
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            maximum = self._max
+        if total == 0:
+            return 0.0
+
+        rank = q * total
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                if index >= len(self.buckets):
+                    return maximum
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = min(self.buckets[index], maximum)
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return maximum
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._count = 0
+            self._max = 0.0
+
+    def sample(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            total_sum = self._sum
+            maximum = self._max
+
+        cumulative = 0
+        buckets = []
+        for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+            cumulative += bucket_count
+            buckets.append(['+Inf' if bound == math.inf else bound, cumulative])
+
+        return {
+            'count': total,
+            'sum': total_sum,
+            'max': maximum,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': buckets
+        }
+
+
+class _HistogramTimer:
+    """直方图计时上下文管理器"""
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class SlowCallLog:
+    """慢调用记录：保存最近超过阈值的调用"""
+
+    def __init__(self, threshold: float, max_entries: int = 200):
+        """
+        初始化记录
+
+        Args:
+            threshold: 慢调用阈值（秒）
+            max_entries: 保留的最大条数，超出后丢弃最早的记录
+        """
+        self.threshold = threshold
+        self._entries = deque(maxlen=max_entries)
+
+    def record(self, name: str, duration: float, result: Any = None):
+        """
+        记录一次慢调用
+
+        Args:
+            name: 调用名称
+            duration: 耗时（秒）
+            result: 调用返回值，只记录其长度（如返回的行数），不记录内容
+        """
+        # deque.append 线程安全
+        self._entries.append({
+            'name': name,
+            'duration_ms': round(duration * 1000, 2),
+            'rows': len(result) if isinstance(result, (list, tuple, dict)) else None,
+            'thread': threading.current_thread().name,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """从新到旧返回记录"""
+        return list(reversed(self._entries))
+
+    def clear(self):
+        """清空记录"""
+        self._entries.clear()
+
+
+class MetricsRegistry:
+    """指标注册表：同名同标签的指标只创建一次"""
+
+    def __init__(self):
+        self._metrics: Dict[Tuple[str, LabelKey], Any] = {}
+        self._help: Dict[str, str] = {}
+        self._types: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name: str, help: str, labels: Dict[str, Any], **kwargs):
+        """获取或创建指标"""
+        label_key = tuple(sorted((key, str(value)) for key, value in labels.items()))
+        key = (name, label_key)
+
+        metric = self._metrics.get(key)
+        if metric is not None:
+            if metric.type_name != metric_class.type_name:
+                raise ValueError(f"指标 {name} 已注册为 {metric.type_name}")
+            return metric
+
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                registered_type = self._types.get(name)
+                if registered_type is not None and registered_type != metric_class.type_name:
+                    raise ValueError(f"指标 {name} 已注册为 {registered_type}")
+
+                metric = metric_class(name, label_key, **kwargs)
+                self._metrics[key] = metric
+                self._types[name] = metric_class.type_name
+                if help:
+                    self._help[name] = help
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels) -> Counter:
+        """获取计数器"""
+        return self._get_or_create(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", **labels) -> Gauge:
+        """获取仪表"""
+        return self._get_or_create(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", buckets=DEFAULT_LATENCY_BUCKETS, **labels) -> Histogram:
+        """获取直方图"""
+        return self._get_or_create(Histogram, name, help, labels, buckets=buckets)
+
+    def metrics(self) -> List[Any]:
+        """按名称和标签排序的全部指标"""
+        with self._lock:
+            items = sorted(self._metrics.items(), key=lambda item: item[0])
+        return [metric for _, metric in items]
+
+    def reset(self):
+        """清零全部指标（指标本身保留）"""
+        for metric in self.metrics():
+            metric.reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取全部指标的快照
+
+        Returns:
+            包含时间戳和指标列表的字典，可直接序列化为 JSON
+        """
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'metrics': [
+                {
+                    'name': metric.name,
+                    'type': metric.type_name,
+                    'help': self._help.get(metric.name, ''),
+                    'labels': dict(metric.labels),
+                    **metric.sample()
+                }
+                for metric in self.metrics()
+            ]
+        }
+
+    def to_prometheus(self) -> str:
+        """导出为 Prometheus 文本格式"""
+        lines = []
+        described = set()
+
+        for metric in self.metrics():
+            if metric.name not in described:
+                described.add(metric.name)
+                if metric.name in self._help:
+                    lines.append(f"# HELP {metric.name} {_escape_help(self._help[metric.name])}")
+                lines.append(f"# TYPE {metric.name} {metric.type_name}")
+
+            if isinstance(metric, Histogram):
+                sample = metric.sample()
+                for bound, cumulative in sample['buckets']:
+                    labels = metric.labels + (('le', _format_value(bound)),)
+                    lines.append(f"{metric.name}_bucket{_format_labels(labels)} {cumulative}")
+                lines.append(f"{metric.name}_sum{_format_labels(metric.labels)} {_format_value(sample['sum'])}")
+                lines.append(f"{metric.name}_count{_format_labels(metric.labels)} {sample['count']}")
+            else:
+                lines.append(f"{metric.name}{_format_labels(metric.labels)} {_format_value(metric.value)}")
+
+        return '\n'.join(lines) + '\n'
+
+    def export_json(self, path: str):
+        """把快照写入 JSON 文件"""
+        _write_file(path, json.dumps(self.snapshot(), ensure_ascii=False, indent=2))
+
+    def export_prometheus(self, path: str):
+        """把指标写入 Prometheus 文本格式文件（可供 node_exporter 文本文件收集器读取）"""
+        _write_file(path, self.to_prometheus())
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        f'{key}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for key, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value) -> str:
+    if isinstance(value, str):
+        return value
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _write_file(path: str, content: str):
+    """先写入临时文件再替换，读取方不会看到写了一半的文件"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def timed(name: str, help: str = "", label: str = "method", slow_log: Optional[SlowCallLog] = None,
+          slot: bool = False):
+    """
+    装饰器：把函数每次调用的耗时记录到直方图
+
+    直方图以函数的限定名（如 DatabaseManager.get_all_accounts）作为标签值，
+    其次数即调用次数。跟踪开启时同时记录为跟踪区间。
+
+    Args:
+        name: 直方图名称
+        help: 指标说明
+        label: 标签名
+        slow_log: 慢调用记录，超过其阈值的调用会被记录
+        slot: 是否用作 Qt 槽函数（丢弃信号传入的多余参数）
+    """
+    def decorator(func):
+        histogram = get_metrics().histogram(name, help, **{label: func.__qualname__})
+        span_name = func.__qualname__
+        category = name[:-len('_seconds')] if name.endswith('_seconds') else name
+        tracer = get_tracer()
+        arg_limit = slot_arg_limit(func) if slot else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if arg_limit is not None and len(args) > arg_limit:
+                args = args[:arg_limit]
+            start = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                end = time.perf_counter()
+                histogram.observe(end - start)
+                if tracer.enabled:
+                    tracer.add_span(span_name, category, start, end)
+                if slow_log is not None and end - start >= slow_log.threshold:
+                    slow_log.record(span_name, end - start, result)
+
+        return wrapper
+
+    return decorator
+
+
+# 全局指标注册表
+_metrics_registry = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """获取指标注册表"""
+    global _metrics_registry
+    if _metrics_registry is None:
+        _metrics_registry = MetricsRegistry()
+    return _metrics_registry
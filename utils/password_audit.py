@@ -0,0 +1,41 @@
+"""
+密码健康检查工具
+"""
+import re
+
+
+# 强度分数不高于此值的密码视为弱密码
+WEAK_PASSWORD_SCORE = 2
+
+
+def score_password_strength(password: str) -> int:
+    """
+    计算密码强度分数
+
+    Args:
+        password: 明文密码
+
+    Returns:
+        0-5 的强度分数：长度至少6位、包含小写字母、大写字母、数字、特殊字符各得1分
+    """
+    if not password:
+        return 0
+
+    score = 0
+    if len(password) >= 6:
+        score += 1
+    if re.search(r'[a-z]', password):
+        score += 1
+    if re.search(r'[A-Z]', password):
+        score += 1
+    if re.search(r'\d', password):
+        score += 1
+    if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        score += 1
+
+    return score
+
+
+def is_weak_password(password: str) -> bool:
+    """检查是否为弱密码"""
+    return score_password_strength(password) <= WEAK_PASSWORD_SCORE
@@ -0,0 +1,246 @@
+"""
+运行时性能分析模块
+
+在不重启程序的情况下按需开启 cProfile 和 tracemalloc：
+CPU 分析结束后写出 pstats 文件和可用于生成火焰图的折叠栈文件，
+内存快照写出 tracemalloc 快照文件以及与上一次快照相比的分配增长排行。
+"""
+import os
+import time
+import pstats
+import cProfile
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from utils.config import get_config_manager
+
+
+# pstats 中的函数标识：(文件名, 行号, 函数名)
+FunctionKey = Tuple[str, int, str]
+
+
+def format_function(key: FunctionKey) -> str:
+    """把 pstats 函数标识格式化为折叠栈中的帧名（不能包含分号和空格）"""
+    filename, lineno, name = key
+    if filename == '~':
+        # 内置函数，如 <built-in method time.sleep>
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    return label.replace(';', ',').replace(' ', '_')
+
+
+def collapse_stats(stats: pstats.Stats, max_depth: int = 64) -> Dict[str, float]:
+    """
+    把 cProfile 统计转换为折叠栈（Brendan Gregg 的 flamegraph.pl / speedscope 格式）
+
+    cProfile 只记录调用者与被调用者之间的边，不记录完整调用栈，
+    因此按每条边在被调用函数累计耗时中的占比，把函数自身耗时分摊到各条调用路径上。
+
+    Args:
+        stats: pstats 统计对象
+        max_depth: 最大栈深度，超出部分的耗时计入截断处
+
+    Returns:
+        {"帧1;帧2;帧3": 自身耗时（秒）}
+    """
+    entries = stats.stats
+    children: Dict[FunctionKey, List[FunctionKey]] = {}
+    for callee, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            children.setdefault(caller, []).append(callee)
+
+    roots = [key for key, entry in entries.items() if not entry[4]]
+    stacks: Dict[str, float] = {}
+
+    def walk(key: FunctionKey, path: List[str], on_path: set, fraction: float):
+        _, _, self_time, cumulative_time, _ = entries[key]
+        path.append(format_function(key))
+        on_path.add(key)
+
+        stack = ';'.join(path)
+        if len(path) >= max_depth:
+            stacks[stack] = stacks.get(stack, 0.0) + cumulative_time * fraction
+        else:
+            stacks[stack] = stacks.get(stack, 0.0) + self_time * fraction
+            for child in children.get(key, ()):
+                if child in on_path:
+                    continue
+                child_cumulative = entries[child][3]
+                edge_cumulative = entries[child][4][key][3]
+                if child_cumulative <= 0 or edge_cumulative <= 0:
+                    continue
+                walk(child, path, on_path, fraction * edge_cumulative / child_cumulative)
+
+        on_path.discard(key)
+        path.pop()
+
+    for root in roots:
+        walk(root, [], set(), 1.0)
+
+    return {stack: seconds for stack, seconds in stacks.items() if seconds > 0}
+
+
+class Profiler:
+    """按需性能分析器"""
+
+    def __init__(self, output_dir: str = "diagnostics", top_n: int = 30, trace_frames: int = 25):
+        """
+        初始化分析器
+
+        Args:
+            output_dir: 分析结果输出目录
+            top_n: 内存增长排行的条数
+            trace_frames: tracemalloc 为每次分配保存的调用栈深度
+        """
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.trace_frames = trace_frames
+
+        self._profile: Optional[cProfile.Profile] = None
+        self._profile_started = 0.0
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_snapshot_name = ""
+
+    def _output_path(self, prefix: str, extension: str) -> str:
+        """生成带时间戳的输出文件路径"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(self.output_dir, f"{prefix}-{stamp}{extension}")
+        index = 1
+        while os.path.exists(path):
+            path = os.path.join(self.output_dir, f"{prefix}-{stamp}-{index}{extension}")
+            index += 1
+        return path
+
+    # ---- CPU 分析 ----
+
+    def is_profiling(self) -> bool:
+        """CPU 分析是否正在进行"""
+        return self._profile is not None
+
+    def start_profile(self):
+        """
+        开始 CPU 分析
+
+        cProfile 只分析调用本方法的线程，从菜单开启时即界面主线程。
+        """
+        if self._profile is not None:
+            return
+
+        self._profile = cProfile.Profile()
+        self._profile_started = time.monotonic()
+        self._profile.enable()
+
+    def stop_profile(self) -> Dict[str, str]:
+        """
+        停止 CPU 分析并写出结果
+
+        Returns:
+            {'pstats': pstats 文件, 'collapsed': 折叠栈文件, 'summary': 耗时排行文本文件}
+        """
+        if self._profile is None:
+            raise RuntimeError("CPU 分析未开启")
+
+        profile, self._profile = self._profile, None
+        profile.disable()
+        elapsed = time.monotonic() - self._profile_started
+
+        pstats_path = self._output_path("cpu", ".pstats")
+        profile.dump_stats(pstats_path)
+        stats = pstats.Stats(profile)
+
+        # 折叠栈的数值以微秒为单位，供 flamegraph.pl、speedscope 等工具直接读取
+        collapsed_path = pstats_path[:-len(".pstats")] + ".collapsed"
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, seconds in sorted(collapse_stats(stats).items()):
+                microseconds = round(seconds * 1e6)
+                if microseconds > 0:
+                    f.write(f"{stack} {microseconds}\n")
+
+        summary_path = pstats_path[:-len(".pstats")] + ".txt"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(f"分析时长: {elapsed:.1f}s\n\n")
+            pstats.Stats(profile, stream=f).sort_stats('cumulative').print_stats(self.top_n)
+
+        return {'pstats': pstats_path, 'collapsed': collapsed_path, 'summary': summary_path}
+
+    # ---- 内存分析 ----
+
+    def is_tracing_memory(self) -> bool:
+        """内存跟踪是否正在进行"""
+        return tracemalloc.is_tracing()
+
+    def take_memory_snapshot(self) -> Dict[str, str]:
+        """
+        拍摄内存快照
+
+        首次调用时开启 tracemalloc（开启前的分配不会被跟踪），
+        之后每次调用写出快照文件，并与上一次快照比较，写出分配增长排行。
+
+        Returns:
+            {'snapshot': 快照文件, 'diff': 增长排行文件（首次快照时没有）}
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._last_snapshot = None
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+        snapshot_path = self._output_path("memory", ".tracemalloc")
+        snapshot.dump(snapshot_path)
+        result = {'snapshot': snapshot_path}
+
+        if self._last_snapshot is not None:
+            diff_path = snapshot_path[:-len(".tracemalloc")] + "-diff.txt"
+            self._write_diff(diff_path, self._last_snapshot, snapshot, self._last_snapshot_name)
+            result['diff'] = diff_path
+
+        self._last_snapshot = snapshot
+        self._last_snapshot_name = os.path.basename(snapshot_path)
+        return result
+
+    def _write_diff(self, path: str, old: tracemalloc.Snapshot, new: tracemalloc.Snapshot, old_name: str):
+        """写出两次快照之间按代码行和按调用栈的分配增长排行"""
+        current, peak = tracemalloc.get_traced_memory()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"对比快照: {old_name}\n")
+            f.write(f"当前跟踪内存: {current / 1024 / 1024:.1f}MB，峰值: {peak / 1024 / 1024:.1f}MB\n\n")
+
+            f.write(f"按代码行的分配增长（前 {self.top_n} 项）:\n")
+            for stat in new.compare_to(old, 'lineno')[:self.top_n]:
+                f.write(f"{stat}\n")
+
+            f.write(f"\n按调用栈的分配增长（前 {min(self.top_n, 10)} 项）:\n")
+            for stat in new.compare_to(old, 'traceback')[:min(self.top_n, 10)]:
+                f.write(f"\n{stat.size_diff / 1024:+.1f}KiB，{stat.count_diff:+d} 个对象\n")
+                for line in stat.traceback.format(most_recent_first=True):
+                    f.write(f"{line}\n")
+
+    def stop_memory_tracing(self):
+        """停止内存跟踪并释放跟踪数据"""
+        tracemalloc.stop()
+        self._last_snapshot = None
+        self._last_snapshot_name = ""
+
+
+# 全局分析器实例
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    """获取性能分析器"""
+    global _profiler
+    if _profiler is None:
+        config = get_config_manager()
+        _profiler = Profiler(
+            output_dir=config.get('diagnostics.output_dir', 'diagnostics'),
+            top_n=config.get('diagnostics.profile_top_n', 30),
+            trace_frames=config.get('diagnostics.tracemalloc_frames', 25)
+        )
+    return _profiler
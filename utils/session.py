@@ -3,8 +3,9 @@
 """
 from typing import Optional
 from datetime import datetime
-from models.user import UserSession, User, UserRole
-from models.database import DatabaseManager
+from models.user import UserSession, User, UserRole, DEFAULT_HASH_ITERATIONS
+from models.database import get_database_manager
+from utils.config import get_config_manager
 
 
 class SessionManager:
@@ -12,21 +13,51 @@ class SessionManager:
     
     def __init__(self):
         self.current_session: Optional[UserSession] = None
-        self.db_manager = DatabaseManager()
+        self.db_manager = get_database_manager()
         self.session_timeout_minutes = 30
     
+    def get_hash_iterations(self) -> int:
+        """获取配置的密码哈希迭代次数"""
+        return get_config_manager().get('security.password_hash_iterations', DEFAULT_HASH_ITERATIONS)
+    
     def login(self, username: str, password: str) -> bool:
-        """用户登录"""
-        user = self.db_manager.get_user_by_username(username)
+        """用户登录（包含密码哈希，界面中应分别调用 authenticate 和 start_session）"""
+        user = self.authenticate(username, password)
         if not user:
             return False
         
+        self.start_session(user)
+        return True
+    
+    def authenticate(self, username: str, password: str) -> Optional[User]:
+        """
+        验证用户名和密码（耗时操作，界面中应在后台线程调用）
+        
+        不写数据库也不创建会话；哈希参数与当前配置不一致时只在返回的用户对象上重新哈希，
+        由 start_session 保存。
+        
+        Returns:
+            验证通过的用户，失败返回 None
+        """
+        user = self.db_manager.get_user_by_username(username)
+        if not user:
+            return None
+        
         if not user.is_active:
-            return False
+            return None
         
         if not user.verify_password(password):
-            return False
+            return None
         
+        # 哈希参数与当前配置不一致时透明地重新哈希
+        iterations = self.get_hash_iterations()
+        if user.needs_rehash(iterations):
+            user.set_password(password, iterations)
+        
+        return user
+    
+    def start_session(self, user: User):
+        """保存登录信息并创建会话（authenticate 验证通过后调用）"""
         # 更新用户登录信息
         user.update_login()
         self.db_manager.update_user(user)
@@ -39,8 +70,6 @@ class SessionManager:
             login_time=datetime.now(),
             last_activity=datetime.now()
         )
-        
-        return True
     
     def logout(self):
         """用户登出"""
@@ -104,7 +133,7 @@ class SessionManager:
         admin_user.username = "admin"
         admin_user.email = "admin@localhost"
         admin_user.role = UserRole.ADMIN
-        admin_user.set_password("admin123")
+        admin_user.set_password("admin123", self.get_hash_iterations())
         
         try:
             user_id = self.db_manager.add_user(admin_user)
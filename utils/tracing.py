@@ -0,0 +1,206 @@
+"""
+性能跟踪模块
+
+记录带线程信息的嵌套耗时区间（span），导出为 Chrome trace-event JSON，
+可在 chrome://tracing 或 Perfetto 中打开。跟踪可在运行时开关，
+关闭时每次调用只有一次属性检查的开销。
+"""
+import os
+import json
+import time
+import inspect
+import functools
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from utils.config import get_config_manager
+
+
+class _Span:
+    """跟踪区间上下文管理器"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Optional[Dict[str, Any]]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tracer.add_span(self.name, self.category, self.start, time.perf_counter(), self.args)
+
+
+class _NullSpan:
+    """跟踪关闭时使用的空上下文管理器"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """跟踪器：在有界缓冲区中保存最近的区间"""
+
+    def __init__(self, max_events: int = 200000):
+        """
+        初始化跟踪器
+
+        Args:
+            max_events: 保留的最大区间数，超出后丢弃最早的区间
+        """
+        self.enabled = False
+        self._events = deque(maxlen=max_events)
+        self._thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def start(self):
+        """开始记录"""
+        self.enabled = True
+
+    def stop(self):
+        """停止记录（已记录的区间保留，可继续导出）"""
+        self.enabled = False
+
+    def clear(self):
+        """清空已记录的区间"""
+        self._events.clear()
+
+    def event_count(self) -> int:
+        """已记录的区间数"""
+        return len(self._events)
+
+    def span(self, name: str, category: str = "app", **args):
+        """
+        返回记录区间的上下文管理器，跟踪关闭时返回空操作对象
+
+        Args:
+            name: 区间名称
+            category: 分类
+            args: 附加到区间上的参数（在跟踪工具中显示）
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args or None)
+
+    def add_span(self, name: str, category: str, start: float, end: float,
+                 args: Optional[Dict[str, Any]] = None):
+        """
+        记录一个已结束的区间
+
+        Args:
+            start: 开始时间（time.perf_counter）
+            end: 结束时间（time.perf_counter）
+        """
+        thread_id = threading.get_native_id()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+
+        # deque.append 线程安全，记录时只保存元组，导出时再转换格式
+        self._events.append((name, category, start, end, thread_id, args))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """转换为 Chrome trace-event 格式"""
+        events: List[Dict[str, Any]] = [
+            {'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': 0,
+             'args': {'name': 'AI Tools Manager'}}
+        ]
+        for thread_id, thread_name in list(self._thread_names.items()):
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': thread_id,
+                           'args': {'name': thread_name}})
+
+        for name, category, start, end, thread_id, args in list(self._events):
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 3),
+                'dur': round((end - start) * 1e6, 3),
+                'pid': self._pid,
+                'tid': thread_id
+            }
+            if args:
+                event['args'] = {key: str(value) for key, value in args.items()}
+            events.append(event)
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str):
+        """把跟踪写入 JSON 文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+
+def slot_arg_limit(func) -> Optional[int]:
+    """
+    函数接受的最大位置参数个数，函数接受 *args 时返回 None
+
+    Qt 信号按槽函数的参数个数传入信号参数，装饰后的包装函数接受任意参数，
+    会收到原函数不接受的信号参数（如 clicked 的 checked、textChanged 的文本）。
+    以 slot=True 装饰的槽函数据此截断多余的参数，其余函数多传参数时照常报错。
+    """
+    code = getattr(func, '__code__', None)
+    if code is None or code.co_flags & inspect.CO_VARARGS:
+        return None
+    return code.co_argcount
+
+
+def traced(name: Optional[str] = None, category: str = "app", slot: bool = False):
+    """
+    装饰器：跟踪开启时把函数的每次调用记录为区间
+
+    Args:
+        name: 区间名称，默认为函数的限定名
+        category: 分类
+        slot: 是否用作 Qt 槽函数（丢弃信号传入的多余参数）
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+        tracer = get_tracer()
+        arg_limit = slot_arg_limit(func) if slot else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if arg_limit is not None and len(args) > arg_limit:
+                args = args[:arg_limit]
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.add_span(span_name, category, start, time.perf_counter())
+
+        return wrapper
+
+    return decorator
+
+
+# 全局跟踪器实例
+_tracer = None
+
+
+def get_tracer() -> Tracer:
+    """获取跟踪器"""
+    global _tracer
+    if _tracer is None:
+        config = get_config_manager()
+        _tracer = Tracer(config.get('tracing.max_events', 200000))
+        if config.get('tracing.enabled', False):
+            _tracer.start()
+    return _tracer